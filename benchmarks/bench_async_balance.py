@@ -0,0 +1,66 @@
+"""
+并发余额查询基准测试
+
+在带固定延迟的本地JSON-RPC节点上并发执行N次get_balance，
+验证AsyncWeb3后端下N个并发查询的总耗时接近单次查询耗时
+
+用法: python benchmarks/bench_async_balance.py [--concurrency 20] [--latency 0.2]
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from rpc_stub import StubRpcServer  # noqa: E402
+from blockchain_payment_mcp.config import NetworkConfig  # noqa: E402
+from blockchain_payment_mcp.http_pool import http_pool  # noqa: E402
+from blockchain_payment_mcp.multi_chain import EVMChainInterface  # noqa: E402
+
+ADDRESS = "0x742d35Cc6634C0532925a3b844Bc454e4438f44e"
+
+async def run(concurrency: int, latency: float) -> None:
+    stub = StubRpcServer(latency=latency, chain_id=8453)
+    url = await stub.start()
+    try:
+        chain = EVMChainInterface(NetworkConfig(
+            name="Bench Local",
+            chain_id=8453,
+            rpc_url=url,
+            native_token="ETH",
+            explorer_url=""
+        ))
+
+        # 预热连接
+        await chain.get_balance(ADDRESS)
+
+        start = time.perf_counter()
+        await chain.get_balance(ADDRESS)
+        single = time.perf_counter() - start
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(chain.get_balance(ADDRESS) for _ in range(concurrency)))
+        concurrent = time.perf_counter() - start
+
+        errors = [r for r in results if "error" in r]
+        print(f"RPC延迟:            {latency * 1000:.0f} ms")
+        print(f"单次get_balance:    {single * 1000:.1f} ms")
+        print(f"{concurrency}个并发get_balance: {concurrent * 1000:.1f} ms "
+              f"(单次的{concurrent / single:.2f}倍，串行预期{concurrency}倍)")
+        if errors:
+            print(f"失败: {len(errors)} 个, 示例: {errors[0]}")
+    finally:
+        await http_pool.close()
+        await stub.stop()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="并发get_balance基准测试")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.2, help="模拟RPC延迟（秒）")
+    args = parser.parse_args()
+    asyncio.run(run(args.concurrency, args.latency))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+服务冷启动基准测试
+
+启动新的Python进程运行 cli_main，通过stdio发送MCP initialize请求，
+测量从进程启动到收到initialize响应的耗时。中位数超过阈值时以非零状态退出，
+可用于在CI中发现导入耗时的回归
+
+用法: python benchmarks/bench_cold_start.py [--runs 5] [--threshold 2.0]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+SERVER_COMMAND = [
+    sys.executable, "-c",
+    "from blockchain_payment_mcp.server import cli_main; cli_main()",
+]
+
+INITIALIZE_REQUEST = {
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "initialize",
+    "params": {
+        "protocolVersion": "2024-11-05",
+        "capabilities": {},
+        "clientInfo": {"name": "bench", "version": "0"},
+    },
+}
+
+def measure_once(timeout: float) -> float:
+    """启动一次服务并返回收到initialize响应的耗时（秒）"""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(REPO_ROOT), env.get("PYTHONPATH")]))
+    # 冷启动测量不应包含后台预热
+    env.pop("WARMUP_NETWORKS", None)
+
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        SERVER_COMMAND,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        env=env,
+        cwd=str(REPO_ROOT),
+    )
+    try:
+        process.stdin.write((json.dumps(INITIALIZE_REQUEST) + "\n").encode())
+        process.stdin.flush()
+        while True:
+            line = process.stdout.readline()
+            if not line:
+                raise RuntimeError("服务在返回initialize响应前退出")
+            message = json.loads(line)
+            if message.get("id") == 1:
+                elapsed = time.perf_counter() - start
+                if "error" in message:
+                    raise RuntimeError(f"initialize失败: {message['error']}")
+                return elapsed
+            if time.perf_counter() - start > timeout:
+                raise TimeoutError("等待initialize响应超时")
+    finally:
+        process.kill()
+        process.wait()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="服务冷启动基准测试")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--threshold", type=float, default=None,
+                        help="中位数耗时上限（秒），超过时返回非零退出码")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    timings = []
+    for run in range(1, args.runs + 1):
+        elapsed = measure_once(args.timeout)
+        timings.append(elapsed)
+        print(f"第{run}次: {elapsed * 1000:.0f} ms")
+
+    median = statistics.median(timings)
+    print(f"中位数: {median * 1000:.0f} ms  最小: {min(timings) * 1000:.0f} ms  最大: {max(timings) * 1000:.0f} ms")
+
+    if args.threshold is not None and median > args.threshold:
+        print(f"冷启动耗时超过阈值 {args.threshold:.2f} s")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+RPC连接池基准测试
+
+两个指向同一RPC主机的链接口在多轮突发并发查询下共享连接池，
+对比服务端看到的TCP连接数与HTTP请求数，并输出连接池的新建/复用统计
+
+用法: python benchmarks/bench_connection_pool.py [--bursts 5] [--concurrency 20] [--latency 0.05]
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from rpc_stub import StubRpcServer  # noqa: E402
+from blockchain_payment_mcp.config import NetworkConfig  # noqa: E402
+from blockchain_payment_mcp.http_pool import http_pool  # noqa: E402
+from blockchain_payment_mcp.multi_chain import EVMChainInterface  # noqa: E402
+
+ADDRESS = "0x742d35Cc6634C0532925a3b844Bc454e4438f44e"
+
+async def run(bursts: int, concurrency: int, latency: float) -> None:
+    stub = StubRpcServer(latency=latency, chain_id=8453)
+    url = await stub.start()
+    try:
+        chains = [
+            EVMChainInterface(NetworkConfig(
+                name=f"Bench Local {i}",
+                chain_id=8453,
+                rpc_url=url,
+                native_token="ETH",
+                explorer_url=""
+            ))
+            for i in range(2)
+        ]
+        for chain in chains:
+            await chain.check_connection()
+
+        start = time.perf_counter()
+        for _ in range(bursts):
+            await asyncio.gather(*(
+                chains[i % len(chains)].get_balance(ADDRESS) for i in range(concurrency)
+            ))
+        elapsed = time.perf_counter() - start
+
+        stats = http_pool.stats(url)
+        print(f"{bursts}轮 x {concurrency}个并发get_balance: {elapsed * 1000:.1f} ms")
+        print(f"服务端HTTP请求: {stub.http_requests}  TCP连接: {len(stub.connections)}")
+        print(f"连接池统计: 新建 {stats['new_connections']}  复用 {stats['reused_connections']}  "
+              f"复用率 {stats['reuse_rate']:.1%}")
+    finally:
+        await http_pool.close()
+        await stub.stop()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="RPC连接池基准测试")
+    parser.add_argument("--bursts", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.05, help="模拟RPC延迟（秒）")
+    args = parser.parse_args()
+    asyncio.run(run(args.bursts, args.concurrency, args.latency))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+合约批量转账基准测试
+
+在本地模拟节点上分别用pipeline模式（每笔一个交易）和contract模式（Disperse合约）
+向N个地址转账同一种ERC20代币，输出交易数、HTTP请求数、耗时和按gas模型计算的手续费。
+模拟节点按调用数据估算gas：普通ERC20转账约51k，Disperse每个接收地址约30k，
+--block-gas-limit 调小时可以观察批次按区块gas上限自动拆分。
+模拟节点不执行合约，approve流程和整批回滚在真实合约上的行为由 tests/test_disperse_anvil.py 覆盖
+
+用法: python benchmarks/bench_disperse.py [--payments 200] [--block-gas-limit 30000000]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import rlp  # noqa: E402
+from eth_utils import keccak  # noqa: E402
+
+from rpc_stub import StubRpcServer, _get_block_by_number  # noqa: E402
+from blockchain_payment_mcp.config import NetworkConfig  # noqa: E402
+from blockchain_payment_mcp.disperse import DISPERSE_ETHER_SELECTOR, DISPERSE_TOKEN_SELECTOR  # noqa: E402
+from blockchain_payment_mcp.http_pool import http_pool  # noqa: E402
+from blockchain_payment_mcp.multi_chain import EVMChainInterface  # noqa: E402
+from blockchain_payment_mcp.wallet import WalletSigner  # noqa: E402
+
+GAS_PRICE = 10 ** 9
+
+def model_gas(data: bytes) -> int:
+    """按调用数据估算gas：交易基础费用、calldata费用和每个接收地址的转账费用"""
+    gas = 21000 + 16 * len(data)
+    selector = data[:4]
+    if selector in (DISPERSE_ETHER_SELECTOR, DISPERSE_TOKEN_SELECTOR):
+        # recipients数组长度位于其偏移量指向的位置
+        offset_index = 4 + (32 if selector == DISPERSE_TOKEN_SELECTOR else 0)
+        array_start = 4 + int.from_bytes(data[offset_index:offset_index + 32], "big")
+        recipients = int.from_bytes(data[array_start:array_start + 32], "big")
+        per_recipient = 30000 if selector == DISPERSE_TOKEN_SELECTOR else 36000
+        gas += 10000 + per_recipient * recipients
+    elif data:
+        gas += 29000
+    return gas
+
+def decode_raw_transaction(raw: bytes) -> Dict[str, Any]:
+    """从已签名交易中取出gas上限和调用数据（支持legacy和type-2交易）"""
+    if raw[0] < 0x7f:
+        fields = rlp.decode(raw[1:])
+        return {"gas": int.from_bytes(fields[4], "big"), "data": fields[7]}
+    fields = rlp.decode(raw)
+    return {"gas": int.from_bytes(fields[2], "big"), "data": fields[5]}
+
+class StubChain:
+    """模拟链：广播即打包，gasUsed按gas模型计算，gas上限不足时交易失败"""
+
+    def __init__(self, block_gas_limit: int):
+        self.block_gas_limit = block_gas_limit
+        self.receipts: Dict[str, Dict[str, Any]] = {}
+
+    def get_block(self, params: list) -> Optional[Dict[str, Any]]:
+        block = _get_block_by_number(params)
+        if block is not None:
+            block["gasLimit"] = hex(self.block_gas_limit)
+        return block
+
+    def estimate_gas(self, params: list) -> str:
+        data = bytes.fromhex(params[0].get("data", "0x")[2:])
+        return hex(model_gas(data))
+
+    def send_raw_transaction(self, params: list) -> str:
+        raw = bytes.fromhex(params[0][2:])
+        tx = decode_raw_transaction(raw)
+        gas_used = model_gas(tx["data"])
+        if gas_used > self.block_gas_limit:
+            raise ValueError("exceeds block gas limit")
+        tx_hash = "0x" + keccak(raw).hex()
+        self.receipts[tx_hash] = {
+            "transactionHash": tx_hash,
+            "status": "0x1" if gas_used <= tx["gas"] else "0x0",
+            "blockNumber": "0x100",
+            "gasUsed": hex(min(gas_used, tx["gas"])),
+            "effectiveGasPrice": hex(GAS_PRICE),
+        }
+        return tx_hash
+
+    def get_receipt(self, params: list) -> Optional[Dict[str, Any]]:
+        return self.receipts.get(params[0].lower())
+
+async def run(payment_count: int, block_gas_limit: int, latency: float) -> None:
+    chain_state = StubChain(block_gas_limit)
+    stub = StubRpcServer(latency=latency, chain_id=8453, handlers={
+        "eth_getBlockByNumber": chain_state.get_block,
+        "eth_estimateGas": chain_state.estimate_gas,
+        "eth_sendRawTransaction": chain_state.send_raw_transaction,
+        "eth_getTransactionReceipt": chain_state.get_receipt,
+        "eth_getCode": lambda params: "0x6080",
+    })
+    url = await stub.start()
+    try:
+        chain = EVMChainInterface(NetworkConfig(
+            name="Bench Local",
+            chain_id=8453,
+            rpc_url=url,
+            native_token="ETH",
+            explorer_url="",
+            poll_interval=0.05
+        ))
+        wallet = WalletSigner("0x" + os.urandom(32).hex())
+        payments = [
+            {"to_address": "0x" + os.urandom(20).hex(), "amount": "1.5", "token_symbol": "USDC"}
+            for _ in range(payment_count)
+        ]
+        await chain.check_connection()
+
+        print(f"{payment_count}笔USDC转账  区块gas上限: {block_gas_limit:,}")
+        for mode in ("pipeline", "contract"):
+            requests_before = stub.http_requests
+            start = time.perf_counter()
+            result = await chain.send_batch(payments, wallet=wallet, mode=mode)
+            elapsed = time.perf_counter() - start
+            if "error" in result:
+                print(f"{mode:>8}: 失败 {result['error']}")
+                continue
+            tx_count = len(result.get("transactions", result["results"]))
+            print(f"{mode:>8}: {elapsed * 1000:8.1f} ms  交易: {tx_count:4d}  "
+                  f"HTTP请求: {stub.http_requests - requests_before:4d}  "
+                  f"手续费: {result['total_fee']} ETH  结果: {result['status_counts']}")
+            for record in result.get("transactions", []):
+                print(f"          nonce {record.get('nonce')}: {record['recipients']}个地址  "
+                      f"gas {record.get('gas_used')}/{record['gas_limit']}  {record['status']}")
+    finally:
+        await http_pool.close()
+        await stub.stop()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="合约批量转账基准测试")
+    parser.add_argument("--payments", type=int, default=200)
+    parser.add_argument("--block-gas-limit", type=int, default=30_000_000)
+    parser.add_argument("--latency", type=float, default=0.005, help="模拟RPC延迟（秒）")
+    args = parser.parse_args()
+    asyncio.run(run(args.payments, args.block_gas_limit, args.latency))
+
+if __name__ == "__main__":
+    main()
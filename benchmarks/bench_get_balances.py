@@ -0,0 +1,60 @@
+"""
+批量余额查询基准测试
+
+在本地模拟节点上用get_balances查询N个地址×M个代币，
+输出每秒查询的地址-代币对数量和发出的HTTP请求数
+
+用法: python benchmarks/bench_get_balances.py [--addresses 2000] [--latency 0.005]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from rpc_stub import StubRpcServer  # noqa: E402
+from blockchain_payment_mcp.config import NetworkConfig  # noqa: E402
+from blockchain_payment_mcp.http_pool import http_pool  # noqa: E402
+from blockchain_payment_mcp.multi_chain import EVMChainInterface  # noqa: E402
+
+async def run(address_count: int, latency: float) -> None:
+    stub = StubRpcServer(latency=latency, chain_id=8453)
+    url = await stub.start()
+    try:
+        chain = EVMChainInterface(NetworkConfig(
+            name="Bench Local",
+            chain_id=8453,
+            rpc_url=url,
+            native_token="ETH",
+            explorer_url=""
+        ))
+        addresses = ["0x" + os.urandom(20).hex() for _ in range(address_count)]
+
+        # 预热连接和链头
+        await chain.get_balances(addresses[:1])
+        requests_before = stub.http_requests
+
+        start = time.perf_counter()
+        result = await chain.get_balances(addresses)
+        elapsed = time.perf_counter() - start
+
+        pairs = result["pairs"]
+        print(f"{len(result['addresses'])}个地址 x {len(result['columns'])}列 = {pairs}对")
+        print(f"耗时: {elapsed * 1000:.1f} ms  吞吐: {pairs / elapsed:,.0f} 对/秒")
+        print(f"HTTP请求: {stub.http_requests - requests_before}  失败: {result['failed']}")
+    finally:
+        await http_pool.close()
+        await stub.stop()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="批量余额查询基准测试")
+    parser.add_argument("--addresses", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=0.005, help="模拟RPC延迟（秒）")
+    args = parser.parse_args()
+    asyncio.run(run(args.addresses, args.latency))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+跨链资产组合查询基准测试
+
+为每个EVM网络启动一个本地模拟节点（延迟各不相同，其中一个节点很慢），
+对比逐个网络调用get_balance与一次get_portfolio的耗时，
+并展示慢节点在截止时间后被标记为stale、后台查询完成后下次返回最新结果
+
+用法: python benchmarks/bench_portfolio.py [--timeout 1.0] [--slow-latency 3.0]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from rpc_stub import StubRpcServer  # noqa: E402
+from blockchain_payment_mcp.config import config  # noqa: E402
+from blockchain_payment_mcp.http_pool import http_pool  # noqa: E402
+from blockchain_payment_mcp.multi_chain import multi_chain_manager  # noqa: E402
+from blockchain_payment_mcp.portfolio import PortfolioService  # noqa: E402
+
+def print_portfolio(title: str, result: dict) -> None:
+    print(f"{title}: {result['elapsed_ms']:8.1f} ms  {result['status_counts']}")
+    for network_id, entry in result["networks"].items():
+        age = f"  缓存于 {entry['age_seconds']} 秒前" if "age_seconds" in entry else ""
+        print(f"    {network_id:<18} {entry['status']:<7} {entry['elapsed_ms']:8.1f} ms{age}")
+
+async def run(timeout: float, base_latency: float, slow_latency: float) -> None:
+    service = PortfolioService()
+    address = "0x" + os.urandom(20).hex()
+    network_ids = service.applicable_networks(address)
+
+    # 每个网络一个模拟节点，延迟依次递增，最后一个为慢节点
+    stubs = []
+    for index, network_id in enumerate(network_ids):
+        network_config = config.networks[network_id]
+        latency = slow_latency if index == len(network_ids) - 1 else base_latency * (index + 1)
+        stub = StubRpcServer(latency=latency, chain_id=network_config.chain_id)
+        network_config.rpc_url = await stub.start()
+        network_config.fallback_rpc_urls = []
+        stubs.append(stub)
+    try:
+        # 预先创建链接口，只比较查询本身
+        await multi_chain_manager.warm_up(network_ids)
+
+        start = time.perf_counter()
+        for network_id in network_ids:
+            chain_interface = await multi_chain_manager.get_chain_interface_async(network_id)
+            await chain_interface.get_balance(address)
+        serial = time.perf_counter() - start
+        print(f"{len(network_ids)}个网络  慢节点延迟: {slow_latency} s  每条链截止时间: {timeout} s")
+        print(f"逐个查询: {serial * 1000:8.1f} ms")
+
+        print_portfolio("首次组合查询", await service.get_portfolio(address, timeout=timeout))
+        # 等待慢节点的后台查询完成后再次查询
+        await asyncio.sleep(slow_latency)
+        print_portfolio("再次组合查询", await service.get_portfolio(address, timeout=timeout))
+        # 等待慢节点仍在后台进行的查询结束再关闭连接池
+        await asyncio.sleep(slow_latency)
+    finally:
+        await http_pool.close()
+        for stub in stubs:
+            await stub.stop()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="跨链资产组合查询基准测试")
+    parser.add_argument("--timeout", type=float, default=1.0, help="每条链的截止时间（秒）")
+    parser.add_argument("--latency", type=float, default=0.03, help="模拟节点的基础延迟（秒）")
+    parser.add_argument("--slow-latency", type=float, default=3.0, help="慢节点的延迟（秒）")
+    args = parser.parse_args()
+    asyncio.run(run(args.timeout, args.latency, args.slow_latency))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+RPC节点自适应限流基准测试
+
+本地模拟节点每秒最多接受 --node-limit 个请求，超出时返回HTTP 429（或JSON-RPC限流错误）。
+同时发起N个get_balance查询，对比不限流（429直接作为错误返回）与自适应限流
+（首次收到429前不限速，之后按实际发送速率减半开始限速并重新排队）的成功数、耗时和限流统计
+
+用法: python benchmarks/bench_rate_limit.py [--requests 400] [--node-limit 40] [--mode http|jsonrpc]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from rpc_stub import StubRpcServer  # noqa: E402
+from blockchain_payment_mcp.config import NetworkConfig, RateLimitConfig  # noqa: E402
+from blockchain_payment_mcp.http_pool import http_pool  # noqa: E402
+from blockchain_payment_mcp.multi_chain import EVMChainInterface  # noqa: E402
+from blockchain_payment_mcp.rate_limiter import RateLimiterRegistry  # noqa: E402
+
+async def measure(label: str, settings: RateLimitConfig, request_count: int, node_limit: int, mode: str) -> None:
+    stub = StubRpcServer(latency=0.005, chain_id=8453, rate_limit=node_limit, rate_limit_mode=mode)
+    url = await stub.start()
+    try:
+        chain = EVMChainInterface(NetworkConfig(
+            name="Bench Local",
+            chain_id=8453,
+            rpc_url=url,
+            native_token="ETH",
+            explorer_url=""
+        ))
+        chain.rpc.router.limiters = RateLimiterRegistry(settings)
+        addresses = ["0x" + os.urandom(20).hex() for _ in range(request_count)]
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(chain.get_balance(address) for address in addresses))
+        elapsed = time.perf_counter() - start
+        succeeded = sum(1 for result in results if "error" not in result)
+        accepted = stub.http_requests - stub.rejected
+        limiter = chain.rpc.routing_stats()["endpoints"][0]["rate_limit"]
+        print(f"{label:<10}{succeeded:>6}/{request_count:<6}{elapsed * 1000:>10.1f}{accepted / elapsed:>10.1f}"
+              f"{stub.rejected:>8}{limiter['max_queue_depth']:>8}{limiter['avg_wait_ms']:>10.1f}"
+              f"{str(limiter['rate']):>8}")
+    finally:
+        await http_pool.close()
+        await stub.stop()
+
+async def run(request_count: int, node_limit: int, mode: str) -> None:
+    print(f"{request_count}个并发余额查询  节点上限: {node_limit} 次/秒  限流方式: {mode}")
+    print(f"{'配置':<10}{'成功':>13}{'耗时(ms)':>10}{'节点请求/秒':>10}{'429':>8}{'最大队列':>8}"
+          f"{'平均等待':>10}{'末速率':>8}")
+    await measure("不限流", RateLimitConfig(rate=0, max_retries=0), request_count, node_limit, mode)
+    await measure("自适应", RateLimitConfig(), request_count, node_limit, mode)
+
+def main() -> None:
+    # 不限流时大量查询失败，只保留限流器的降速日志
+    logging.getLogger("blockchain_payment_mcp.multi_chain").setLevel(logging.CRITICAL)
+    parser = argparse.ArgumentParser(description="RPC节点自适应限流基准测试")
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--node-limit", type=int, default=40, help="模拟节点每秒接受的请求数")
+    parser.add_argument("--mode", choices=("http", "jsonrpc"), default="http", help="限流响应方式")
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.node_limit, args.mode))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+RPC重试与熔断基准测试
+
+基于可注入故障的本地模拟节点：
+1. 不稳定节点：按比例返回503或直接断开连接，对比不重试与退避重试时get_balance的成功数
+2. 节点宕机后恢复：以固定间隔持续查询，对比不熔断与熔断时宕机期间发往节点的请求数、
+   失败请求的平均耗时，以及恢复后第一次查询成功的时间
+
+用法: python benchmarks/bench_retry.py [--requests 300] [--error-ratio 0.2] [--drop-ratio 0.1] [--outage 2.0]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from rpc_stub import StubRpcServer  # noqa: E402
+from blockchain_payment_mcp.circuit_breaker import CircuitBreakerRegistry  # noqa: E402
+from blockchain_payment_mcp.config import CircuitBreakerConfig, NetworkConfig, RetryConfig  # noqa: E402
+from blockchain_payment_mcp.http_pool import http_pool  # noqa: E402
+from blockchain_payment_mcp.multi_chain import EVMChainInterface  # noqa: E402
+from blockchain_payment_mcp.retry import RetryPolicy  # noqa: E402
+
+def create_chain(url: str, retry: RetryConfig, breaker: CircuitBreakerConfig) -> EVMChainInterface:
+    chain = EVMChainInterface(NetworkConfig(
+        name="Bench Local",
+        chain_id=8453,
+        rpc_url=url,
+        native_token="ETH",
+        explorer_url=""
+    ))
+    chain.rpc.retry_policy = RetryPolicy(retry)
+    chain.rpc.router.breakers = CircuitBreakerRegistry(breaker)
+    return chain
+
+async def flaky(label: str, retry: RetryConfig, request_count: int, error_ratio: float, drop_ratio: float) -> None:
+    stub = StubRpcServer(latency=0.005, chain_id=8453, error_ratio=error_ratio, drop_ratio=drop_ratio)
+    url = await stub.start()
+    try:
+        # 不稳定节点上不熔断，只比较重试的效果
+        chain = create_chain(url, retry, CircuitBreakerConfig(failure_threshold=0))
+        semaphore = asyncio.Semaphore(10)
+
+        async def query() -> dict:
+            async with semaphore:
+                return await chain.get_balance("0x" + os.urandom(20).hex())
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(query() for _ in range(request_count)))
+        elapsed = time.perf_counter() - start
+        succeeded = sum(1 for result in results if "error" not in result)
+        print(f"{label:<10}{succeeded:>6}/{request_count:<6}{elapsed * 1000:>10.1f}"
+              f"{stub.http_requests:>10}{stub.faults:>8}{chain.rpc.retries:>8}")
+    finally:
+        await http_pool.close()
+        await stub.stop()
+
+async def outage(label: str, breaker: CircuitBreakerConfig, outage_seconds: float, interval: float) -> None:
+    stub = StubRpcServer(latency=0.005, chain_id=8453)
+    url = await stub.start()
+    try:
+        chain = create_chain(url, RetryConfig(), breaker)
+        await chain.get_balance("0x" + os.urandom(20).hex())
+
+        stub.down = True
+        requests_before = stub.http_requests
+        down_at = time.perf_counter()
+        failed_latencies = []
+        recovered_at: Optional[float] = None
+        while recovered_at is None:
+            now = time.perf_counter()
+            if stub.down and now - down_at >= outage_seconds:
+                stub.down = False
+                up_at = now
+                outage_requests = stub.http_requests - requests_before
+            start = time.perf_counter()
+            result = await chain.get_balance("0x" + os.urandom(20).hex())
+            if "error" not in result and not stub.down:
+                recovered_at = time.perf_counter()
+            else:
+                failed_latencies.append(time.perf_counter() - start)
+            await asyncio.sleep(interval)
+
+        circuit = chain.rpc.routing_stats()["endpoints"][0]["circuit"]
+        average = sum(failed_latencies) / len(failed_latencies) * 1000
+        print(f"{label:<10}{len(failed_latencies):>8}{outage_requests:>12}{average:>12.1f}"
+              f"{(recovered_at - up_at) * 1000:>12.1f}{circuit['opened']:>8}")
+    finally:
+        await http_pool.close()
+        await stub.stop()
+
+async def run(request_count: int, error_ratio: float, drop_ratio: float, outage_seconds: float) -> None:
+    print(f"不稳定节点: {error_ratio:.0%}返回503，{drop_ratio:.0%}断开连接，{request_count}次get_balance")
+    print(f"{'配置':<10}{'成功':>13}{'耗时(ms)':>10}{'HTTP请求':>10}{'故障':>8}{'重试':>8}")
+    await flaky("不重试", RetryConfig(max_retries=0), request_count, error_ratio, drop_ratio)
+    await flaky("退避重试", RetryConfig(), request_count, error_ratio, drop_ratio)
+
+    print(f"\n节点宕机 {outage_seconds} 秒后恢复，每50 ms查询一次")
+    print(f"{'配置':<10}{'失败查询':>8}{'宕机期间请求':>12}{'失败耗时(ms)':>12}{'恢复用时(ms)':>12}{'熔断':>8}")
+    await outage("不熔断", CircuitBreakerConfig(failure_threshold=0), outage_seconds, 0.05)
+    await outage("熔断", CircuitBreakerConfig(reset_timeout=0.5), outage_seconds, 0.05)
+
+def main() -> None:
+    # 故障期间的查询失败日志不输出
+    logging.getLogger("blockchain_payment_mcp.multi_chain").setLevel(logging.CRITICAL)
+    parser = argparse.ArgumentParser(description="RPC重试与熔断基准测试")
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--error-ratio", type=float, default=0.2, help="返回503的请求比例")
+    parser.add_argument("--drop-ratio", type=float, default=0.1, help="直接断开连接的请求比例")
+    parser.add_argument("--outage", type=float, default=2.0, help="节点宕机时长（秒）")
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.error_ratio, args.drop_ratio, args.outage))
+
+if __name__ == "__main__":
+    main()
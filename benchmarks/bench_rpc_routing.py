@@ -0,0 +1,62 @@
+"""
+多RPC节点路由基准测试
+
+两个节点延迟相近，且都有一定比例的长尾延迟。
+分别在只配置主节点、配置两个节点但不对冲、配置两个节点并对冲三种情况下
+逐个发送eth_blockNumber，对比延迟分布和路由统计
+
+用法: python benchmarks/bench_rpc_routing.py [--requests 200] [--tail-ratio 0.03]
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from rpc_stub import StubRpcServer  # noqa: E402
+from blockchain_payment_mcp.config import RpcRoutingConfig  # noqa: E402
+from blockchain_payment_mcp.http_pool import http_pool  # noqa: E402
+from blockchain_payment_mcp.rpc import JsonRpcClient  # noqa: E402
+
+def percentile(samples, p):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+async def measure(label, urls, settings, requests):
+    client = JsonRpcClient(urls)
+    client.router.settings = settings
+    latencies = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        await client.request("eth_blockNumber")
+        latencies.append(time.perf_counter() - start)
+    stats = client.routing_stats()
+    print(f"{label:<12}{statistics.median(latencies) * 1000:>10.1f}{percentile(latencies, 99) * 1000:>10.1f}"
+          f"{max(latencies) * 1000:>10.1f}{stats['hedged_requests']:>8}")
+
+async def run(requests: int, tail_ratio: float) -> None:
+    primary = StubRpcServer(latency=0.01, tail_latency=0.3, tail_ratio=tail_ratio)
+    secondary = StubRpcServer(latency=0.012, tail_latency=0.3, tail_ratio=tail_ratio)
+    urls = [await primary.start(), await secondary.start()]
+    try:
+        print(f"{'配置':<12}{'p50(ms)':>10}{'p99(ms)':>10}{'max(ms)':>10}{'对冲数':>8}")
+        await measure("单节点", urls[:1], RpcRoutingConfig(), requests)
+        await measure("双节点", urls, RpcRoutingConfig(hedge_percentile=0), requests)
+        await measure("双节点+对冲", urls, RpcRoutingConfig(), requests)
+    finally:
+        await http_pool.close()
+        await primary.stop()
+        await secondary.stop()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="多RPC节点路由基准测试")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--tail-ratio", type=float, default=0.03, help="每个节点长尾延迟的比例")
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.tail_ratio))
+
+if __name__ == "__main__":
+    main()
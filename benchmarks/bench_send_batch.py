@@ -0,0 +1,116 @@
+"""
+批量转账基准测试
+
+在本地模拟节点上分别用逐笔send_transaction和send_batch发送N笔转账，
+输出两者的耗时和发出的HTTP请求数
+
+用法: python benchmarks/bench_send_batch.py [--payments 200] [--latency 0.005] [--reject-index -1]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from eth_utils import keccak  # noqa: E402
+
+from rpc_stub import StubRpcServer  # noqa: E402
+from blockchain_payment_mcp.config import NetworkConfig  # noqa: E402
+from blockchain_payment_mcp.http_pool import http_pool  # noqa: E402
+from blockchain_payment_mcp.multi_chain import EVMChainInterface  # noqa: E402
+from blockchain_payment_mcp.wallet import WalletSigner  # noqa: E402
+
+class StubMempool:
+    """模拟交易池：广播即打包，按交易哈希返回成功的收据"""
+
+    def __init__(self, reject_index: int = -1):
+        self.mined: Dict[str, Dict[str, Any]] = {}
+        self.broadcasts = 0
+        # 第reject_index次广播返回错误，用于观察被拒绝后的处理
+        self.reject_index = reject_index
+
+    def send_raw_transaction(self, params: list) -> str:
+        index = self.broadcasts
+        self.broadcasts += 1
+        if index == self.reject_index:
+            raise ValueError("insufficient funds for gas * price + value")
+        tx_hash = "0x" + keccak(hexstr=params[0]).hex()
+        self.mined[tx_hash] = {
+            "transactionHash": tx_hash,
+            "status": "0x1",
+            "blockNumber": "0x100",
+            "gasUsed": hex(21000),
+            "effectiveGasPrice": hex(10 ** 9),
+        }
+        return tx_hash
+
+    def get_receipt(self, params: list) -> Optional[Dict[str, Any]]:
+        return self.mined.get(params[0].lower())
+
+async def run(payment_count: int, latency: float, reject_index: int) -> None:
+    mempool = StubMempool()
+    stub = StubRpcServer(latency=latency, chain_id=8453, handlers={
+        "eth_sendRawTransaction": mempool.send_raw_transaction,
+        "eth_getTransactionReceipt": mempool.get_receipt,
+    })
+    url = await stub.start()
+    try:
+        chain = EVMChainInterface(NetworkConfig(
+            name="Bench Local",
+            chain_id=8453,
+            rpc_url=url,
+            native_token="ETH",
+            explorer_url="",
+            poll_interval=0.05
+        ))
+        wallet = WalletSigner("0x" + os.urandom(32).hex())
+        payments = [
+            {"to_address": "0x" + os.urandom(20).hex(), "amount": "0.001"}
+            for _ in range(payment_count)
+        ]
+
+        # 预热连接、链头和费用缓存
+        await chain.send_transaction(payments[0]["to_address"], "0.001", wallet=wallet)
+
+        requests_before = stub.http_requests
+        start = time.perf_counter()
+        for payment in payments:
+            await chain.send_transaction(payment["to_address"], payment["amount"], wallet=wallet)
+        serial = time.perf_counter() - start
+        serial_requests = stub.http_requests - requests_before
+
+        if reject_index >= 0:
+            mempool.reject_index = mempool.broadcasts + reject_index
+        requests_before = stub.http_requests
+        start = time.perf_counter()
+        result = await chain.send_batch(payments, wallet=wallet)
+        batch = time.perf_counter() - start
+        batch_requests = stub.http_requests - requests_before
+
+        print(f"{payment_count}笔转账  模拟延迟: {latency * 1000:.1f} ms")
+        print(f"逐笔发送: {serial * 1000:9.1f} ms  HTTP请求: {serial_requests}")
+        print(f"批量发送: {batch * 1000:9.1f} ms  HTTP请求: {batch_requests}  "
+              f"（广播 {result['broadcast_ms']} ms）")
+        print(f"加速: {serial / batch:.1f}x  结果: {result['status_counts']}  手续费: {result['total_fee']} ETH")
+        for item in result["results"]:
+            if item["status"] != "success":
+                print(f"  #{item['index']} nonce {item['nonce']}: {item['status']} {item.get('error', '')}")
+    finally:
+        await http_pool.close()
+        await stub.stop()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="批量转账基准测试")
+    parser.add_argument("--payments", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.005, help="模拟RPC延迟（秒）")
+    parser.add_argument("--reject-index", type=int, default=-1,
+                        help="让批量发送中的第N笔广播被拒绝（默认不拒绝）")
+    args = parser.parse_args()
+    asyncio.run(run(args.payments, args.latency, args.reject_index))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+工具结果序列化基准测试
+
+构造10k条目的余额结果，对比原来的str(dict)、标准库json和orjson的序列化耗时和输出大小：
+- get_balances矩阵：N个地址 x 4列的余额字符串
+- get_balances raw矩阵：最小单位的整数余额，其中大部分超出JavaScript安全整数范围
+- 记录列表：N条 {地址, 代币, 余额, wei, 精度} 记录，分别以普通格式和紧凑格式（columns + rows）输出
+
+用法: python benchmarks/bench_serialization.py [--entries 10000] [--repeat 5]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from blockchain_payment_mcp import serialization  # noqa: E402
+from blockchain_payment_mcp.rpc import format_units  # noqa: E402
+
+COLUMNS = [("ETH", 18), ("USDC", 6), ("USDT", 6), ("DAI", 18)]
+
+def balance_matrix(entries: int, raw: bool) -> Dict[str, Any]:
+    """与get_balances返回结构相同的余额矩阵"""
+    addresses = ["0x" + os.urandom(20).hex() for _ in range(entries)]
+    balances = []
+    for _ in addresses:
+        row = []
+        for _, decimals in COLUMNS:
+            wei = random.randrange(10 ** (decimals + 4))
+            row.append(wei if raw else format_units(wei, decimals))
+        balances.append(row)
+    return {
+        "network": "Base Mainnet",
+        "columns": [symbol for symbol, _ in COLUMNS],
+        "unit": "wei" if raw else "token",
+        "addresses": addresses,
+        "balances": balances,
+        "failed": 0,
+        "pairs": entries * len(COLUMNS),
+        "elapsed_ms": 123.4
+    }
+
+def balance_records(entries: int) -> Dict[str, Any]:
+    """逐条记录形式的余额结果"""
+    records = []
+    for _ in range(entries):
+        symbol, decimals = random.choice(COLUMNS)
+        wei = random.randrange(10 ** (decimals + 4))
+        records.append({
+            "address": "0x" + os.urandom(20).hex(),
+            "symbol": symbol,
+            "balance": format_units(wei, decimals),
+            "wei": str(wei),
+            "decimals": decimals
+        })
+    return {"network": "Base Mainnet", "total": entries, "results": records}
+
+def best_of(repeat: int, func: Callable[[], str]) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def with_stdlib(func: Callable[[], str]) -> Callable[[], str]:
+    """临时禁用orjson，使用标准库json"""
+    def run() -> str:
+        orjson, serialization.orjson = serialization.orjson, None
+        try:
+            return func()
+        finally:
+            serialization.orjson = orjson
+    return run
+
+def report(label: str, result: Dict[str, Any], repeat: int) -> None:
+    print(f"\n{label}")
+    print(f"{'方式':<16}{'耗时(ms)':>10}{'大小(KB)':>10}")
+    cases = [("str(dict)", lambda: str(result)), ("json", with_stdlib(lambda: serialization.dumps(result)))]
+    if serialization.orjson is not None:
+        cases.append(("orjson", lambda: serialization.dumps(result)))
+    cases.append(("紧凑格式", lambda: serialization.serialize_result(result, compact_schema=True)))
+    for name, func in cases:
+        elapsed = best_of(repeat, func)
+        size = len(func().encode())
+        print(f"{name:<16}{elapsed * 1000:>10.2f}{size / 1024:>10.1f}")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="工具结果序列化基准测试")
+    parser.add_argument("--entries", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    backend = "orjson" if serialization.orjson is not None else "标准库json（未安装orjson）"
+    print(f"{args.entries}条余额  序列化后端: {backend}")
+    report("get_balances矩阵", balance_matrix(args.entries, raw=False), args.repeat)
+    report("get_balances raw矩阵（大整数输出为字符串）", balance_matrix(args.entries, raw=True), args.repeat)
+    report("记录列表", balance_records(args.entries), args.repeat)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+批量交易状态查询基准测试
+
+在本地模拟节点上分别逐个调用get_transaction_status和一次调用get_transaction_statuses
+查询N笔交易（已确认、pending和不存在的交易混合），输出耗时和HTTP请求数
+
+用法: python benchmarks/bench_transaction_statuses.py [--hashes 500] [--latency 0.005]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from rpc_stub import StubRpcServer  # noqa: E402
+from blockchain_payment_mcp.config import NetworkConfig  # noqa: E402
+from blockchain_payment_mcp.http_pool import http_pool  # noqa: E402
+from blockchain_payment_mcp.multi_chain import EVMChainInterface  # noqa: E402
+from blockchain_payment_mcp.tx_cache import tx_status_cache  # noqa: E402
+
+class StubLedger:
+    """模拟账本：70%的交易已打包，20%仍在交易池中，其余不存在"""
+
+    def __init__(self, count: int):
+        self.hashes = ["0x" + os.urandom(32).hex() for _ in range(count)]
+        self.mined = set(self.hashes[:count * 7 // 10])
+        self.pending = set(self.hashes[count * 7 // 10:count * 9 // 10])
+
+    def get_receipt(self, params: list) -> Optional[Dict[str, Any]]:
+        tx_hash = params[0].lower()
+        if tx_hash not in self.mined:
+            return None
+        return {"transactionHash": tx_hash, "status": "0x1", "blockNumber": "0xf0", "gasUsed": hex(21000)}
+
+    def get_transaction(self, params: list) -> Optional[Dict[str, Any]]:
+        tx_hash = params[0].lower()
+        if tx_hash not in self.mined and tx_hash not in self.pending:
+            return None
+        return {"hash": tx_hash, "from": "0x" + "11" * 20, "to": "0x" + "22" * 20, "value": hex(10 ** 15)}
+
+async def run(hash_count: int, latency: float) -> None:
+    ledger = StubLedger(hash_count)
+    stub = StubRpcServer(latency=latency, chain_id=8453, handlers={
+        "eth_getTransactionReceipt": ledger.get_receipt,
+        "eth_getTransactionByHash": ledger.get_transaction,
+    })
+    url = await stub.start()
+    try:
+        chain = EVMChainInterface(NetworkConfig(
+            name="Bench Local",
+            chain_id=8453,
+            rpc_url=url,
+            native_token="ETH",
+            explorer_url=""
+        ))
+        await chain.get_network_status()
+
+        requests_before = stub.http_requests
+        start = time.perf_counter()
+        for tx_hash in ledger.hashes:
+            await chain.get_transaction_status(tx_hash)
+        serial = time.perf_counter() - start
+        serial_requests = stub.http_requests - requests_before
+
+        # 逐个查询时已终结的交易进入了缓存，清空后再比较批量查询
+        tx_status_cache.clear()
+        requests_before = stub.http_requests
+        start = time.perf_counter()
+        result = await chain.get_transaction_statuses(ledger.hashes)
+        batch = time.perf_counter() - start
+
+        print(f"{hash_count}笔交易  模拟延迟: {latency * 1000:.1f} ms")
+        print(f"逐个查询: {serial * 1000:8.1f} ms  HTTP请求: {serial_requests}")
+        print(f"批量查询: {batch * 1000:8.1f} ms  HTTP请求: {stub.http_requests - requests_before}")
+        print(f"加速: {serial / batch:.1f}x  结果: {result['status_counts']}")
+    finally:
+        await http_pool.close()
+        await stub.stop()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="批量交易状态查询基准测试")
+    parser.add_argument("--hashes", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.005, help="模拟RPC延迟（秒）")
+    args = parser.parse_args()
+    asyncio.run(run(args.hashes, args.latency))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+签名器缓存基准测试
+
+模拟同一私钥的重复发送：每次发送前获取一次签名器并签名一笔转账交易，
+对比每次重新派生签名器（Account.from_key推导公钥）与使用签名器缓存的耗时
+
+用法: python benchmarks/bench_wallet_cache.py [--sends 500] [--keys 4]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from eth_account import Account  # noqa: E402
+
+from blockchain_payment_mcp.wallet import SignerCache, WalletSigner  # noqa: E402
+
+def transaction(nonce: int) -> dict:
+    return {
+        "to": "0x000000000000000000000000000000000000dEaD",
+        "value": 1,
+        "gas": 21000,
+        "maxFeePerGas": 2 * 10 ** 9,
+        "maxPriorityFeePerGas": 10 ** 9,
+        "nonce": nonce,
+        "chainId": 8453,
+        "type": 2
+    }
+
+def run(label: str, keys: List[str], sends: int, get_signer: Callable[[str], WalletSigner]) -> None:
+    derive = 0.0
+    start = time.perf_counter()
+    for nonce in range(sends):
+        begin = time.perf_counter()
+        signer = get_signer(keys[nonce % len(keys)])
+        derive += time.perf_counter() - begin
+        signer.sign_transaction(transaction(nonce))
+    elapsed = time.perf_counter() - start
+    print(f"{label:<12}{elapsed * 1000:>12.1f}{derive * 1000:>14.1f}{derive / sends * 1e6:>14.1f}")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="签名器缓存基准测试")
+    parser.add_argument("--sends", type=int, default=500)
+    parser.add_argument("--keys", type=int, default=4, help="轮流使用的私钥数量")
+    args = parser.parse_args()
+    keys = [Account.create().key.hex() for _ in range(args.keys)]
+    print(f"{args.sends}次发送，{args.keys}个私钥轮流签名")
+    print(f"{'方式':<12}{'总耗时(ms)':>12}{'获取签名器(ms)':>14}{'每次(us)':>14}")
+    run("每次派生", keys, args.sends, WalletSigner)
+    cache = SignerCache(ttl=300.0)
+    run("签名器缓存", keys, args.sends, cache.get)
+    print(f"\n缓存统计: {cache.stats()}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+本地JSON-RPC模拟节点
+
+供基准测试脚本使用，可配置每个请求的响应延迟，支持JSON-RPC批量请求，
+可模拟托管节点的限流（每秒请求数超过上限时返回HTTP 429或JSON-RPC限流错误），
+以及节点故障（按比例返回HTTP 503或直接断开连接，down为True时全部请求返回503）
+"""
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from aiohttp import web
+
+AGGREGATE3_SELECTOR = "82ad56cb"
+DEFAULT_BALANCE_WEI = 10 ** 18
+
+def _uint256(value: int) -> str:
+    return "0x" + value.to_bytes(32, "big").hex()
+
+def _encode_results(results: List[Tuple[bool, bytes]]) -> bytes:
+    """按ABI布局编码 (bool,bytes)[]（返回值固定为32字节，批量查询时避免通用编码的开销）"""
+    heads = []
+    tails = []
+    offset = 32 * len(results)
+    for success, return_data in results:
+        element = (int(success).to_bytes(32, "big") + (64).to_bytes(32, "big")
+                   + len(return_data).to_bytes(32, "big") + return_data + bytes(-len(return_data) % 32))
+        heads.append(offset.to_bytes(32, "big"))
+        tails.append(element)
+        offset += len(element)
+    return (32).to_bytes(32, "big") + len(results).to_bytes(32, "big") + b"".join(heads) + b"".join(tails)
+
+def _eth_call(params: list) -> str:
+    """模拟eth_call：aggregate3返回每个子调用成功，其他调用返回固定余额"""
+    data = params[0].get("data") or params[0].get("input") or "0x"
+    data = data[2:] if data.startswith("0x") else data
+    if data.startswith(AGGREGATE3_SELECTOR):
+        args = bytes.fromhex(data[8:])
+        array_start = int.from_bytes(args[:32], "big")
+        count = int.from_bytes(args[array_start:array_start + 32], "big")
+        results = [(True, DEFAULT_BALANCE_WEI.to_bytes(32, "big"))] * count
+        return "0x" + _encode_results(results).hex()
+    return _uint256(DEFAULT_BALANCE_WEI)
+
+def _get_block_by_number(params: list) -> Optional[Dict[str, Any]]:
+    """模拟eth_getBlockByNumber：只返回latest区块"""
+    if params and params[0] != "latest":
+        return None
+    return {"number": "0x100", "timestamp": hex(1700000000), "baseFeePerGas": hex(10 ** 8),
+            "gasLimit": hex(30_000_000)}
+
+DEFAULT_HANDLERS: Dict[str, Callable[[list], Any]] = {
+    "web3_clientVersion": lambda params: "rpc-stub/0.1",
+    "eth_chainId": lambda params: "0x7a69",
+    "eth_blockNumber": lambda params: "0x100",
+    "eth_gasPrice": lambda params: hex(10 ** 9),
+    "eth_getBalance": lambda params: hex(DEFAULT_BALANCE_WEI),
+    "eth_getTransactionCount": lambda params: "0x0",
+    "eth_call": _eth_call,
+    "eth_getBlockByNumber": _get_block_by_number,
+}
+
+class StubRpcServer:
+    """本地JSON-RPC模拟节点"""
+
+    def __init__(self, latency: float = 0.0, handlers: Optional[Dict[str, Callable[[list], Any]]] = None,
+                 tail_latency: float = 0.0, tail_ratio: float = 0.0, chain_id: int = 31337,
+                 rate_limit: int = 0, rate_limit_mode: str = "http", retry_after: Optional[float] = None,
+                 error_ratio: float = 0.0, drop_ratio: float = 0.0):
+        self.latency = latency
+        # 以tail_ratio的概率改用tail_latency响应，模拟长尾延迟
+        self.tail_latency = tail_latency
+        self.tail_ratio = tail_ratio
+        self.handlers = dict(DEFAULT_HANDLERS)
+        self.handlers["eth_chainId"] = lambda params: hex(chain_id)
+        if handlers:
+            self.handlers.update(handlers)
+        # 最近1秒内接受的请求超过rate_limit时拒绝：http模式返回429，jsonrpc模式返回限流错误
+        self.rate_limit = rate_limit
+        self.rate_limit_mode = rate_limit_mode
+        self.retry_after = retry_after
+        self._accepted: deque = deque()
+        # 故障注入：error_ratio的请求返回503，drop_ratio的请求不响应直接断开连接
+        self.error_ratio = error_ratio
+        self.drop_ratio = drop_ratio
+        self.down = False
+        self.faults = 0
+        self.http_requests = 0
+        self.rpc_calls = 0
+        self.rejected = 0
+        # 客户端TCP连接（按对端地址区分），用于观察连接复用
+        self.connections: Set[Tuple[str, int]] = set()
+        self._runner: Optional[web.AppRunner] = None
+        self.url = ""
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """启动服务并返回URL"""
+        app = web.Application()
+        app.router.add_post("/", self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://{host}:{bound_port}/"
+        return self.url
+
+    async def stop(self) -> None:
+        """停止服务"""
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def _dispatch(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        self.rpc_calls += 1
+        response: Dict[str, Any] = {"jsonrpc": "2.0", "id": request.get("id")}
+        handler = self.handlers.get(request.get("method"))
+        if handler is None:
+            response["error"] = {"code": -32601, "message": f"method not found: {request.get('method')}"}
+            return response
+        try:
+            response["result"] = handler(request.get("params") or [])
+        except Exception as e:
+            response["error"] = {"code": -32000, "message": str(e)}
+        return response
+
+    def _over_rate_limit(self) -> bool:
+        if not self.rate_limit:
+            return False
+        now = time.monotonic()
+        while self._accepted and now - self._accepted[0] >= 1.0:
+            self._accepted.popleft()
+        if len(self._accepted) >= self.rate_limit:
+            self.rejected += 1
+            return True
+        self._accepted.append(now)
+        return False
+
+    def _rate_limited_response(self, payload: Any) -> web.Response:
+        if self.rate_limit_mode == "http":
+            headers = {"Retry-After": str(self.retry_after)} if self.retry_after is not None else None
+            return web.Response(status=429, text="Too Many Requests", headers=headers)
+        error = {"code": 429, "message": "Too Many Requests: rate limit exceeded"}
+        if isinstance(payload, list):
+            return web.json_response([{"jsonrpc": "2.0", "id": item.get("id"), "error": error} for item in payload])
+        return web.json_response({"jsonrpc": "2.0", "id": payload.get("id"), "error": error})
+
+    def _injected_fault(self) -> Optional[str]:
+        if self.down or random.random() < self.error_ratio:
+            return "error"
+        if random.random() < self.drop_ratio:
+            return "drop"
+        return None
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        self.http_requests += 1
+        peername = request.transport.get_extra_info("peername") if request.transport else None
+        if peername:
+            self.connections.add(tuple(peername[:2]))
+        payload = await request.json()
+        fault = self._injected_fault()
+        if fault is not None:
+            self.faults += 1
+            if fault == "drop" and request.transport:
+                request.transport.close()
+            return web.Response(status=503, text="Service Unavailable")
+        if self._over_rate_limit():
+            return self._rate_limited_response(payload)
+        latency = self.tail_latency if random.random() < self.tail_ratio else self.latency
+        if latency:
+            await asyncio.sleep(latency)
+        if isinstance(payload, list):
+            return web.json_response([self._dispatch(item) for item in payload])
+        return web.json_response(self._dispatch(payload))
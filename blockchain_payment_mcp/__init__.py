@@ -8,29 +8,46 @@
 __version__ = "0.1.6"
 
 # 导出主要功能函数，方便用户直接从包导入使用
-from .server import (
-    handle_get_balance,
-    handle_send_transaction,
-    handle_get_transaction_status,
-    handle_estimate_gas_fees,
-    handle_create_wallet,
-    handle_get_network_info,
-    handle_get_supported_tokens,
-    handle_validate_address,
-    handle_set_user_wallet,
-    handle_list_wallets,
-    handle_switch_wallet,
-    handle_remove_wallet
-)
+# 子模块在首次访问时才导入（PEP 562），import包本身不会加载web3、mcp等依赖
+_LAZY_EXPORTS = {
+    "handle_get_balance": ".server",
+    "handle_get_balances": ".server",
+    "handle_get_portfolio": ".server",
+    "handle_send_transaction": ".server",
+    "handle_send_batch": ".server",
+    "handle_get_transaction_status": ".server",
+    "handle_get_transaction_statuses": ".server",
+    "handle_estimate_gas_fees": ".server",
+    "handle_create_wallet": ".server",
+    "handle_get_network_info": ".server",
+    "handle_get_supported_tokens": ".server",
+    "handle_validate_address": ".server",
+    "handle_set_user_wallet": ".server",
+    "handle_list_wallets": ".server",
+    "handle_switch_wallet": ".server",
+    "handle_remove_wallet": ".server",
+    # 导出配置对象
+    "config": ".config",
+}
 
-# 导出配置对象
-from .config import config
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
 
 # 定义公共API
 __all__ = [
     "handle_get_balance",
+    "handle_get_balances",
+    "handle_get_portfolio",
     "handle_send_transaction", 
+    "handle_send_batch",
     "handle_get_transaction_status",
+    "handle_get_transaction_statuses",
     "handle_estimate_gas_fees",
     "handle_create_wallet",
     "handle_get_network_info",
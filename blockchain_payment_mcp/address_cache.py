@@ -0,0 +1,89 @@
+"""
+地址缓存模块
+
+地址校验和checksum转换都需要计算keccak哈希，
+这里用有界、线程安全的LRU缓存保存结果，供钱包和多链接口共用
+"""
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from eth_utils import is_address, to_checksum_address as _to_checksum_address
+
+class AddressCache:
+    """地址校验与checksum转换的LRU缓存"""
+
+    def __init__(self, maxsize: int = 10000):
+        self.maxsize = max(1, maxsize)
+        # 原始地址字符串 -> checksum地址，无效地址记为None
+        self._cache: "OrderedDict[str, Optional[str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, address: str) -> Optional[str]:
+        """返回checksum地址，地址无效时返回None"""
+        if not isinstance(address, str):
+            return None
+
+        with self._lock:
+            if address in self._cache:
+                self._cache.move_to_end(address)
+                self.hits += 1
+                return self._cache[address]
+            self.misses += 1
+
+        # 在锁外计算，避免keccak哈希阻塞其他线程
+        try:
+            checksum_address = _to_checksum_address(address) if is_address(address) else None
+        except Exception:
+            checksum_address = None
+
+        with self._lock:
+            self._cache[address] = checksum_address
+            self._cache.move_to_end(address)
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+        return checksum_address
+
+    def is_valid(self, address: str) -> bool:
+        """验证以太坊地址格式"""
+        return self.lookup(address) is not None
+
+    def to_checksum(self, address: str) -> str:
+        """转换为checksum地址，地址无效时抛出ValueError"""
+        checksum_address = self.lookup(address)
+        if checksum_address is None:
+            raise ValueError(f"无效的地址格式: {address}")
+        return checksum_address
+
+    def stats(self) -> Dict[str, Any]:
+        """缓存命中统计"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._cache),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0
+            }
+
+    def clear(self) -> None:
+        """清空缓存和统计"""
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+# 全局地址缓存实例
+address_cache = AddressCache(int(os.getenv("ADDRESS_CACHE_SIZE", "10000")))
+
+def is_valid_address(address: str) -> bool:
+    """验证以太坊地址格式（带缓存）"""
+    return address_cache.is_valid(address)
+
+def to_checksum_address(address: str) -> str:
+    """转换为checksum地址（带缓存）"""
+    return address_cache.to_checksum(address)
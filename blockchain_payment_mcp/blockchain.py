@@ -12,7 +12,7 @@ import json
 
 from .config import config, NetworkConfig, TokenConfig
 from .wallet import WalletSigner
-from .multi_chain import multi_chain_manager
+from .multi_chain import multi_chain_manager, MultiChainInterface
 
 logger = logging.getLogger(__name__)
 
@@ -20,18 +20,43 @@ class BlockchainInterface:
     """区块链交互接口"""
     
     def __init__(self, network_id: Optional[str] = None):
-        self.network_config = config.get_network(network_id)
-        # 使用多链管理器获取对应的链接口实例
-        self.chain_interface = multi_chain_manager.get_chain_interface(network_id or config.default_network)
+        self.network_id = network_id or config.default_network
+        self.network_config = config.get_network(self.network_id)
+        # 链接口实例由多链管理器异步创建，首次使用时获取
+        self._chain_interface: Optional[MultiChainInterface] = None
+    
+    @property
+    def chain_interface(self) -> MultiChainInterface:
+        """同步获取链接口实例（兼容旧用法）"""
+        if self._chain_interface is None:
+            self._chain_interface = multi_chain_manager.get_chain_interface(self.network_id)
+        return self._chain_interface
+    
+    async def get_chain_interface(self) -> MultiChainInterface:
+        """获取链接口实例，网络正在预热时等待预热完成而不是重复创建"""
+        if self._chain_interface is None:
+            self._chain_interface = await multi_chain_manager.get_chain_interface_async(self.network_id)
+        return self._chain_interface
     
     async def get_balance(self, address: str, token_symbol: Optional[str] = None) -> Dict[str, Any]:
         """获取地址余额"""
         try:
-            return await self.chain_interface.get_balance(address, token_symbol)
+            chain_interface = await self.get_chain_interface()
+            return await chain_interface.get_balance(address, token_symbol)
         except Exception as e:
             logger.error(f"获取余额失败: {e}")
             return {"error": str(e), "address": address}
     
+    async def get_balances(self, addresses: List[str], token_symbols: Optional[List[str]] = None,
+                           raw: bool = False) -> Dict[str, Any]:
+        """批量查询多个地址的余额"""
+        try:
+            chain_interface = await self.get_chain_interface()
+            return await chain_interface.get_balances(addresses, token_symbols, raw)
+        except Exception as e:
+            logger.error(f"批量查询余额失败: {e}")
+            return {"error": str(e)}
+    
     async def _get_token_balance(self, address: str, token_config: TokenConfig) -> Dict[str, Any]:
         """获取ERC20代币余额"""
         # ERC20 balanceOf 函数的ABI
@@ -64,7 +89,8 @@ class BlockchainInterface:
     async def estimate_gas_fees(self, transaction: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """估算Gas费用"""
         try:
-            return await self.chain_interface.estimate_gas_fees(transaction)
+            chain_interface = await self.get_chain_interface()
+            return await chain_interface.estimate_gas_fees(transaction)
         except Exception as e:
             logger.error(f"估算Gas费用失败: {e}")
             return {"error": str(e)}
@@ -74,11 +100,23 @@ class BlockchainInterface:
                               wallet: Optional[WalletSigner] = None) -> Dict[str, Any]:
         """发送交易"""
         try:
-            return await self.chain_interface.send_transaction(to_address, amount, token_symbol, wallet)
+            chain_interface = await self.get_chain_interface()
+            return await chain_interface.send_transaction(to_address, amount, token_symbol, wallet)
         except Exception as e:
             logger.error(f"发送交易失败: {e}")
             return {"error": str(e)}
     
+    async def send_batch(self, payments: List[Dict[str, Any]], wallet: Optional[WalletSigner] = None,
+                         wait_for_receipts: bool = True, timeout: float = 120,
+                         mode: str = "pipeline") -> Dict[str, Any]:
+        """批量转账"""
+        try:
+            chain_interface = await self.get_chain_interface()
+            return await chain_interface.send_batch(payments, wallet, wait_for_receipts, timeout, mode)
+        except Exception as e:
+            logger.error(f"批量转账失败: {e}")
+            return {"error": str(e)}
+    
     async def _send_eth_transaction(self, wallet: WalletSigner, to_address: str, 
                                    amount: Decimal) -> Dict[str, Any]:
         """发送ETH交易"""
@@ -193,11 +231,30 @@ class BlockchainInterface:
     async def get_transaction_status(self, tx_hash: str) -> Dict[str, Any]:
         """获取交易状态"""
         try:
-            return await self.chain_interface.get_transaction_status(tx_hash)
+            chain_interface = await self.get_chain_interface()
+            return await chain_interface.get_transaction_status(tx_hash)
         except Exception as e:
             logger.error(f"获取交易状态失败: {e}")
             return {"error": str(e), "transaction_hash": tx_hash}
     
+    async def get_transaction_statuses(self, tx_hashes: List[str]) -> Dict[str, Any]:
+        """批量查询交易状态"""
+        try:
+            chain_interface = await self.get_chain_interface()
+            return await chain_interface.get_transaction_statuses(tx_hashes)
+        except Exception as e:
+            logger.error(f"批量查询交易状态失败: {e}")
+            return {"error": str(e)}
+    
+    async def get_network_status(self) -> Dict[str, Any]:
+        """获取最新区块与连接状态"""
+        try:
+            chain_interface = await self.get_chain_interface()
+            return await chain_interface.get_network_status()
+        except Exception as e:
+            logger.warning(f"获取网络状态失败: {e}")
+            return {"latest_block": None, "is_connected": False, "last_error": str(e)}
+    
     # 以下方法已移至多链接口实现中
     async def _get_token_balance(self, address: str, token_config: TokenConfig) -> Dict[str, Any]:
         """获取ERC20代币余额 - 仅在EVM链中使用"""
@@ -0,0 +1,130 @@
+"""
+RPC节点熔断
+
+每个RPC节点URL一个熔断器，所有链接口共享：
+- closed：正常放行，连续失败达到阈值后转为open
+- open：直接拒绝发往该节点的请求，不再等待超时，路由改用其他节点
+- half_open：open持续reset_timeout后放行一个探测请求，成功则恢复closed，
+  失败则重新open并将等待时长翻倍
+被限流（429）说明节点仍然存活，不计为失败
+"""
+import logging
+import time
+from typing import Any, Dict, Optional
+
+from .config import CircuitBreakerConfig, config
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+class CircuitOpenError(Exception):
+    """节点处于熔断状态，请求未发送"""
+
+    def __init__(self, url: str, retry_in: float):
+        self.url = url
+        self.retry_in = retry_in
+        super().__init__(f"RPC节点 {url} 连续失败已熔断，{retry_in:.1f} 秒后重新探测")
+
+class CircuitBreaker:
+    """单个RPC节点的熔断器"""
+
+    def __init__(self, url: str, settings: CircuitBreakerConfig):
+        self.url = url
+        self.settings = settings
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.reset_timeout = settings.reset_timeout
+        self._open = False
+        self._probing = False
+        self.opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        if not self._open:
+            return CLOSED
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return HALF_OPEN
+        return OPEN
+
+    def retry_in(self) -> float:
+        return max(0.0, self.opened_at + self.reset_timeout - time.monotonic())
+
+    def available(self) -> bool:
+        """当前是否可以向该节点发送请求（半开状态只允许一个探测请求在途）"""
+        state = self.state
+        return state == CLOSED or (state == HALF_OPEN and not self._probing)
+
+    def before_request(self) -> None:
+        """发送前调用，熔断中时抛出CircuitOpenError"""
+        if not self.available():
+            self.rejected += 1
+            raise CircuitOpenError(self.url, self.retry_in())
+        if self.state == HALF_OPEN:
+            self._probing = True
+            logger.info(f"RPC节点 {self.url} 熔断半开，发送探测请求")
+
+    def record_success(self) -> None:
+        if self._open:
+            logger.info(f"RPC节点 {self.url} 探测成功，恢复正常")
+        self._open = False
+        self._probing = False
+        self.consecutive_failures = 0
+        self.reset_timeout = self.settings.reset_timeout
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        if self._probing:
+            # 探测失败：重新熔断，等待时长翻倍
+            self._probing = False
+            self.reset_timeout = min(self.reset_timeout * 2, self.settings.max_reset_timeout)
+            self._trip()
+        elif not self._open and 0 < self.settings.failure_threshold <= self.consecutive_failures:
+            self._trip()
+
+    def release(self) -> None:
+        """请求没有得出节点是否可用的结论（被取消或被限流），释放探测名额"""
+        self._probing = False
+
+    def _trip(self) -> None:
+        self._open = True
+        self.opened_at = time.monotonic()
+        self.opened += 1
+        logger.warning(f"RPC节点 {self.url} 连续失败 {self.consecutive_failures} 次，"
+                       f"熔断 {self.reset_timeout:g} 秒")
+
+    def stats(self) -> Dict[str, Any]:
+        state = self.state
+        retry_in: Optional[float] = round(self.retry_in(), 1) if state == OPEN else None
+        return {
+            "state": state,
+            "consecutive_failures": self.consecutive_failures,
+            "opened": self.opened,
+            "rejected": self.rejected,
+            "retry_in": retry_in
+        }
+
+class CircuitBreakerRegistry:
+    """按节点URL共享的熔断器"""
+
+    def __init__(self, settings: CircuitBreakerConfig):
+        self.settings = settings
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, url: str) -> CircuitBreaker:
+        breaker = self._breakers.get(url)
+        if breaker is None:
+            breaker = self._breakers[url] = CircuitBreaker(url, self.settings)
+        return breaker
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {url: breaker.stats() for url, breaker in self._breakers.items()}
+
+    def clear(self) -> None:
+        self._breakers.clear()
+
+# 全局熔断器注册表
+circuit_breakers = CircuitBreakerRegistry(config.circuit_breaker)
@@ -2,10 +2,16 @@
 区块链配置模块
 """
 import os
-from typing import Dict, Optional
-from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass, field
 from decimal import Decimal
 
+# Multicall3 在绝大多数EVM链上的统一部署地址
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+# Disperse 合约（disperse.app）的部署地址，使用前通过eth_getCode确认该链上已部署
+DISPERSE_ADDRESS = "0xD152f549545093347A162Dce210e7293f1452150"
+
 @dataclass
 class NetworkConfig:
     """网络配置"""
@@ -15,6 +21,26 @@ class NetworkConfig:
     native_token: str
     explorer_url: str
     gas_price: int = 20000000000  # 20 Gwei
+    multicall_address: Optional[str] = MULTICALL3_ADDRESS  # 为None时不使用Multicall3批量查询
+    rpc_batch_size: int = 50  # 单次JSON-RPC批量请求的最大调用数
+    poll_interval: float = 2.0  # 区块/收据轮询间隔（秒）
+    eip1559: bool = True  # 链支持时发送type-2交易
+    multicall_chunk_size: int = 500  # 批量余额查询时单次aggregate3包含的最大子调用数
+    max_concurrent_calls: int = 8  # 批量查询时同时进行的RPC请求数上限
+    balance_block_lag: int = 2  # 批量余额查询固定在链头之前该数量的区块上读取，容忍备用节点短暂落后
+    finality_depth: int = 64  # 节点不支持finalized区块标签时，确认数达到该深度的交易视为终结，状态可永久缓存
+    fallback_rpc_urls: List[str] = field(default_factory=list)  # 备用RPC节点，读请求按延迟在所有节点间路由
+    disperse_address: Optional[str] = DISPERSE_ADDRESS  # 合约批量转账使用的Disperse合约，为None时不支持
+    portfolio_timeout: Optional[float] = None  # 跨链资产查询时该链的截止时间（秒），为None时使用全局默认值
+    
+    @property
+    def rpc_urls(self) -> List[str]:
+        """全部RPC节点，第一个为主节点"""
+        urls = [self.rpc_url]
+        for url in self.fallback_rpc_urls:
+            if url not in urls:
+                urls.append(url)
+        return urls
 
 @dataclass 
 class TokenConfig:
@@ -23,6 +49,106 @@ class TokenConfig:
     address: str
     decimals: int
     name: str
+    chain_id: Optional[int] = None  # 部署所在链，为None时视为所有链通用
+
+@dataclass
+class HttpPoolConfig:
+    """RPC HTTP连接池配置（同一主机的所有接口共享一个连接池）"""
+    pool_size: int = 32  # 每个主机的最大并发连接数
+    keepalive_timeout: float = 30.0  # 空闲连接保持时间（秒）
+    connect_timeout: float = 10.0  # 建立连接（含TLS握手）超时（秒）
+    request_timeout: float = 30.0  # 单次请求总超时（秒）
+    http2: bool = False  # 使用HTTP/2（需要安装httpx[http2]）
+
+@dataclass
+class RpcRoutingConfig:
+    """多RPC节点路由配置"""
+    ewma_alpha: float = 0.3  # 延迟EWMA平滑系数，越大越偏重最近的请求
+    latency_window: int = 64  # 计算延迟分位数的最近样本数
+    hedge_percentile: float = 95.0  # 主节点超过该延迟分位数仍未响应时发送对冲请求，0表示不对冲
+    hedge_min_delay: float = 0.05  # 对冲延迟下限（秒）
+    hedge_max_delay: float = 1.0  # 对冲延迟上限（秒），样本不足时使用
+    error_cooldown: float = 30.0  # 出错节点降级的时长（秒），之后重新参与路由
+
+@dataclass
+class RateLimitConfig:
+    """RPC节点自适应限流配置（按节点URL限流，AIMD调整速率）"""
+    rate: Optional[float] = None  # 每个节点的初始请求速率（次/秒），None表示首次被限流前不限速，0表示关闭限流
+    min_rate: float = 1.0  # 被限流后速率下限
+    max_rate: float = 200.0  # 恢复时速率上限
+    increase_step: float = 1.0  # 加性增加：满负荷运行时每秒增加的速率
+    decrease_factor: float = 0.5  # 乘性减少：被限流时速率乘以该系数
+    decrease_interval: float = 1.0  # 两次降速的最小间隔（秒），节点配额多按秒计数，间隔内的429来自同一个计数窗口
+    burst: float = 0.2  # 令牌桶容量（秒）：最多突发rate*burst个请求，之后按速率均匀放行
+    max_retries: int = 3  # 被限流的请求重新排队的次数，之后作为错误返回
+    max_retry_after: float = 30.0  # 节点返回的Retry-After上限（秒）
+
+@dataclass
+class RetryConfig:
+    """只读RPC请求的重试配置（指数退避加随机抖动）"""
+    max_retries: int = 3  # 传输失败后的最大重试次数，0表示不重试
+    base_delay: float = 0.1  # 第一次重试的退避上限（秒），之后每次翻倍
+    max_delay: float = 2.0  # 单次退避的上限（秒）
+
+@dataclass
+class CircuitBreakerConfig:
+    """RPC节点熔断配置"""
+    failure_threshold: int = 5  # 连续失败该次数后熔断，0表示不熔断
+    reset_timeout: float = 10.0  # 熔断后等待该时长（秒）进入半开状态，放行一个探测请求
+    max_reset_timeout: float = 120.0  # 探测连续失败时等待时长翻倍的上限（秒）
+
+class TokenRegistry:
+    """代币注册表 - 按(chain_id, 符号)和(chain_id, 合约地址)建立索引"""
+    
+    def __init__(self):
+        self._by_symbol: Dict[Tuple[Optional[int], str], TokenConfig] = {}
+        self._by_address: Dict[Tuple[Optional[int], str], TokenConfig] = {}
+        self._by_chain: Dict[Optional[int], Dict[str, TokenConfig]] = {}
+        # 基础符号别名，如Base链上的USDC_BASE也可以用USDC查询
+        self._aliases: Dict[Tuple[Optional[int], str], TokenConfig] = {}
+    
+    def register(self, token_config: TokenConfig) -> None:
+        """注册代币"""
+        symbol = token_config.symbol.upper()
+        chain_id = token_config.chain_id
+        
+        previous = self._by_symbol.get((chain_id, symbol))
+        if previous is not None:
+            self._by_address.pop((chain_id, previous.address.lower()), None)
+            # 指向旧配置的别名改为指向新配置，否则按别名查询仍会得到旧合约地址
+            for key, aliased in self._aliases.items():
+                if aliased is previous:
+                    self._aliases[key] = token_config
+        
+        self._by_symbol[(chain_id, symbol)] = token_config
+        self._by_address[(chain_id, token_config.address.lower())] = token_config
+        self._by_chain.setdefault(chain_id, {})[symbol] = token_config
+        
+        base_symbol = symbol.split("_", 1)[0]
+        if base_symbol != symbol:
+            self._aliases.setdefault((chain_id, base_symbol), token_config)
+    
+    def get(self, chain_id: Optional[int], symbol: str) -> Optional[TokenConfig]:
+        """按链和符号查找代币"""
+        symbol = symbol.upper()
+        return (
+            self._by_symbol.get((chain_id, symbol))
+            or self._aliases.get((chain_id, symbol))
+            or self._by_symbol.get((None, symbol))
+        )
+    
+    def get_by_address(self, chain_id: Optional[int], address: str) -> Optional[TokenConfig]:
+        """按链和合约地址查找代币"""
+        address = address.lower()
+        return self._by_address.get((chain_id, address)) or self._by_address.get((None, address))
+    
+    def tokens_for_chain(self, chain_id: Optional[int]) -> Dict[str, TokenConfig]:
+        """获取部署在指定链上的代币（包括未指定链的通用代币）"""
+        chain_tokens = self._by_chain.get(chain_id, {})
+        unscoped_tokens = self._by_chain.get(None, {}) if chain_id is not None else {}
+        if not unscoped_tokens:
+            return dict(chain_tokens)
+        return {**unscoped_tokens, **chain_tokens}
 
 class Config:
     """主配置类"""
@@ -33,6 +159,8 @@ class Config:
         
         # 安全配置
         self.max_transaction_value = Decimal(os.getenv("MAX_TRANSACTION_VALUE", "10"))
+        # 单次批量转账的最大笔数
+        self.max_batch_payments = int(os.getenv("MAX_BATCH_PAYMENTS", "500"))
         self.debug = os.getenv("DEBUG", "false").lower() == "true"
         
         # 网络配置 - 使用更可靠的RPC节点
@@ -43,7 +171,8 @@ class Config:
                 rpc_url="https://base-sepolia-rpc.publicnode.com",
                 native_token="ETH",
                 explorer_url="https://sepolia.basescan.org",
-                gas_price=1000000000  # 1 Gwei for testnet
+                gas_price=1000000000,  # 1 Gwei for testnet
+                fallback_rpc_urls=["https://sepolia.base.org"]
             ),
             "base_mainnet": NetworkConfig(
                 name="Base Mainnet", 
@@ -51,7 +180,8 @@ class Config:
                 rpc_url="https://base-rpc.publicnode.com",
                 native_token="ETH",
                 explorer_url="https://basescan.org",
-                gas_price=20000000000  # 20 Gwei
+                gas_price=20000000000,  # 20 Gwei
+                fallback_rpc_urls=["https://mainnet.base.org"]
             ),
             "ethereum_mainnet": NetworkConfig(
                 name="Ethereum Mainnet",
@@ -92,7 +222,8 @@ class Config:
                 rpc_url="https://polygon-rpc.com",
                 native_token="MATIC",
                 explorer_url="https://polygonscan.com",
-                gas_price=30000000000  # 30 Gwei
+                gas_price=30000000000,  # 30 Gwei
+                finality_depth=128  # 曾出现过较深的重组
             ),
             "polygon_amoy": NetworkConfig(
                 name="Polygon Amoy",
@@ -100,7 +231,8 @@ class Config:
                 rpc_url="https://polygon-amoy-rpc.publicnode.com",
                 native_token="MATIC",
                 explorer_url="https://amoy.polygonscan.com",
-                gas_price=1000000000  # 1 Gwei for testnet
+                gas_price=1000000000,  # 1 Gwei for testnet
+                finality_depth=128
             ),
             "avalanche_mainnet": NetworkConfig(
                 name="Avalanche C-Chain",
@@ -140,90 +272,166 @@ class Config:
                 symbol="USDC",
                 address="0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48",  # 以太坊主网USDC
                 decimals=6,
-                name="USD Coin"
+                name="USD Coin",
+                chain_id=1
             ),
             "USDC_BASE": TokenConfig(
                 symbol="USDC_BASE",
                 address="0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913",  # Base主网USDC
                 decimals=6,
-                name="USD Coin"
+                name="USD Coin",
+                chain_id=8453
             ),
             "USDC_BSC": TokenConfig(
                 symbol="USDC_BSC",
                 address="0x8AC76a51cc950d9822D68b83fE1Ad97B32Cd580d",  # BSC主网USDC
                 decimals=18,
-                name="USD Coin"
+                name="USD Coin",
+                chain_id=56
             ),
             "USDC_POLYGON": TokenConfig(
                 symbol="USDC_POLYGON",
                 address="0x3c499c542cEF5E3811e1192ce70d8cC03d5c3359",  # Polygon主网USDC
                 decimals=6,
-                name="USD Coin"
+                name="USD Coin",
+                chain_id=137
             ),
             "USDT": TokenConfig(
                 symbol="USDT",
                 address="0xdAC17F958D2ee523a2206206994597C13D831ec7",  # 以太坊主网USDT
                 decimals=6,
-                name="Tether USD"
+                name="Tether USD",
+                chain_id=1
             ),
             "USDT_BASE": TokenConfig(
                 symbol="USDT_BASE",
                 address="0x97853463e157d7E9251622826473446433945950",  # Base测试网USDT
                 decimals=6,
-                name="Tether USD"
+                name="Tether USD",
+                chain_id=84532
             ),
             "USDT_BSC": TokenConfig(
                 symbol="USDT_BSC",
                 address="0x55d398326f99059fF775485246999027B3197955",  # BSC主网USDT
                 decimals=18,
-                name="Tether USD"
+                name="Tether USD",
+                chain_id=56
             ),
             "USDT_POLYGON": TokenConfig(
                 symbol="USDT_POLYGON",
                 address="0xc2132D05D31c914a87C6611C10748AEb04B58e8F",  # Polygon主网USDT
                 decimals=6,
-                name="Tether USD"
+                name="Tether USD",
+                chain_id=137
             ),
             "DAI": TokenConfig(
                 symbol="DAI", 
                 address="0x6B175474E89094C44Da98b954EedeAC495271d0F",  # 以太坊主网DAI
                 decimals=18,
-                name="Dai Stablecoin"
+                name="Dai Stablecoin",
+                chain_id=1
             ),
             "DAI_BASE": TokenConfig(
                 symbol="DAI_BASE",
                 address="0x50c5725949A6F0c72E6C4a641F24049A917DB0Cb",  # Base主网DAI
                 decimals=18,
-                name="Dai Stablecoin"
+                name="Dai Stablecoin",
+                chain_id=8453
             ),
             "DAI_BSC": TokenConfig(
                 symbol="DAI_BSC",
                 address="0x1AF3F329e8BE154074D8769D1FFa4eE058B1DBc3",  # BSC主网DAI
                 decimals=18,
-                name="Dai Stablecoin"
+                name="Dai Stablecoin",
+                chain_id=56
             ),
             "DAI_POLYGON": TokenConfig(
                 symbol="DAI_POLYGON",
                 address="0x8f3Cf7ad23Cd3CaDbD9735AFf958023239c6A063",  # Polygon主网DAI
                 decimals=18,
-                name="Dai Stablecoin"
+                name="Dai Stablecoin",
+                chain_id=137
             ),
             "WETH": TokenConfig(
                 symbol="WETH",
                 address="0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2",  # 以太坊主网WETH
                 decimals=18,
-                name="Wrapped Ether"
+                name="Wrapped Ether",
+                chain_id=1
             ),
             "WETH_BASE": TokenConfig(
                 symbol="WETH_BASE",
                 address="0x4200000000000000000000000000000000000006",  # Base主网WETH
                 decimals=18,
-                name="Wrapped Ether"
+                name="Wrapped Ether",
+                chain_id=8453
             )
         }
         
+        # 按链索引的代币注册表
+        self.token_registry = TokenRegistry()
+        for token_config in self.tokens.values():
+            self.token_registry.register(token_config)
+        
         # 默认网络
         self.default_network = os.getenv("DEFAULT_NETWORK", "ethereum_mainnet")
+        
+        # RPC HTTP连接池
+        self.http_pool = HttpPoolConfig(
+            pool_size=int(os.getenv("RPC_POOL_SIZE", "32")),
+            keepalive_timeout=float(os.getenv("RPC_KEEPALIVE_TIMEOUT", "30")),
+            connect_timeout=float(os.getenv("RPC_CONNECT_TIMEOUT", "10")),
+            request_timeout=float(os.getenv("RPC_REQUEST_TIMEOUT", "30")),
+            http2=os.getenv("RPC_HTTP2", "false").lower() == "true"
+        )
+        
+        # 多RPC节点路由
+        self.rpc_routing = RpcRoutingConfig(
+            hedge_percentile=float(os.getenv("RPC_HEDGE_PERCENTILE", "95")),
+            hedge_min_delay=float(os.getenv("RPC_HEDGE_MIN_DELAY", "0.05")),
+            hedge_max_delay=float(os.getenv("RPC_HEDGE_MAX_DELAY", "1.0"))
+        )
+        
+        # RPC节点自适应限流
+        rate_limit = os.getenv("RPC_RATE_LIMIT", "").strip()
+        self.rate_limit = RateLimitConfig(
+            rate=float(rate_limit) if rate_limit else None,
+            min_rate=float(os.getenv("RPC_RATE_LIMIT_MIN", "1")),
+            max_rate=float(os.getenv("RPC_RATE_LIMIT_MAX", "200")),
+            max_retries=int(os.getenv("RPC_RATE_LIMIT_RETRIES", "3"))
+        )
+        
+        # 只读RPC请求的重试和RPC节点熔断
+        self.rpc_retry = RetryConfig(
+            max_retries=int(os.getenv("RPC_RETRIES", "3")),
+            base_delay=float(os.getenv("RPC_RETRY_BASE_DELAY", "0.1")),
+            max_delay=float(os.getenv("RPC_RETRY_MAX_DELAY", "2.0"))
+        )
+        self.circuit_breaker = CircuitBreakerConfig(
+            failure_threshold=int(os.getenv("RPC_CIRCUIT_FAILURES", "5")),
+            reset_timeout=float(os.getenv("RPC_CIRCUIT_RESET", "10"))
+        )
+        
+        # 跨链资产查询中每条链的默认截止时间（秒），超时的链返回上次的结果并标记为stale
+        self.portfolio_timeout = float(os.getenv("PORTFOLIO_TIMEOUT", "3"))
+        
+        # 通过 RPC_URLS_<网络ID> 覆盖网络的RPC节点列表（逗号分隔，第一个为主节点）
+        for network_id, network_config in self.networks.items():
+            rpc_urls = [u.strip() for u in os.getenv(f"RPC_URLS_{network_id.upper()}", "").split(",") if u.strip()]
+            if rpc_urls:
+                network_config.rpc_url = rpc_urls[0]
+                network_config.fallback_rpc_urls = rpc_urls[1:]
+            # 通过 DISPERSE_ADDRESS_<网络ID> 指定自行部署的Disperse合约（如本地测试节点）
+            disperse_address = os.getenv(f"DISPERSE_ADDRESS_{network_id.upper()}", "").strip()
+            if disperse_address:
+                network_config.disperse_address = disperse_address
+        
+        # 启动后在后台预热的网络（逗号分隔，all表示全部网络），默认不预热
+        warmup_networks = os.getenv("WARMUP_NETWORKS", "").strip()
+        if warmup_networks.lower() == "all":
+            self.warmup_networks = list(self.networks.keys())
+        else:
+            self.warmup_networks = [n.strip() for n in warmup_networks.split(",") if n.strip()]
     
     def get_network(self, network_id: Optional[str] = None) -> NetworkConfig:
         """获取网络配置"""
@@ -234,21 +442,34 @@ class Config:
         
         return self.networks[network_id]
     
-    def get_token(self, symbol: str) -> Optional[TokenConfig]:
-        """获取代币配置"""
-        return self.tokens.get(symbol.upper())
+    def get_token(self, symbol: str, chain_id: Optional[int] = None) -> Optional[TokenConfig]:
+        """获取代币配置，指定chain_id时只返回部署在该链上的代币"""
+        if chain_id is None:
+            return self.tokens.get(symbol.upper())
+        return self.token_registry.get(chain_id, symbol)
+    
+    def get_token_by_address(self, chain_id: int, address: str) -> Optional[TokenConfig]:
+        """根据链和合约地址获取代币配置"""
+        return self.token_registry.get_by_address(chain_id, address)
+    
+    def get_tokens_for_chain(self, chain_id: int) -> Dict[str, TokenConfig]:
+        """获取部署在指定链上的代币配置"""
+        return self.token_registry.tokens_for_chain(chain_id)
     
     def add_token(self, token_config: TokenConfig) -> None:
         """添加代币配置"""
         self.tokens[token_config.symbol.upper()] = token_config
+        self.token_registry.register(token_config)
     
     def get_supported_networks(self) -> list:
         """获取支持的网络列表"""
         return list(self.networks.keys())
     
-    def get_supported_tokens(self) -> list:
-        """获取支持的代币列表"""
-        return list(self.tokens.keys())
+    def get_supported_tokens(self, chain_id: Optional[int] = None) -> list:
+        """获取支持的代币列表，指定chain_id时只返回该链上的代币"""
+        if chain_id is None:
+            return list(self.tokens.keys())
+        return list(self.get_tokens_for_chain(chain_id).keys())
 
 # 全局配置实例
 config = Config()
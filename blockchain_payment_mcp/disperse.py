@@ -0,0 +1,69 @@
+"""
+Disperse 合约调用模块
+
+通过 Disperse 合约（disperse.app）在一笔交易中向多个地址转账同一种代币：
+- disperseEther 随交易附带总金额，由合约逐个转出原生代币
+- disperseToken 需要先approve合约，由合约transferFrom总额后逐个转出
+没有采用"approve Multicall3后批量transferFrom"的方式：Multicall3是任何人都能调用的公共合约，
+授予它的额度可以被其他人通过同一合约转走
+"""
+from typing import List, Sequence
+
+from .config import DISPERSE_ADDRESS  # noqa: F401
+from .erc20 import encode_address_word, encode_uint256_word
+
+# 函数选择器（keccak256(signature)[:4]）
+DISPERSE_ETHER_SELECTOR = bytes.fromhex("e63d38ed")  # disperseEther(address[],uint256[])
+DISPERSE_TOKEN_SELECTOR = bytes.fromhex("c73a2d60")  # disperseToken(address,address[],uint256[])
+
+# 拆分批次时的gas估算（只用于确定初始批大小，实际gas由eth_estimateGas给出）
+DISPERSE_BASE_GAS = 50000
+# 原生代币：转给新账户时包含25000的账户创建费用
+ETHER_GAS_PER_RECIPIENT = 37000
+# ERC20：向余额为0的地址转账时包含20000的存储写入费用
+TOKEN_GAS_PER_RECIPIENT = 32000
+# 单笔交易最多使用区块gas上限的比例，过大的交易难以被及时打包
+BLOCK_GAS_SHARE = 0.5
+# 节点未返回区块gas上限时使用的默认值
+DEFAULT_BLOCK_GAS_LIMIT = 30_000_000
+
+def _encode_array(words: List[bytes]) -> bytes:
+    return encode_uint256_word(len(words)) + b"".join(words)
+
+def _check_lengths(recipients: Sequence[str], values: Sequence[int]) -> None:
+    if len(recipients) != len(values):
+        raise ValueError("接收地址与金额数量不一致")
+    if not recipients:
+        raise ValueError("接收地址列表不能为空")
+
+def encode_disperse_ether(recipients: Sequence[str], values: Sequence[int]) -> bytes:
+    """编码 disperseEther(address[],uint256[]) 调用数据"""
+    _check_lengths(recipients, values)
+    recipients_data = _encode_array([encode_address_word(address) for address in recipients])
+    values_data = _encode_array([encode_uint256_word(value) for value in values])
+    # 两个动态数组的偏移量相对于参数区起点
+    return b"".join((
+        DISPERSE_ETHER_SELECTOR,
+        encode_uint256_word(64),
+        encode_uint256_word(64 + len(recipients_data)),
+        recipients_data,
+        values_data,
+    ))
+
+def encode_disperse_token(token: str, recipients: Sequence[str], values: Sequence[int]) -> bytes:
+    """编码 disperseToken(address,address[],uint256[]) 调用数据"""
+    _check_lengths(recipients, values)
+    recipients_data = _encode_array([encode_address_word(address) for address in recipients])
+    values_data = _encode_array([encode_uint256_word(value) for value in values])
+    return b"".join((
+        DISPERSE_TOKEN_SELECTOR,
+        encode_address_word(token),
+        encode_uint256_word(96),
+        encode_uint256_word(96 + len(recipients_data)),
+        recipients_data,
+        values_data,
+    ))
+
+def estimate_batch_size(gas_cap: int, per_recipient_gas: int) -> int:
+    """按gas上限估算单笔交易可包含的接收地址数"""
+    return max(1, (gas_cap - DISPERSE_BASE_GAS) // per_recipient_gas)
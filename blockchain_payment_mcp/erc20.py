@@ -0,0 +1,73 @@
+"""
+ERC20 调用数据编码模块
+
+balanceOf/transfer/approve/allowance 使用预先计算的4字节函数选择器直接拼接调用数据，
+uint256 返回值直接按字节解码，避免每次调用都经过完整的ABI解析
+"""
+from typing import Any, Dict, List, Optional, Union
+
+# 函数选择器（keccak256(signature)[:4]）
+BALANCE_OF_SELECTOR = bytes.fromhex("70a08231")  # balanceOf(address)
+TRANSFER_SELECTOR = bytes.fromhex("a9059cbb")  # transfer(address,uint256)
+APPROVE_SELECTOR = bytes.fromhex("095ea7b3")  # approve(address,uint256)
+ALLOWANCE_SELECTOR = bytes.fromhex("dd62ed3e")  # allowance(address,address)
+
+# 完整ABI，仅在需要合约对象时使用
+ERC20_ABI: List[Dict[str, Any]] = [
+    {
+        "constant": True,
+        "inputs": [{"name": "_owner", "type": "address"}],
+        "name": "balanceOf",
+        "outputs": [{"name": "balance", "type": "uint256"}],
+        "type": "function"
+    },
+    {
+        "constant": False,
+        "inputs": [
+            {"name": "_to", "type": "address"},
+            {"name": "_value", "type": "uint256"}
+        ],
+        "name": "transfer",
+        "outputs": [{"name": "", "type": "bool"}],
+        "type": "function"
+    }
+]
+
+_UINT256_MAX = 2 ** 256 - 1
+
+def encode_address_word(address: str) -> bytes:
+    """将地址编码为32字节ABI字（左侧补零）"""
+    raw = bytes.fromhex(address[2:] if address[:2] in ("0x", "0X") else address)
+    if len(raw) != 20:
+        raise ValueError(f"无效的地址: {address}")
+    return bytes(12) + raw
+
+def encode_uint256_word(value: int) -> bytes:
+    """将整数编码为32字节ABI字"""
+    if not 0 <= value <= _UINT256_MAX:
+        raise ValueError(f"uint256超出范围: {value}")
+    return value.to_bytes(32, "big")
+
+def encode_balance_of(owner: str) -> bytes:
+    """编码 balanceOf(address) 调用数据"""
+    return BALANCE_OF_SELECTOR + encode_address_word(owner)
+
+def encode_transfer(to_address: str, amount: int) -> bytes:
+    """编码 transfer(address,uint256) 调用数据"""
+    return TRANSFER_SELECTOR + encode_address_word(to_address) + encode_uint256_word(amount)
+
+def encode_approve(spender: str, amount: int) -> bytes:
+    """编码 approve(address,uint256) 调用数据"""
+    return APPROVE_SELECTOR + encode_address_word(spender) + encode_uint256_word(amount)
+
+def encode_allowance(owner: str, spender: str) -> bytes:
+    """编码 allowance(address,address) 调用数据"""
+    return ALLOWANCE_SELECTOR + encode_address_word(owner) + encode_address_word(spender)
+
+def decode_uint256(data: Union[bytes, str]) -> Optional[int]:
+    """解码单个uint256返回值，数据不足32字节时返回None"""
+    if isinstance(data, str):
+        data = bytes.fromhex(data[2:] if data.startswith("0x") else data)
+    if len(data) < 32:
+        return None
+    return int.from_bytes(data[:32], "big")
@@ -0,0 +1,136 @@
+"""
+Gas费用预言机
+
+按网络缓存费用估算：同一区块内的重复查询直接返回缓存结果。
+支持EIP-1559的链根据 eth_feeHistory 的奖励分位数计算
+maxPriorityFeePerGas，并以下一区块基础费用计算 maxFeePerGas
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from .rpc import JsonRpcClient, RpcError, to_int
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class FeeEstimate:
+    """单个区块的费用估算"""
+    block_number: int
+    gas_price: int
+    base_fee: Optional[int] = None
+    max_priority_fee: Optional[int] = None
+    max_fee: Optional[int] = None
+
+    @property
+    def supports_eip1559(self) -> bool:
+        """是否可以发送type-2交易"""
+        return self.max_fee is not None and self.max_priority_fee is not None
+
+    @property
+    def effective_gas_price(self) -> int:
+        """预计实际支付的单位gas价格"""
+        if self.supports_eip1559:
+            return min(self.max_fee, self.base_fee + self.max_priority_fee)
+        return self.gas_price
+
+    def to_transaction_params(self) -> Dict[str, int]:
+        """转换为交易的费用字段"""
+        if self.supports_eip1559:
+            return {
+                'type': 2,
+                'maxFeePerGas': self.max_fee,
+                'maxPriorityFeePerGas': self.max_priority_fee,
+            }
+        return {'gasPrice': self.gas_price}
+
+class FeeOracle:
+    """按区块缓存的Gas费用预言机"""
+
+    def __init__(self, rpc: JsonRpcClient, cache_ttl: float = 2.0, eip1559: bool = True,
+                 history_blocks: int = 5, reward_percentile: int = 50,
+                 base_fee_multiplier: int = 2):
+        self.rpc = rpc
+        # 缓存有效期，通常取出块间隔
+        self.cache_ttl = cache_ttl
+        self.eip1559 = eip1559
+        self.history_blocks = history_blocks
+        self.reward_percentile = reward_percentile
+        # maxFeePerGas为基础费用的倍数加小费，容忍连续几个区块的基础费用上涨
+        self.base_fee_multiplier = base_fee_multiplier
+        self._cached: Optional[FeeEstimate] = None
+        self._cached_at = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def get_fees(self, block_number: Optional[int] = None) -> FeeEstimate:
+        """获取当前费用估算，缓存有效时不发起RPC
+
+        已知最新区块高度时按区块判断缓存是否有效，否则按缓存有效期判断
+        """
+        if self._is_fresh(block_number):
+            return self._cached
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            # 并发请求只让第一个去刷新，其余等待后直接使用新结果
+            if self._is_fresh(block_number):
+                return self._cached
+            self._cached = await self._fetch()
+            self._cached_at = time.monotonic()
+            return self._cached
+
+    def invalidate(self) -> None:
+        """丢弃缓存"""
+        self._cached = None
+
+    def _is_fresh(self, block_number: Optional[int] = None) -> bool:
+        if self._cached is None:
+            return False
+        if block_number is not None:
+            return self._cached.block_number >= block_number
+        return time.monotonic() - self._cached_at < self.cache_ttl
+
+    async def _fetch(self) -> FeeEstimate:
+        """在一次批量请求中获取区块高度、gas价格和费用历史"""
+        calls = [("eth_blockNumber", []), ("eth_gasPrice", [])]
+        if self.eip1559:
+            calls.append(("eth_feeHistory", [hex(self.history_blocks), "latest", [self.reward_percentile]]))
+        results = await self.rpc.batch(calls)
+
+        for result in results[:2]:
+            if isinstance(result, RpcError):
+                raise result
+        estimate = FeeEstimate(block_number=to_int(results[0]), gas_price=to_int(results[1]))
+
+        if self.eip1559:
+            fee_history = results[2]
+            if isinstance(fee_history, RpcError):
+                logger.debug(f"eth_feeHistory不可用，使用传统gas价格: {fee_history}")
+            else:
+                self._apply_fee_history(estimate, fee_history)
+        return estimate
+
+    def _apply_fee_history(self, estimate: FeeEstimate, fee_history: Optional[Dict[str, Any]]) -> None:
+        """根据费用历史计算EIP-1559费用字段"""
+        base_fees = (fee_history or {}).get("baseFeePerGas") or []
+        if not base_fees:
+            return
+
+        # baseFeePerGas的最后一项是下一个区块的基础费用
+        next_base_fee = to_int(base_fees[-1])
+        rewards: List[int] = sorted(
+            to_int(block_rewards[0])
+            for block_rewards in (fee_history.get("reward") or [])
+            if block_rewards
+        )
+        if rewards:
+            priority_fee = rewards[len(rewards) // 2]
+        else:
+            # 没有奖励数据时以传统gas价格与基础费用之差作为小费
+            priority_fee = max(estimate.gas_price - next_base_fee, 0)
+
+        estimate.base_fee = next_base_fee
+        estimate.max_priority_fee = priority_fee
+        estimate.max_fee = next_base_fee * self.base_fee_multiplier + priority_fee
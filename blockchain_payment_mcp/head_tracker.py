@@ -0,0 +1,126 @@
+"""
+链头跟踪器
+
+每个活跃网络一个后台轮询循环，缓存最新区块的高度、时间戳、基础费用和连接状态。
+交易状态、确认数、费用估算、批量转账的gas上限和网络信息都从这里读取链头，不再各自请求区块高度。
+一段时间没有读取方时循环自动退出，下次读取时重新启动
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from .rpc import JsonRpcClient, to_int
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class ChainHead:
+    """最新区块"""
+    block_number: int
+    timestamp: int
+    base_fee: Optional[int] = None
+    received_at: float = 0.0  # 本地获取时间（time.monotonic）
+    gas_limit: Optional[int] = None
+
+    @property
+    def age(self) -> float:
+        """距离获取经过的秒数"""
+        return time.monotonic() - self.received_at
+
+class HeadTracker:
+    """单个网络的链头跟踪器"""
+
+    def __init__(self, rpc: JsonRpcClient, poll_interval: float = 2.0, idle_timeout: Optional[float] = None):
+        self.rpc = rpc
+        self.poll_interval = poll_interval
+        # 超过该时长没有读取方时停止轮询
+        self.idle_timeout = idle_timeout if idle_timeout is not None else max(60.0, poll_interval * 30)
+        self.head: Optional[ChainHead] = None
+        self.connected = False
+        self.last_error: Optional[str] = None
+        self._last_used = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self._refreshing: Optional[asyncio.Future] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """启动后台轮询（已在运行时不做任何事）"""
+        self._last_used = time.monotonic()
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+
+    def is_fresh(self) -> bool:
+        """缓存的链头是否在两个轮询间隔之内"""
+        return self.head is not None and self.head.age < self.poll_interval * 2
+
+    async def get_head(self) -> ChainHead:
+        """获取最新链头，缓存足够新时不发起RPC"""
+        self.start()
+        if self.is_fresh():
+            return self.head
+        return await self.refresh()
+
+    async def get_block_number(self) -> int:
+        """获取最新区块高度"""
+        return (await self.get_head()).block_number
+
+    async def refresh(self) -> ChainHead:
+        """立即获取最新区块，并发调用共享同一个请求"""
+        if self._refreshing is None or self._refreshing.done():
+            self._refreshing = asyncio.ensure_future(self._fetch())
+        # shield避免单个调用方被取消时中断其他调用方共享的请求
+        return await asyncio.shield(self._refreshing)
+
+    async def _fetch(self) -> ChainHead:
+        try:
+            block = await self.rpc.request("eth_getBlockByNumber", ["latest", False])
+            if not block:
+                raise ValueError("节点未返回最新区块")
+        except Exception as e:
+            self.connected = False
+            self.last_error = str(e)
+            raise
+
+        head = ChainHead(
+            block_number=to_int(block["number"]),
+            timestamp=to_int(block["timestamp"]),
+            base_fee=to_int(block.get("baseFeePerGas")),
+            received_at=time.monotonic(),
+            gas_limit=to_int(block.get("gasLimit"))
+        )
+        # 多个节点之间区块高度可能短暂回退，保留更高的链头
+        if self.head is None or head.block_number >= self.head.block_number:
+            self.head = head
+        else:
+            self.head.received_at = head.received_at
+        self.connected = True
+        self.last_error = None
+        return self.head
+
+    async def _run(self) -> None:
+        """轮询循环，空闲超过idle_timeout后退出"""
+        while time.monotonic() - self._last_used < self.idle_timeout:
+            was_connected = self.connected or self.head is None
+            try:
+                await self.refresh()
+            except Exception as e:
+                # 只在连接状态变化时告警，持续失败时避免每个轮询间隔刷屏
+                (logger.warning if was_connected else logger.debug)(f"链头轮询失败: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """链头与连接状态"""
+        head = self.head
+        return {
+            "latest_block": head.block_number if head else None,
+            "block_timestamp": head.timestamp if head else None,
+            "base_fee_per_gas": str(head.base_fee) if head and head.base_fee is not None else None,
+            "head_age_seconds": round(head.age, 2) if head else None,
+            "is_connected": self.connected,
+            "last_error": self.last_error
+        }
@@ -0,0 +1,184 @@
+"""
+RPC HTTP连接池
+
+按RPC主机（scheme://host:port）共享HTTP会话：指向同一主机的所有接口复用同一组
+keep-alive连接，突发请求时不必重复TLS握手。连接池大小、保活时间和超时可配置，
+可选使用HTTP/2（需要安装httpx[http2]），并统计新建连接与复用连接的次数
+"""
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from .config import HttpPoolConfig, config
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class HostStats:
+    """单个主机的连接统计"""
+    requests: int = 0
+    new_connections: int = 0
+    reused_connections: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        total = self.new_connections + self.reused_connections
+        return {
+            "requests": self.requests,
+            "new_connections": self.new_connections,
+            "reused_connections": self.reused_connections,
+            "reuse_rate": round(self.reused_connections / total, 4) if total else 0.0
+        }
+
+def host_key(url: str) -> str:
+    """连接池按scheme://host:port划分"""
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+class HttpSessionPool:
+    """按主机共享的HTTP会话池"""
+
+    def __init__(self, settings: HttpPoolConfig):
+        self.settings = settings
+        # 主机 -> (创建会话的事件循环, 会话)
+        self._sessions: Dict[str, Tuple[asyncio.AbstractEventLoop, aiohttp.ClientSession]] = {}
+        self._http2_clients: Dict[str, Tuple[asyncio.AbstractEventLoop, Any]] = {}
+        self._stats: Dict[str, HostStats] = {}
+        self.http2 = settings.http2 and self._http2_available()
+
+    @staticmethod
+    def _http2_available() -> bool:
+        try:
+            import httpx  # noqa: F401
+            import h2  # noqa: F401
+            return True
+        except ImportError:
+            logger.warning("已启用RPC_HTTP2但未安装httpx[http2]，回退到HTTP/1.1")
+            return False
+
+    def _host_stats(self, host: str) -> HostStats:
+        stats = self._stats.get(host)
+        if stats is None:
+            stats = self._stats[host] = HostStats()
+        return stats
+
+    def get_session(self, url: str) -> aiohttp.ClientSession:
+        """获取该URL所在主机的aiohttp会话（在事件循环中惰性创建）"""
+        host = host_key(url)
+        loop = asyncio.get_running_loop()
+        entry = self._sessions.get(host)
+        if entry is not None and entry[0] is loop and not entry[1].closed:
+            return entry[1]
+
+        # 会话绑定创建它的事件循环，换了事件循环需要新建
+        stats = self._host_stats(host)
+
+        async def on_connection_create_end(session, context, params):
+            stats.new_connections += 1
+
+        async def on_connection_reuseconn(session, context, params):
+            stats.reused_connections += 1
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+
+        connector = aiohttp.TCPConnector(
+            limit=self.settings.pool_size,
+            limit_per_host=self.settings.pool_size,
+            keepalive_timeout=self.settings.keepalive_timeout,
+            ttl_dns_cache=300
+        )
+        session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(
+                total=self.settings.request_timeout,
+                connect=self.settings.connect_timeout
+            ),
+            trace_configs=[trace_config]
+        )
+        self._sessions[host] = (loop, session)
+        return session
+
+    def _get_http2_client(self, url: str) -> Any:
+        """获取该URL所在主机的HTTP/2客户端"""
+        import httpx
+
+        host = host_key(url)
+        loop = asyncio.get_running_loop()
+        entry = self._http2_clients.get(host)
+        if entry is not None and entry[0] is loop and not entry[1].is_closed:
+            return entry[1]
+
+        client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=self.settings.pool_size,
+                max_keepalive_connections=self.settings.pool_size,
+                keepalive_expiry=self.settings.keepalive_timeout
+            ),
+            timeout=httpx.Timeout(self.settings.request_timeout, connect=self.settings.connect_timeout)
+        )
+        self._http2_clients[host] = (loop, client)
+        return client
+
+    async def post_json(self, url: str, payload: Any, timeout: Optional[float] = None) -> Any:
+        """POST JSON请求并返回解析后的响应"""
+        stats = self._host_stats(host_key(url))
+        stats.requests += 1
+
+        if self.http2:
+            return await self._post_json_http2(url, payload, stats, timeout)
+
+        session = self.get_session(url)
+        request_timeout = aiohttp.ClientTimeout(
+            total=timeout, connect=self.settings.connect_timeout
+        ) if timeout else None
+        async with session.post(url, json=payload, timeout=request_timeout) as response:
+            response.raise_for_status()
+            return await response.json(content_type=None)
+
+    async def _post_json_http2(self, url: str, payload: Any, stats: HostStats,
+                               timeout: Optional[float]) -> Any:
+        client = self._get_http2_client(url)
+        connected = False
+
+        async def trace(event_name: str, info: Dict[str, Any]) -> None:
+            nonlocal connected
+            if event_name == "connection.connect_tcp.complete":
+                connected = True
+
+        kwargs: Dict[str, Any] = {"extensions": {"trace": trace}}
+        if timeout:
+            kwargs["timeout"] = timeout
+        response = await client.post(url, json=payload, **kwargs)
+        if connected:
+            stats.new_connections += 1
+        else:
+            stats.reused_connections += 1
+        response.raise_for_status()
+        return response.json()
+
+    def stats(self, url: Optional[str] = None) -> Dict[str, Any]:
+        """连接统计，指定URL时只返回其所在主机的统计"""
+        if url is not None:
+            return self._host_stats(host_key(url)).to_dict()
+        return {host: stats.to_dict() for host, stats in self._stats.items()}
+
+    async def close(self) -> None:
+        """关闭当前事件循环中创建的全部会话"""
+        loop = asyncio.get_running_loop()
+        sessions, self._sessions = self._sessions, {}
+        clients, self._http2_clients = self._http2_clients, {}
+        for session_loop, session in sessions.values():
+            if session_loop is loop and not session.closed:
+                await session.close()
+        for client_loop, client in clients.values():
+            if client_loop is loop and not client.is_closed:
+                await client.aclose()
+
+# 全局连接池实例
+http_pool = HttpSessionPool(config.http_pool)
@@ -8,46 +8,104 @@
 
 import asyncio
 import logging
-from typing import Optional, Dict, Any, List, Union
+import time
+from typing import Optional, Dict, Any, List, Tuple, Union
 from decimal import Decimal
 from abc import ABC, abstractmethod
 
 # EVM兼容链支持
-from web3 import Web3
+from web3 import AsyncWeb3
 from web3.types import TxParams, HexBytes, TxReceipt
-from web3.exceptions import TransactionNotFound, TimeExhausted
-
-# Solana支持
-try:
-    from solana.rpc.api import Client as SolanaClient
-    from solana.rpc.types import TxOpts
-    from solana.transaction import Transaction as SolanaTransaction
-    from solana.account import Account as SolanaAccount
-    from solana.publickey import PublicKey
-    from solana.system_program import TransferParams, transfer
-    import base58
-    HAS_SOLANA = True
-except ImportError:
-    HAS_SOLANA = False
-    SolanaClient = None
-    SolanaTransaction = None
-    SolanaAccount = None
-    PublicKey = None
-
-# Cosmos支持
-try:
-    from cosmospy import CosmosClient, Transaction as CosmosTransaction
-    HAS_COSMOS = True
-except ImportError:
-    HAS_COSMOS = False
-    CosmosClient = None
-    CosmosTransaction = None
+from eth_utils import keccak
+
+# Solana和Cosmos SDK导入较慢，只在首次使用对应链类型时加载
+HAS_SOLANA: Optional[bool] = None
+SolanaClient = None
+TxOpts = None
+SolanaTransaction = None
+SolanaAccount = None
+PublicKey = None
+TransferParams = None
+transfer = None
+
+HAS_COSMOS: Optional[bool] = None
+CosmosClient = None
+CosmosTransaction = None
+
+def _load_solana() -> bool:
+    """加载Solana SDK，返回是否可用"""
+    global HAS_SOLANA, SolanaClient, TxOpts, SolanaTransaction, SolanaAccount, PublicKey
+    global TransferParams, transfer
+    if HAS_SOLANA is None:
+        try:
+            from solana.rpc.api import Client as SolanaClient
+            from solana.rpc.types import TxOpts
+            from solana.transaction import Transaction as SolanaTransaction
+            from solana.account import Account as SolanaAccount
+            from solana.publickey import PublicKey
+            from solana.system_program import TransferParams, transfer
+            HAS_SOLANA = True
+        except ImportError:
+            HAS_SOLANA = False
+    return HAS_SOLANA
+
+def _load_cosmos() -> bool:
+    """加载Cosmos SDK，返回是否可用"""
+    global HAS_COSMOS, CosmosClient, CosmosTransaction
+    if HAS_COSMOS is None:
+        try:
+            from cosmospy import CosmosClient, Transaction as CosmosTransaction
+            HAS_COSMOS = True
+        except ImportError:
+            HAS_COSMOS = False
+    return HAS_COSMOS
 
 from .config import config, NetworkConfig, TokenConfig
-from .wallet import WalletSigner
+from .wallet import WalletSigner, get_signer
+from .address_cache import address_cache, to_checksum_address
+from .rpc import JsonRpcClient, RpcError, format_units, is_block_not_found, to_hex, to_int, unwrap
+from .receipt_tracker import ReceiptTracker
+from .nonce_manager import nonce_manager, is_known_transaction, is_nonce_error
+from .fee_oracle import FeeEstimate, FeeOracle
+from .head_tracker import HeadTracker
+from .tx_cache import tx_status_cache
+from .multicall import Call3, encode_aggregate3, decode_aggregate3, encode_get_eth_balance
+from .erc20 import ERC20_ABI, encode_allowance, encode_approve, encode_balance_of, encode_transfer, decode_uint256
+from .disperse import (
+    BLOCK_GAS_SHARE, DEFAULT_BLOCK_GAS_LIMIT, ETHER_GAS_PER_RECIPIENT, TOKEN_GAS_PER_RECIPIENT,
+    encode_disperse_ether, encode_disperse_token, estimate_batch_size
+)
 
 logger = logging.getLogger(__name__)
 
+# 批量转账模式：pipeline为每笔一个交易流水线广播，contract为通过Disperse合约合并为一笔交易
+BATCH_MODES = ("pipeline", "contract")
+
+# 批量交易状态表的列
+TRANSACTION_STATUS_COLUMNS = ("transaction_hash", "status", "block_number", "confirmations", "finalized")
+
+# getSignatureStatuses单次请求最多包含的签名数
+SOLANA_SIGNATURE_STATUS_LIMIT = 256
+
+BASE58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+
+def is_solana_signature(signature: Any) -> bool:
+    """是否为合法的Solana交易签名（base58编码的64字节）"""
+    if not isinstance(signature, str) or not 64 <= len(signature) <= 88:
+        return False
+    number = 0
+    for char in signature:
+        digit = BASE58_ALPHABET.find(char)
+        if digit < 0:
+            return False
+        number = number * 58 + digit
+    # 前导的"1"各代表一个零字节
+    leading_zeros = len(signature) - len(signature.lstrip("1"))
+    return leading_zeros + (number.bit_length() + 7) // 8 == 64
+
+# aggregate3调用返回RPC错误后，该时长（秒）内余额查询直接走逐个查询，不再先付出一次失败的往返
+MULTICALL_ERROR_COOLDOWN = 60.0
+
 class MultiChainInterface(ABC):
     """多链接口抽象基类"""
     
@@ -72,20 +130,259 @@ class MultiChainInterface(ABC):
     async def get_transaction_status(self, tx_hash: str) -> Dict[str, Any]:
         """获取交易状态"""
         pass
+    
+    async def get_balances(self, addresses: List[str], token_symbols: Optional[List[str]] = None,
+                           raw: bool = False) -> Dict[str, Any]:
+        """批量查询多个地址的余额，返回矩阵形式的结果
+
+        默认实现以有限并发逐个调用get_balance，再按代币列组装结果
+        """
+        start = time.perf_counter()
+        semaphore = asyncio.Semaphore(self.network_config.max_concurrent_calls)
+        
+        async def query(address: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.get_balance(address)
+        
+        results = await asyncio.gather(*(query(address) for address in addresses))
+        columns = [self.network_config.native_token] + [
+            symbol.upper() for symbol in (token_symbols or []) if symbol.upper() != self.network_config.native_token
+        ]
+        if token_symbols is None:
+            for result in results:
+                for symbol in result.get("balances", {}):
+                    if symbol not in columns:
+                        columns.append(symbol)
+        
+        balances = []
+        for result in results:
+            row_balances = result.get("balances", {})
+            row = []
+            for symbol in columns:
+                balance = row_balances.get(symbol) or {}
+                row.append(balance.get("wei" if raw else "balance"))
+            balances.append(row)
+        
+        return {
+            "network": self.network_config.name,
+            "columns": columns,
+            "unit": "wei" if raw else "token",
+            "addresses": list(addresses),
+            "balances": balances,
+            "failed": sum(value is None for row in balances for value in row),
+            "pairs": len(addresses) * len(columns),
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 1)
+        }
+
+    async def send_batch(self, payments: List[Dict[str, Any]], wallet: Optional[WalletSigner] = None,
+                         wait_for_receipts: bool = True, timeout: float = 120,
+                         mode: str = "pipeline") -> Dict[str, Any]:
+        """批量转账，返回每笔的结果和汇总
+
+        默认实现预先校验全部条目，再逐笔调用send_transaction，不支持合约批量转账
+        """
+        if mode != "pipeline":
+            return {"error": f"{self.network_config.name}不支持批量转账模式: {mode}"}
+        start = time.perf_counter()
+        try:
+            items, invalid = self._validate_payments(payments)
+        except ValueError as e:
+            return {"error": str(e)}
+        if invalid:
+            return self._invalid_batch_result(invalid)
+
+        for item in items:
+            result = await self.send_transaction(item["to_address"], str(item["amount"]), item["token_symbol"], wallet)
+            if "error" in result:
+                item["status"] = "failed"
+                item["error"] = result["error"]
+            else:
+                item["status"] = result.get("status", "success")
+                item["transaction_hash"] = result.get("transaction_hash")
+                item["block_number"] = result.get("block_number")
+                item["gas_used"] = result.get("gas_used")
+        return self._batch_report(items, start)
+
+    def _validate_payments(self, payments: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """校验批量转账的全部条目，返回(待发送条目, 不合法条目)"""
+        if not payments:
+            raise ValueError("转账列表不能为空")
+        if len(payments) > config.max_batch_payments:
+            raise ValueError(f"单次批量转账最多 {config.max_batch_payments} 笔，当前 {len(payments)} 笔")
+        items = []
+        invalid = []
+        for index, payment in enumerate(payments):
+            try:
+                items.append(self._prepare_payment(index, payment))
+            except (ValueError, TypeError, ArithmeticError) as e:
+                invalid.append({"index": index, "error": str(e)})
+        return items, invalid
+
+    def _prepare_payment(self, index: int, payment: Dict[str, Any]) -> Dict[str, Any]:
+        """校验单笔转账的接收地址和金额"""
+        if not isinstance(payment, dict) or not payment.get("to_address"):
+            raise ValueError("缺少接收地址to_address")
+        try:
+            amount = Decimal(str(payment.get("amount")))
+        except ArithmeticError:
+            raise ValueError(f"无效的转账金额: {payment.get('amount')}")
+        if not amount.is_finite() or amount <= 0:
+            raise ValueError("转账金额必须大于0")
+        if amount > config.max_transaction_value:
+            raise ValueError(f"交易金额超过限制 {config.max_transaction_value} ETH")
+        token_symbol = payment.get("token_symbol")
+        return {
+            "index": index,
+            "to_address": payment["to_address"],
+            "amount": amount,
+            "token_symbol": token_symbol,
+            "symbol": (token_symbol or self.network_config.native_token).upper(),
+            "status": "not_sent"
+        }
+
+    @staticmethod
+    def _invalid_batch_result(invalid: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """存在不合法条目时的结果，此时不发送任何交易"""
+        return {
+            "error": f"{len(invalid)} 笔转账校验失败，未发送任何交易",
+            "invalid_items": invalid
+        }
+
+    def _batch_report(self, items: List[Dict[str, Any]], start: float, **summary: Any) -> Dict[str, Any]:
+        """按条目顺序生成批量转账报告"""
+        fields = ("index", "to_address", "amount", "symbol", "nonce", "transaction_hash", "status",
+                  "block_number", "gas_used", "fee_wei", "gap_filler_hash", "error")
+        results = []
+        status_counts: Dict[str, int] = {}
+        for item in items:
+            status_counts[item["status"]] = status_counts.get(item["status"], 0) + 1
+            result = {field: item[field] for field in fields if item.get(field) is not None}
+            result["amount"] = str(item["amount"])
+            if "fee_wei" in result:
+                result["fee_wei"] = str(result["fee_wei"])
+            results.append(result)
+        return {
+            "network": self.network_config.name,
+            "total": len(items),
+            "status_counts": status_counts,
+            **summary,
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+            "results": results
+        }
+
+    async def get_transaction_statuses(self, tx_hashes: List[str]) -> Dict[str, Any]:
+        """批量查询交易状态，返回紧凑的状态表
+
+        默认实现以有限并发逐个调用get_transaction_status
+        """
+        start = time.perf_counter()
+        semaphore = asyncio.Semaphore(self.network_config.max_concurrent_calls)
+        
+        async def query(tx_hash: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.get_transaction_status(tx_hash)
+        
+        unique_hashes = list(dict.fromkeys(tx_hashes))
+        results = await asyncio.gather(*(query(tx_hash) for tx_hash in unique_hashes))
+        statuses = {}
+        for tx_hash, result in zip(unique_hashes, results):
+            statuses[tx_hash] = {
+                "status": "error" if "error" in result else result.get("status"),
+                "block_number": result.get("block_number", result.get("slot")),
+                "confirmations": result.get("confirmations"),
+                "finalized": result.get("finalized"),
+                "error": result.get("error")
+            }
+        return self._status_table(tx_hashes, statuses, None, start)
+
+    def _status_table(self, tx_hashes: List[str], statuses: Dict[str, Dict[str, Any]],
+                      latest_block: Optional[int], start: float) -> Dict[str, Any]:
+        """按查询顺序生成交易状态表，错误信息单独列出"""
+        rows = []
+        status_counts: Dict[str, int] = {}
+        errors = []
+        for tx_hash in tx_hashes:
+            status = statuses[tx_hash]
+            status_counts[status["status"]] = status_counts.get(status["status"], 0) + 1
+            rows.append([tx_hash] + [status.get(column) for column in TRANSACTION_STATUS_COLUMNS[1:]])
+            if status.get("error"):
+                errors.append({"transaction_hash": tx_hash, "error": status["error"]})
+        return {
+            "network": self.network_config.name,
+            "latest_block": latest_block,
+            "columns": list(TRANSACTION_STATUS_COLUMNS),
+            "rows": rows,
+            "status_counts": status_counts,
+            "errors": errors,
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 1)
+        }
+
+    async def get_network_status(self) -> Dict[str, Any]:
+        """最新区块与连接状态，默认只检查连接"""
+        return {"latest_block": None, "is_connected": await self.check_connection()}
+    
+    async def check_connection(self) -> bool:
+        """验证RPC连接，默认不做检查"""
+        return True
 
 class EVMChainInterface(MultiChainInterface):
-    """EVM兼容链接口实现"""
+    """EVM兼容链接口实现 - 基于AsyncWeb3，RPC调用不会阻塞事件循环"""
+    
+    # ERC20调用数据直接由预计算的函数选择器拼接；关闭时使用缓存的合约对象走完整ABI编码
+    erc20_fast_path = True
     
     def __init__(self, network_config: NetworkConfig):
         self.network_config = network_config
-        self.w3 = Web3(Web3.HTTPProvider(network_config.rpc_url))
+        self.w3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(network_config.rpc_url))
+        # 互不依赖的调用通过JSON-RPC批量请求合并为一次HTTP往返；
+        # 配置了多个节点时读请求按延迟路由，写请求固定发往同一节点
+        self.rpc = JsonRpcClient(network_config.rpc_urls, max_batch_size=network_config.rpc_batch_size)
+        # web3 provider绑定的连接池会话
+        self._w3_session = None
+        # 本网络的链头由后台跟踪器统一轮询，各功能从中读取区块高度
+        self.head_tracker = HeadTracker(self.rpc, poll_interval=network_config.poll_interval)
+        # 本网络所有待确认交易共用一个收据轮询循环
+        # 按(chain_id, 代币地址)缓存的ERC20合约对象
+        self._erc20_contracts: Dict[Tuple[int, str], Any] = {}
+        self.receipt_tracker = ReceiptTracker(
+            self.rpc, poll_interval=network_config.poll_interval, head_tracker=self.head_tracker
+        )
+        # 按区块缓存的费用估算
+        self.fee_oracle = FeeOracle(
+            self.rpc, cache_ttl=network_config.poll_interval, eip1559=network_config.eip1559
+        )
+        # 未配置或探测到链上没有Multicall3时回退到逐个代币查询
+        self._multicall_available = network_config.multicall_address is not None
+        # aggregate3返回RPC错误后的冷却截止时刻（time.monotonic）
+        self._multicall_retry_at = 0.0
+        # Disperse合约是否已部署，首次使用合约批量转账时通过eth_getCode确认
+        self._disperse_available: Optional[bool] = None
         
-        # 验证连接
+        logger.info(f"EVM链接口初始化: {network_config.name} (Chain ID: {network_config.chain_id})")
+    
+    async def check_connection(self) -> bool:
+        """验证RPC连接"""
         try:
-            self.w3.is_connected()
-            logger.info(f"EVM链连接成功: {network_config.name} (Chain ID: {network_config.chain_id})")
+            await self._share_http_session()
+            chain_id = to_int(await self.rpc.request("eth_chainId"))
+            if chain_id != self.network_config.chain_id:
+                logger.warning(f"EVM链连接警告 {self.network_config.name}: 节点返回的Chain ID为 {chain_id}")
+            else:
+                logger.info(f"EVM链连接成功: {self.network_config.name} (Chain ID: {self.network_config.chain_id})")
+            return True
         except Exception as e:
-            logger.warning(f"EVM链连接警告 {network_config.name}: {e}")
+            logger.warning(f"EVM链连接警告 {self.network_config.name}: {e}")
+            return False
+    
+    async def _share_http_session(self) -> None:
+        """让web3 provider复用连接池中主节点的会话（web3默认会话不保持连接）
+
+        web3只用于关闭快速路径时的合约调用，其余RPC都经由 self.rpc 路由
+        """
+        session = self.rpc.pool.get_session(self.network_config.rpc_url)
+        if self._w3_session is not session:
+            await self.w3.provider.cache_async_session(session)
+            self._w3_session = session
     
     async def get_balance(self, address: str, token_symbol: Optional[str] = None) -> Dict[str, Any]:
         """获取地址余额"""
@@ -94,7 +391,7 @@ class EVMChainInterface(MultiChainInterface):
                 raise ValueError("无效的地址格式")
             
             # 转换为checksum地址
-            address = self.w3.to_checksum_address(address)
+            address = to_checksum_address(address)
             
             result = {
                 "address": address,
@@ -102,32 +399,42 @@ class EVMChainInterface(MultiChainInterface):
                 "balances": {}
             }
             
+            chain_id = self.network_config.chain_id
+            
+            # 未指定代币时优先用Multicall3一次性查询原生代币和本链全部代币余额
+            if not token_symbol and self._multicall_usable():
+                try:
+                    result["balances"] = await self._get_all_balances_multicall(
+                        address, list(config.get_tokens_for_chain(chain_id).items())
+                    )
+                    return result
+                except Exception as e:
+                    logger.warning(f"Multicall3批量查询失败，回退到逐个查询: {e}")
+                    self._on_multicall_error(e)
+            
             # 获取原生代币余额
-            native_balance_wei = self.w3.eth.get_balance(address)
-            native_balance = self.w3.from_wei(native_balance_wei, 'ether')
-            result["balances"][self.network_config.native_token] = {
-                "balance": str(native_balance),
-                "symbol": self.network_config.native_token,
-                "decimals": 18,
-                "wei": str(native_balance_wei)
-            }
+            native_balance_wei = to_int(await self.rpc.request("eth_getBalance", [address, "latest"]))
+            result["balances"][self.network_config.native_token] = self._format_native_balance(
+                native_balance_wei
+            )
             
             # 获取指定代币余额
             if token_symbol:
-                token_config = config.get_token(token_symbol)
+                token_config = config.get_token(token_symbol, chain_id)
                 if token_config:
                     token_balance = await self._get_token_balance(address, token_config)
                     result["balances"][token_symbol] = token_balance
                 else:
-                    result["error"] = f"未知代币: {token_symbol}"
+                    result["error"] = f"未知代币: {token_symbol}（{self.network_config.name}上未部署）"
             else:
-                # 获取所有已配置代币的余额
-                for symbol, token_config in config.tokens.items():
+                # 获取本链已配置代币的余额
+                for symbol, token_config in config.get_tokens_for_chain(chain_id).items():
                     try:
                         token_balance = await self._get_token_balance(address, token_config)
                         result["balances"][symbol] = token_balance
                     except Exception as e:
                         logger.warning(f"获取代币 {symbol} 余额失败: {e}")
+                        result["balances"][symbol] = self._format_token_error(token_config, e)
             
             return result
             
@@ -137,25 +444,255 @@ class EVMChainInterface(MultiChainInterface):
     
     async def _get_token_balance(self, address: str, token_config: TokenConfig) -> Dict[str, Any]:
         """获取ERC20代币余额"""
-        # ERC20 balanceOf 函数的ABI
-        balance_abi = [
-            {
-                "constant": True,
-                "inputs": [{"name": "_owner", "type": "address"}],
-                "name": "balanceOf",
-                "outputs": [{"name": "balance", "type": "uint256"}],
-                "type": "function"
-            }
+        if self.erc20_fast_path:
+            raw_result = await self.rpc.request("eth_call", [
+                {"to": token_config.address, "data": to_hex(encode_balance_of(address))},
+                "latest"
+            ])
+            balance_wei = decode_uint256(raw_result)
+            if balance_wei is None:
+                raise ValueError(f"balanceOf返回数据无效: {raw_result}")
+        else:
+            contract = self._get_erc20_contract(token_config.address)
+            balance_wei = await contract.functions.balanceOf(address).call()
+        return self._format_token_balance(token_config, balance_wei)
+    
+    def _get_erc20_contract(self, token_address: str) -> Any:
+        """获取缓存的ERC20合约对象"""
+        key = (self.network_config.chain_id, token_address.lower())
+        contract = self._erc20_contracts.get(key)
+        if contract is None:
+            contract = self.w3.eth.contract(
+                address=to_checksum_address(token_address),
+                abi=ERC20_ABI
+            )
+            self._erc20_contracts[key] = contract
+        return contract
+    
+    def _multicall_usable(self) -> bool:
+        """Multicall3已部署且不在RPC错误后的冷却期内"""
+        return self._multicall_available and time.monotonic() >= self._multicall_retry_at
+    
+    def _on_multicall_error(self, error: Exception) -> None:
+        """aggregate3返回RPC错误（如节点不支持或调用回滚）时进入冷却期，期间直接走逐个查询
+
+        传输失败会同样影响逐个查询，节点缺少固定区块与Multicall3无关，这两种情况不进入冷却
+        """
+        if isinstance(error, RpcError) and not is_block_not_found(error):
+            self._multicall_retry_at = time.monotonic() + MULTICALL_ERROR_COOLDOWN
+            logger.info(f"{self.network_config.name} Multicall3调用出错，{MULTICALL_ERROR_COOLDOWN:g} 秒内改为逐个查询")
+    
+    async def _get_all_balances_multicall(self, address: str,
+                                          tokens: List[Tuple[str, TokenConfig]]) -> Dict[str, Any]:
+        """通过Multicall3 aggregate3在一次eth_call中获取原生代币和所有代币余额"""
+        multicall_address = to_checksum_address(self.network_config.multicall_address)
+        
+        # 第一个调用为原生代币余额，不允许失败；代币调用允许单独失败
+        calls = [Call3(multicall_address, False, encode_get_eth_balance(address))]
+        for _, token_config in tokens:
+            calls.append(Call3(
+                to_checksum_address(token_config.address),
+                True,
+                encode_balance_of(address)
+            ))
+        
+        raw_result = HexBytes(await self.rpc.request("eth_call", [
+            {"to": multicall_address, "data": to_hex(encode_aggregate3(calls))},
+            "latest"
+        ]))
+        if not raw_result:
+            # 该链没有部署Multicall3，后续请求直接走逐个查询
+            self._multicall_available = False
+        results = decode_aggregate3(raw_result)
+        
+        native_balance_wei = decode_uint256(results[0].return_data)
+        if native_balance_wei is None:
+            raise ValueError("无法解析原生代币余额")
+        
+        balances = {
+            self.network_config.native_token: self._format_native_balance(native_balance_wei)
+        }
+        for (symbol, token_config), call_result in zip(tokens, results[1:]):
+            balance_wei = decode_uint256(call_result.return_data) if call_result.success else None
+            if balance_wei is None:
+                logger.warning(f"获取代币 {symbol} 余额失败: Multicall3子调用失败")
+                balances[symbol] = self._format_token_error(token_config, "balanceOf调用失败")
+            else:
+                balances[symbol] = self._format_token_balance(token_config, balance_wei)
+        
+        return balances
+    
+    async def get_balances(self, addresses: List[str], token_symbols: Optional[List[str]] = None,
+                           raw: bool = False) -> Dict[str, Any]:
+        """批量查询多个地址的原生代币和代币余额，返回矩阵形式的结果
+
+        地址×代币的全部查询拆分为若干个aggregate3调用（每个不超过multicall_chunk_size个子调用），
+        以有限并发发送，并固定在同一区块高度上读取，保证结果彼此一致。
+        链头取自所有节点中最高的一个，固定的高度比链头落后balance_block_lag个区块，
+        使稍落后的备用节点也能响应；仍然没有该区块的节点返回错误时，该部分改为按latest读取
+        """
+        start = time.perf_counter()
+        chain_id = self.network_config.chain_id
+        result: Dict[str, Any] = {"network": self.network_config.name}
+        
+        # 第一列为原生代币，其余为代币；未指定时查询本链全部已配置代币
+        columns: List[Tuple[str, Optional[TokenConfig]]] = [(self.network_config.native_token, None)]
+        if token_symbols is None:
+            columns.extend(config.get_tokens_for_chain(chain_id).items())
+        else:
+            unknown_tokens = []
+            for symbol in token_symbols:
+                if symbol.upper() == self.network_config.native_token:
+                    continue
+                token_config = config.get_token(symbol, chain_id)
+                if token_config:
+                    columns.append((symbol.upper(), token_config))
+                else:
+                    unknown_tokens.append(symbol)
+            if unknown_tokens:
+                result["unknown_tokens"] = unknown_tokens
+        
+        valid_addresses = []
+        invalid_addresses = []
+        for address in addresses:
+            checksum_address = address_cache.lookup(address)
+            if checksum_address is None:
+                invalid_addresses.append(address)
+            else:
+                valid_addresses.append(checksum_address)
+        if invalid_addresses:
+            result["invalid_addresses"] = invalid_addresses
+        
+        matrix: List[List[Optional[int]]] = [[None] * len(columns) for _ in valid_addresses]
+        pairs = [(row, col) for row in range(len(valid_addresses)) for col in range(len(columns))]
+        block_number = None
+        if pairs:
+            head_block = await self.head_tracker.get_block_number()
+            block_number = max(0, head_block - self.network_config.balance_block_lag)
+            block_tag = hex(block_number)
+            if self._multicall_usable():
+                await self._fill_balances_multicall(valid_addresses, columns, pairs, matrix, block_tag)
+            else:
+                await self._fill_balances_rpc(valid_addresses, columns, pairs, matrix, block_tag)
+        
+        decimals = [18 if token_config is None else token_config.decimals for _, token_config in columns]
+        result.update({
+            "block_number": block_number,
+            "columns": [symbol for symbol, _ in columns],
+            "decimals": decimals,
+            "unit": "wei" if raw else "token",
+            "addresses": valid_addresses,
+            "balances": [
+                [
+                    None if value is None else (str(value) if raw else format_units(value, decimals[col]))
+                    for col, value in enumerate(row)
+                ]
+                for row in matrix
+            ],
+            "failed": sum(value is None for row in matrix for value in row),
+            "pairs": len(pairs),
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 1)
+        })
+        return result
+    
+    async def _fill_balances_multicall(self, addresses: List[str], columns: List[Tuple[str, Optional[TokenConfig]]],
+                                       pairs: List[Tuple[int, int]], matrix: List[List[Optional[int]]],
+                                       block_tag: str) -> None:
+        """通过分块的aggregate3调用填充余额矩阵，失败的块回退到逐个查询"""
+        multicall_address = to_checksum_address(self.network_config.multicall_address)
+        token_addresses = [
+            None if token_config is None else to_checksum_address(token_config.address)
+            for _, token_config in columns
         ]
+        calls = [
+            Call3(multicall_address, True, encode_get_eth_balance(addresses[row]))
+            if token_addresses[col] is None
+            else Call3(token_addresses[col], True, encode_balance_of(addresses[row]))
+            for row, col in pairs
+        ]
+        chunk_size = max(1, self.network_config.multicall_chunk_size)
+        semaphore = asyncio.Semaphore(self.network_config.max_concurrent_calls)
         
-        contract = self.w3.eth.contract(
-            address=self.w3.to_checksum_address(token_config.address),
-            abi=balance_abi
-        )
+        async def run_chunk(start: int) -> None:
+            chunk_pairs = pairs[start:start + chunk_size]
+            try:
+                async with semaphore:
+                    raw_result = HexBytes(await self.rpc.request("eth_call", [
+                        {"to": multicall_address, "data": to_hex(encode_aggregate3(calls[start:start + chunk_size]))},
+                        block_tag
+                    ]))
+                if not raw_result:
+                    self._multicall_available = False
+                call_results = decode_aggregate3(raw_result)
+            except Exception as e:
+                logger.warning(f"Multicall3批量查询失败，回退到逐个查询: {e}")
+                self._on_multicall_error(e)
+                # 节点没有固定的区块时，逐个查询改为按latest读取，避免整块余额为空
+                fallback_tag = "latest" if is_block_not_found(e) else block_tag
+                await self._fill_balances_rpc(addresses, columns, chunk_pairs, matrix, fallback_tag)
+                return
+            for (row, col), call_result in zip(chunk_pairs, call_results):
+                if call_result.success:
+                    matrix[row][col] = decode_uint256(call_result.return_data)
         
-        balance_wei = contract.functions.balanceOf(address).call()
-        balance = balance_wei / (10 ** token_config.decimals)
+        await asyncio.gather(*(run_chunk(start) for start in range(0, len(calls), chunk_size)))
+    
+    async def _fill_balances_rpc(self, addresses: List[str], columns: List[Tuple[str, Optional[TokenConfig]]],
+                                 pairs: List[Tuple[int, int]], matrix: List[List[Optional[int]]],
+                                 block_tag: str) -> None:
+        """通过JSON-RPC批量请求逐个查询余额填充矩阵
+
+        节点没有固定的区块时，这些调用改为按latest再查询一次
+        """
+        calls = []
+        for row, col in pairs:
+            token_config = columns[col][1]
+            if token_config is None:
+                calls.append(("eth_getBalance", [addresses[row], block_tag]))
+            else:
+                calls.append(("eth_call", [
+                    {"to": token_config.address, "data": to_hex(encode_balance_of(addresses[row]))},
+                    block_tag
+                ]))
         
+        batch_size = self.rpc.max_batch_size
+        semaphore = asyncio.Semaphore(self.network_config.max_concurrent_calls)
+        missing_block: List[Tuple[int, int]] = []
+        
+        async def run_batch(start: int) -> None:
+            try:
+                async with semaphore:
+                    results = await self.rpc.batch(calls[start:start + batch_size])
+            except Exception as e:
+                logger.warning(f"批量余额查询失败: {e}")
+                return
+            for (row, col), (method, _), value in zip(pairs[start:start + batch_size], calls[start:], results):
+                if isinstance(value, RpcError):
+                    if block_tag != "latest" and is_block_not_found(value):
+                        missing_block.append((row, col))
+                    continue
+                if value is None:
+                    continue
+                matrix[row][col] = to_int(value) if method == "eth_getBalance" else decode_uint256(value)
+        
+        await asyncio.gather(*(run_batch(start) for start in range(0, len(calls), batch_size)))
+        if missing_block:
+            logger.warning(f"节点没有区块 {block_tag}，{len(missing_block)} 个余额改为按latest查询")
+            await self._fill_balances_rpc(addresses, columns, missing_block, matrix, "latest")
+    
+    def _format_native_balance(self, balance_wei: int) -> Dict[str, Any]:
+        """格式化原生代币余额"""
+        return {
+            "balance": str(self.w3.from_wei(balance_wei, 'ether')),
+            "symbol": self.network_config.native_token,
+            "decimals": 18,
+            "wei": str(balance_wei)
+        }
+    
+    @staticmethod
+    def _format_token_balance(token_config: TokenConfig, balance_wei: int) -> Dict[str, Any]:
+        """格式化ERC20代币余额"""
+        balance = balance_wei / (10 ** token_config.decimals)
         return {
             "balance": str(balance),
             "symbol": token_config.symbol,
@@ -164,11 +701,21 @@ class EVMChainInterface(MultiChainInterface):
             "contract_address": token_config.address
         }
     
+    @staticmethod
+    def _format_token_error(token_config: TokenConfig, error: Union[str, Exception]) -> Dict[str, Any]:
+        """格式化单个代币查询失败的结果"""
+        return {
+            "symbol": token_config.symbol,
+            "contract_address": token_config.address,
+            "error": str(error)
+        }
+    
     async def estimate_gas_fees(self, transaction: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """估算Gas费用"""
         try:
-            # 获取当前gas价格
-            gas_price = self.w3.eth.gas_price
+            # 获取当前费用（同一区块内使用缓存）
+            fees = await self._get_fees()
+            gas_price = fees.gas_price
             
             # 默认gas限制
             gas_limit = 21000
@@ -177,23 +724,36 @@ class EVMChainInterface(MultiChainInterface):
             if transaction:
                 try:
                     tx_params = self._build_transaction_params(transaction)
-                    gas_limit = self.w3.eth.estimate_gas(tx_params)
+                    gas_limit = to_int(await self.rpc.request("eth_estimateGas", [{
+                        key: hex(value) if isinstance(value, int) else value
+                        for key, value in tx_params.items()
+                    }]))
                 except Exception as e:
                     logger.warning(f"Gas估算失败，使用默认值: {e}")
                     gas_limit = 21000
             
             # 计算费用
-            estimated_fee_wei = gas_price * gas_limit
+            estimated_fee_wei = fees.effective_gas_price * gas_limit
             estimated_fee_eth = self.w3.from_wei(estimated_fee_wei, 'ether')
             
-            return {
+            result = {
                 "gas_price": str(gas_price),
                 "gas_price_gwei": str(self.w3.from_wei(gas_price, 'gwei')),
                 "gas_limit": gas_limit,
                 "estimated_fee_wei": str(estimated_fee_wei),
                 "estimated_fee_eth": str(estimated_fee_eth),
+                "transaction_type": 2 if fees.supports_eip1559 else 0,
+                "block_number": fees.block_number,
                 "network": self.network_config.name
             }
+            if fees.supports_eip1559:
+                result.update({
+                    "base_fee_per_gas": str(fees.base_fee),
+                    "max_priority_fee_per_gas": str(fees.max_priority_fee),
+                    "max_fee_per_gas": str(fees.max_fee),
+                    "max_fee_gwei": str(self.w3.from_wei(fees.max_fee, 'gwei')),
+                })
+            return result
             
         except Exception as e:
             logger.error(f"估算Gas费用失败: {e}")
@@ -209,13 +769,13 @@ class EVMChainInterface(MultiChainInterface):
                 raise ValueError("无效的接收地址")
             
             # 转换为checksum地址
-            to_address = self.w3.to_checksum_address(to_address)
+            to_address = to_checksum_address(to_address)
             
             # 使用提供的钱包或创建临时钱包
             if wallet:
                 sender_wallet = wallet
             else:
-                sender_wallet = WalletSigner(config.private_key)
+                sender_wallet = get_signer(config.private_key)
             
             if not sender_wallet.has_private_key():
                 return {
@@ -249,33 +809,19 @@ class EVMChainInterface(MultiChainInterface):
     async def _send_native_transaction(self, wallet: WalletSigner, to_address: str, 
                                       amount: Decimal) -> Dict[str, Any]:
         """发送原生代币交易"""
-        # 获取nonce
-        nonce = self.w3.eth.get_transaction_count(wallet.address)
-        
-        # 估算gas
-        gas_estimate = await self.estimate_gas_fees()
-        gas_price = int(gas_estimate.get("gas_price", self.network_config.gas_price))
-        gas_limit = gas_estimate.get("gas_limit", 21000)
-        
-        # 构建交易参数
-        transaction = {
-            'to': self.w3.to_checksum_address(to_address),
-            'value': self.w3.to_wei(amount, 'ether'),
-            'gas': gas_limit,
-            'gasPrice': gas_price,
-            'nonce': nonce,
-            'chainId': self.network_config.chain_id
-        }
+        # nonce由本地nonce管理器分配，费用来自按区块缓存的费用预言机
+        transaction = await self._build_transfer_transaction(
+            to_address, self.w3.to_wei(amount, 'ether'), None, await self._get_fee_params()
+        )
         
-        # 签名并发送交易
-        signed_txn = wallet.sign_transaction(transaction)
-        tx_hash = self.w3.eth.send_raw_transaction(signed_txn)
+        # 分配nonce、签名并发送交易
+        tx_hash = await self._sign_and_broadcast(wallet, transaction)
         
         # 等待交易确认
         receipt = await self._wait_for_transaction_receipt(tx_hash)
         
         return {
-            "transaction_hash": tx_hash.hex(),
+            "transaction_hash": to_hex(tx_hash),
             "from_address": wallet.address,
             "to_address": to_address,
             "amount": str(amount),
@@ -289,55 +835,26 @@ class EVMChainInterface(MultiChainInterface):
     async def _send_token_transaction(self, wallet: WalletSigner, to_address: str,
                                      amount: Decimal, token_symbol: str) -> Dict[str, Any]:
         """发送ERC20代币交易"""
-        token_config = config.get_token(token_symbol)
+        token_config = config.get_token(token_symbol, self.network_config.chain_id)
         if not token_config:
-            raise ValueError(f"未知代币: {token_symbol}")
-        
-        # ERC20 transfer 函数的ABI
-        transfer_abi = [
-            {
-                "constant": False,
-                "inputs": [
-                    {"name": "_to", "type": "address"},
-                    {"name": "_value", "type": "uint256"}
-                ],
-                "name": "transfer",
-                "outputs": [{"name": "", "type": "bool"}],
-                "type": "function"
-            }
-        ]
-        
-        contract = self.w3.eth.contract(
-            address=self.w3.to_checksum_address(token_config.address),
-            abi=transfer_abi
-        )
+            raise ValueError(f"未知代币: {token_symbol}（{self.network_config.name}上未部署）")
         
         # 转换金额到wei单位
         amount_wei = int(amount * (10 ** token_config.decimals))
         
-        # 获取nonce
-        nonce = self.w3.eth.get_transaction_count(wallet.address)
-        
-        # 构建交易
-        transaction = contract.functions.transfer(
-            self.w3.to_checksum_address(to_address),
-            amount_wei
-        ).build_transaction({
-            'chainId': self.network_config.chain_id,
-            'gas': 60000,  # ERC20 转账通常需要更多gas
-            'gasPrice': self.network_config.gas_price,
-            'nonce': nonce,
-        })
+        # 构建交易（nonce在发送队列中分配）
+        transaction = await self._build_transfer_transaction(
+            to_address, amount_wei, token_config, await self._get_fee_params()
+        )
         
-        # 签名并发送交易
-        signed_txn = wallet.sign_transaction(transaction)
-        tx_hash = self.w3.eth.send_raw_transaction(signed_txn)
+        # 分配nonce、签名并发送交易
+        tx_hash = await self._sign_and_broadcast(wallet, transaction)
         
         # 等待交易确认
         receipt = await self._wait_for_transaction_receipt(tx_hash)
         
         return {
-            "transaction_hash": tx_hash.hex(),
+            "transaction_hash": to_hex(tx_hash),
             "from_address": wallet.address,
             "to_address": to_address,
             "amount": str(amount),
@@ -349,28 +866,541 @@ class EVMChainInterface(MultiChainInterface):
             "network": self.network_config.name
         }
     
+    async def _build_transfer_transaction(self, to_address: str, amount_wei: int,
+                                          token_config: Optional[TokenConfig],
+                                          fee_params: Dict[str, int]) -> Dict[str, Any]:
+        """构建原生代币或ERC20转账交易（nonce在发送队列中分配）"""
+        if token_config is None:
+            return {
+                'to': to_checksum_address(to_address),
+                'value': amount_wei,
+                'gas': 21000,
+                'chainId': self.network_config.chain_id,
+                **fee_params
+            }
+        
+        tx_params = {
+            'chainId': self.network_config.chain_id,
+            'gas': 60000,  # ERC20 转账通常需要更多gas
+            'nonce': 0,
+            **fee_params
+        }
+        if self.erc20_fast_path:
+            return {
+                'to': to_checksum_address(token_config.address),
+                'value': 0,
+                'data': to_hex(encode_transfer(to_address, amount_wei)),
+                **tx_params
+            }
+        contract = self._get_erc20_contract(token_config.address)
+        return await contract.functions.transfer(
+            to_checksum_address(to_address),
+            amount_wei
+        ).build_transaction(tx_params)
+    
+    def _prepare_payment(self, index: int, payment: Dict[str, Any]) -> Dict[str, Any]:
+        """校验单笔转账，解析代币并换算为最小单位金额"""
+        item = super()._prepare_payment(index, payment)
+        if not WalletSigner.validate_address(item["to_address"]):
+            raise ValueError(f"无效的接收地址: {item['to_address']}")
+        item["to_address"] = to_checksum_address(item["to_address"])
+        
+        if item["symbol"] in ("ETH", self.network_config.native_token):
+            item["token"] = None
+            item["amount_wei"] = int(self.w3.to_wei(item["amount"], 'ether'))
+            decimals = 18
+        else:
+            token_config = config.get_token(item["symbol"], self.network_config.chain_id)
+            if not token_config:
+                raise ValueError(f"未知代币: {item['symbol']}（{self.network_config.name}上未部署）")
+            item["token"] = token_config
+            item["amount_wei"] = int(item["amount"] * (10 ** token_config.decimals))
+            decimals = token_config.decimals
+        if Decimal(item["amount_wei"]) != item["amount"].scaleb(decimals):
+            raise ValueError(f"金额 {item['amount']} 超出 {item['symbol']} 的精度（{decimals} 位小数）")
+        return item
+    
+    async def send_batch(self, payments: List[Dict[str, Any]], wallet: Optional[WalletSigner] = None,
+                         wait_for_receipts: bool = True, timeout: float = 120,
+                         mode: str = "pipeline") -> Dict[str, Any]:
+        """批量转账
+
+        全部条目预先校验，任何一笔不合法时不发送任何交易。
+        pipeline模式在发送方队列中连续分配nonce并签名全部交易，再以批量请求流水线广播；
+        contract模式通过Disperse合约把同一代币的转账合并为一笔交易。
+        最后统一等待全部收据，返回每笔结果、总耗时和总手续费
+        """
+        if mode not in BATCH_MODES:
+            return {"error": f"未知的批量转账模式: {mode}，可选: {', '.join(BATCH_MODES)}"}
+        start = time.perf_counter()
+        try:
+            sender_wallet = wallet or get_signer(config.private_key)
+            if not sender_wallet.has_private_key():
+                return {
+                    "error": "需要私钥进行交易签名",
+                    "suggestion": "请提供私钥或使用MetaMask等钱包"
+                }
+            
+            items, invalid = self._validate_payments(payments)
+            if invalid:
+                return self._invalid_batch_result(invalid)
+            if mode == "contract":
+                return await self._send_batch_disperse(items, sender_wallet, wait_for_receipts, timeout, start)
+            
+            # 整批使用同一组费用参数
+            fee_params = await self._get_fee_params()
+            chain_id = self.network_config.chain_id
+            address = sender_wallet.address
+            async with nonce_manager.sender_queue(chain_id, address):
+                try:
+                    transactions = []
+                    for item in items:
+                        transaction = await self._build_transfer_transaction(
+                            item["to_address"], item["amount_wei"], item["token"], fee_params
+                        )
+                        item["nonce"] = transaction['nonce'] = await nonce_manager.reserve(
+                            chain_id, address, lambda: self._fetch_pending_nonce(address)
+                        )
+                        transactions.append(transaction)
+                    # 整批签名耗时与笔数成正比，放到线程池中执行，期间其他工具调用和后台轮询照常进行；
+                    # 发送方队列仍被持有，已分配的nonce不会被其他发送使用
+                    loop = asyncio.get_running_loop()
+                    raw_transactions = await loop.run_in_executor(
+                        None, self._sign_transactions, sender_wallet, transactions
+                    )
+                    for item, raw_transaction in zip(items, raw_transactions):
+                        item["raw_transaction"] = raw_transaction
+                        item["transaction_hash"] = to_hex(keccak(raw_transaction))
+                except BaseException:
+                    # 已分配的nonce都未广播，丢弃本地记录
+                    nonce_manager.resync(chain_id, address)
+                    raise
+                
+                broadcast_start = time.perf_counter()
+                await self._broadcast_batch(sender_wallet, items, fee_params)
+                broadcast_ms = round((time.perf_counter() - broadcast_start) * 1000, 1)
+            
+            if wait_for_receipts:
+                await self._wait_for_batch_receipts(items, timeout)
+            
+            total_fee_wei = sum(item.get("fee_wei") or 0 for item in items)
+            return self._batch_report(
+                items, start,
+                mode=mode,
+                from_address=address,
+                total_fee_wei=str(total_fee_wei),
+                total_fee=format_units(total_fee_wei, 18),
+                fee_symbol=self.network_config.native_token,
+                broadcast_ms=broadcast_ms
+            )
+        
+        except Exception as e:
+            logger.error(f"批量转账失败: {e}")
+            return {"error": str(e)}
+    
+    @staticmethod
+    def _sign_transactions(wallet: WalletSigner, transactions: List[Dict[str, Any]]) -> List[HexBytes]:
+        """依次签名一组交易（在线程池中执行）"""
+        return [wallet.sign_transaction(transaction) for transaction in transactions]
+    
+    async def _broadcast_batch(self, wallet: WalletSigner, items: List[Dict[str, Any]],
+                               fee_params: Dict[str, int]) -> None:
+        """按nonce顺序分批广播已签名交易
+
+        每批合并为一次JSON-RPC批量请求，批次之间依次发送以保持nonce顺序。
+        某一批出现被拒绝的交易后不再广播后续批次
+        """
+        rejected = False
+        batch_size = self.rpc.max_batch_size
+        for start in range(0, len(items), batch_size):
+            chunk = items[start:start + batch_size]
+            if rejected:
+                for item in chunk:
+                    item["error"] = "前面的交易被拒绝，未广播"
+                continue
+            
+            calls = [("eth_sendRawTransaction", [to_hex(item["raw_transaction"])]) for item in chunk]
+            try:
+                results = await self.rpc.batch(calls)
+            except Exception as e:
+                # 传输失败时无法确定节点是否收到，交易仍可能上链，继续跟踪收据
+                for item in chunk:
+                    item["status"] = "unknown"
+                    item["error"] = f"广播请求失败: {e}"
+                rejected = True
+                continue
+            
+            for item, result in zip(chunk, results):
+                if isinstance(result, RpcError) and not is_known_transaction(result):
+                    item["status"] = "rejected"
+                    item["error"] = str(result)
+                    rejected = True
+                else:
+                    item["status"] = "pending"
+        
+        if rejected:
+            nonce_manager.resync(self.network_config.chain_id, wallet.address)
+            await self._fill_nonce_gaps(wallet, items, fee_params)
+    
+    async def _fill_nonce_gaps(self, wallet: WalletSigner, items: List[Dict[str, Any]],
+                               fee_params: Dict[str, int]) -> None:
+        """被拒绝交易留下的nonce空洞会让后面已被接受的交易一直无法上链，
+        为每个空洞发送一笔向自己转账0的交易
+        """
+        accepted = [item["nonce"] for item in items if item["status"] in ("pending", "unknown")]
+        if not accepted:
+            return
+        gaps = [item for item in items if item["status"] == "rejected" and item["nonce"] < max(accepted)]
+        if not gaps:
+            return
+        
+        calls = []
+        for item in gaps:
+            filler = {
+                'to': wallet.address,
+                'value': 0,
+                'gas': 21000,
+                'chainId': self.network_config.chain_id,
+                'nonce': item["nonce"],
+                **fee_params
+            }
+            calls.append(("eth_sendRawTransaction", [to_hex(wallet.sign_transaction(filler))]))
+        try:
+            results = await self.rpc.batch(calls)
+        except Exception as e:
+            results = [e] * len(calls)
+        
+        unfilled = None
+        for item, result in zip(gaps, results):
+            if isinstance(result, Exception):
+                logger.warning(f"填补nonce空洞 {item['nonce']} 失败: {result}")
+                unfilled = item["nonce"] if unfilled is None else unfilled
+            else:
+                item["gap_filler_hash"] = to_hex(result)
+        if unfilled is not None:
+            for item in items:
+                if item["status"] == "pending" and item["nonce"] > unfilled:
+                    item["status"] = "stuck"
+                    item["error"] = f"nonce {unfilled} 的空洞未能填补，交易无法上链"
+    
+    async def _wait_for_batch_receipts(self, items: List[Dict[str, Any]], timeout: float) -> None:
+        """统一等待全部已广播交易的收据，收据跟踪器每个区块用一次批量请求查询"""
+        async def wait(item: Dict[str, Any]) -> None:
+            try:
+                receipt = await self.receipt_tracker.wait_for_receipt(item["transaction_hash"], timeout=timeout)
+            except asyncio.TimeoutError:
+                if item["status"] == "pending":
+                    item["error"] = "等待确认超时"
+                return
+            self._apply_receipt(item, receipt)
+            item.pop("error", None)
+        
+        await asyncio.gather(*(
+            wait(item) for item in items if item["status"] in ("pending", "unknown")
+        ))
+    
+    async def _send_batch_disperse(self, items: List[Dict[str, Any]], wallet: WalletSigner,
+                                   wait_for_receipts: bool, timeout: float, start: float) -> Dict[str, Any]:
+        """通过Disperse合约批量转账，同一代币的转账合并为一笔合约调用
+
+        超过区块gas上限一定比例的批次自动拆分为多笔交易；
+        ERC20需要先approve合约，额度不足时发送approve并等待确认后再估算和发送
+        """
+        disperse_address = await self._get_disperse_address()
+        head = await self.head_tracker.get_head()
+        block_gas_limit = head.gas_limit or DEFAULT_BLOCK_GAS_LIMIT
+        gas_cap = int(block_gas_limit * BLOCK_GAS_SHARE)
+        fee_params = await self._get_fee_params()
+        
+        groups: Dict[Optional[str], List[Dict[str, Any]]] = {}
+        for item in items:
+            groups.setdefault(item["token"].address if item["token"] else None, []).append(item)
+        
+        transactions: List[Dict[str, Any]] = []
+        for group in groups.values():
+            token_config = group[0]["token"]
+            try:
+                if token_config:
+                    approvals = await self._ensure_disperse_allowance(
+                        wallet, token_config, disperse_address,
+                        sum(item["amount_wei"] for item in group), fee_params, timeout
+                    )
+                    transactions.extend(approvals)
+                    for approval in approvals:
+                        if approval["status"] != "success":
+                            raise ValueError(f"approve交易未成功: {approval['status']}")
+                chunks = await self._split_disperse_batch(group, wallet.address, disperse_address, gas_cap)
+            except Exception as e:
+                logger.error(f"合约批量转账准备失败 {group[0]['symbol']}: {e}")
+                for item in group:
+                    item["error"] = str(e)
+                continue
+            
+            for chunk, gas in chunks:
+                call = self._disperse_call(chunk, disperse_address, wallet.address)
+                transaction = {
+                    'to': call["to"],
+                    'value': to_int(call["value"]),
+                    'data': call["data"],
+                    'gas': min(gas * 6 // 5, block_gas_limit),
+                    'chainId': self.network_config.chain_id,
+                    **fee_params
+                }
+                record = {
+                    "type": "disperse",
+                    "symbol": chunk[0]["symbol"],
+                    "recipients": len(chunk),
+                    "gas_limit": transaction['gas'],
+                    "items": chunk
+                }
+                try:
+                    record["transaction_hash"] = to_hex(await self._sign_and_broadcast(wallet, transaction))
+                    record["nonce"] = transaction['nonce']
+                    record["status"] = "pending"
+                except Exception as e:
+                    record["status"] = "rejected"
+                    record["error"] = str(e)
+                self._apply_disperse_record(record)
+                transactions.append(record)
+        
+        if wait_for_receipts:
+            await self._wait_for_disperse_receipts(transactions, timeout)
+        
+        total_fee_wei = sum(record.get("fee_wei") or 0 for record in transactions)
+        return self._batch_report(
+            items, start,
+            mode="contract",
+            from_address=wallet.address,
+            contract_address=disperse_address,
+            transactions=[
+                {key: str(value) if key == "fee_wei" else value for key, value in record.items() if key != "items"}
+                for record in transactions
+            ],
+            total_fee_wei=str(total_fee_wei),
+            total_fee=format_units(total_fee_wei, 18),
+            fee_symbol=self.network_config.native_token
+        )
+    
+    async def _get_disperse_address(self) -> str:
+        """确认本网络已部署Disperse合约，返回其checksum地址"""
+        address = self.network_config.disperse_address
+        if not address:
+            raise ValueError(f"{self.network_config.name}未配置Disperse合约")
+        if self._disperse_available is None:
+            code = await self.rpc.request("eth_getCode", [address, "latest"])
+            self._disperse_available = bool(code) and code not in ("0x", "0x0")
+        if not self._disperse_available:
+            raise ValueError(f"Disperse合约 {address} 未部署在{self.network_config.name}上")
+        return to_checksum_address(address)
+    
+    async def _ensure_disperse_allowance(self, wallet: WalletSigner, token_config: TokenConfig,
+                                         disperse_address: str, amount_wei: int,
+                                         fee_params: Dict[str, int], timeout: float) -> List[Dict[str, Any]]:
+        """额度不足时approve Disperse合约并等待确认，返回approve交易记录，额度足够时返回空列表
+
+        已有额度但不足时先将额度清零再授权：USDT等代币拒绝把非零额度直接改为另一个非零值，
+        之前失败的批次留下的剩余额度会导致之后的approve全部回滚
+        """
+        allowance = decode_uint256(await self.rpc.request("eth_call", [{
+            "to": token_config.address,
+            "data": to_hex(encode_allowance(wallet.address, disperse_address))
+        }, "latest"]))
+        if allowance is not None and allowance >= amount_wei:
+            return []
+        
+        # 只授权本批次需要的额度，不授予无限额度；两笔approve按nonce顺序广播后一起等待确认
+        amounts = [0, amount_wei] if allowance else [amount_wei]
+        records = []
+        for amount in amounts:
+            transaction = {
+                'to': to_checksum_address(token_config.address),
+                'value': 0,
+                'data': to_hex(encode_approve(disperse_address, amount)),
+                'gas': 60000,
+                'chainId': self.network_config.chain_id,
+                **fee_params
+            }
+            tx_hash = await self._sign_and_broadcast(wallet, transaction)
+            records.append({
+                "type": "approve",
+                "symbol": token_config.symbol,
+                "amount_wei": str(amount),
+                "transaction_hash": to_hex(tx_hash),
+                "nonce": transaction['nonce'],
+                "gas_limit": transaction['gas'],
+                "status": "pending"
+            })
+        
+        async def wait(record: Dict[str, Any]) -> None:
+            try:
+                receipt = await self.receipt_tracker.wait_for_receipt(record["transaction_hash"], timeout=timeout)
+            except asyncio.TimeoutError:
+                return
+            self._apply_receipt(record, receipt)
+        
+        await asyncio.gather(*(wait(record) for record in records))
+        return records
+    
+    async def _split_disperse_batch(self, group: List[Dict[str, Any]], sender: str, disperse_address: str,
+                                    gas_cap: int) -> List[Tuple[List[Dict[str, Any]], int]]:
+        """按gas上限拆分同一代币的转账，返回(批次条目, 估算gas)列表
+
+        先按每个接收地址的估算gas确定初始批大小，再用一次批量eth_estimateGas
+        校验全部批次，仍超过上限的批次对半拆分后重新估算
+        """
+        per_recipient_gas = TOKEN_GAS_PER_RECIPIENT if group[0]["token"] else ETHER_GAS_PER_RECIPIENT
+        size = estimate_batch_size(gas_cap, per_recipient_gas)
+        pending = [group[start:start + size] for start in range(0, len(group), size)]
+        chunks = []
+        while pending:
+            results = await self.rpc.batch([
+                ("eth_estimateGas", [self._disperse_call(chunk, disperse_address, sender)]) for chunk in pending
+            ])
+            oversized = []
+            for chunk, result in zip(pending, results):
+                gas = to_int(unwrap(result))
+                if gas > gas_cap and len(chunk) > 1:
+                    half = len(chunk) // 2
+                    oversized.extend((chunk[:half], chunk[half:]))
+                else:
+                    chunks.append((chunk, gas))
+            pending = oversized
+        chunks.sort(key=lambda chunk: chunk[0][0]["index"])
+        return chunks
+    
+    @staticmethod
+    def _disperse_call(chunk: List[Dict[str, Any]], disperse_address: str, sender: str) -> Dict[str, str]:
+        """构建一个批次的Disperse合约调用（JSON-RPC参数格式）"""
+        recipients = [item["to_address"] for item in chunk]
+        values = [item["amount_wei"] for item in chunk]
+        token_config = chunk[0]["token"]
+        if token_config:
+            data = encode_disperse_token(token_config.address, recipients, values)
+            value = 0
+        else:
+            data = encode_disperse_ether(recipients, values)
+            value = sum(values)
+        return {"from": sender, "to": disperse_address, "data": to_hex(data), "value": hex(value)}
+    
+    @staticmethod
+    def _apply_receipt(record: Dict[str, Any], receipt: Any) -> None:
+        """把收据中的执行结果和手续费写入交易记录"""
+        record["status"] = "success" if receipt.status == 1 else "failed"
+        record["block_number"] = receipt.blockNumber
+        record["gas_used"] = receipt.gasUsed
+        record["fee_wei"] = receipt.gasUsed * (receipt.get("effectiveGasPrice") or 0)
+    
+    @staticmethod
+    def _apply_disperse_record(record: Dict[str, Any]) -> None:
+        """合约调用整体成功或失败，批次内每笔转账的状态与所在交易一致"""
+        for item in record["items"]:
+            item["status"] = record["status"]
+            for key in ("transaction_hash", "nonce", "block_number", "error"):
+                if record.get(key) is not None:
+                    item[key] = record[key]
+    
+    async def _wait_for_disperse_receipts(self, transactions: List[Dict[str, Any]], timeout: float) -> None:
+        """统一等待全部合约批量转账交易的收据"""
+        async def wait(record: Dict[str, Any]) -> None:
+            try:
+                receipt = await self.receipt_tracker.wait_for_receipt(record["transaction_hash"], timeout=timeout)
+            except asyncio.TimeoutError:
+                record["error"] = "等待确认超时"
+            else:
+                self._apply_receipt(record, receipt)
+            self._apply_disperse_record(record)
+        
+        await asyncio.gather(*(
+            wait(record) for record in transactions
+            if record["type"] == "disperse" and record["status"] == "pending"
+        ))
+    
+    async def _get_fees(self) -> FeeEstimate:
+        """获取费用估算，链头跟踪器可用时按区块判断缓存是否有效"""
+        try:
+            block_number = await self.head_tracker.get_block_number()
+        except Exception as e:
+            logger.debug(f"链头不可用，费用缓存按有效期判断: {e}")
+            block_number = None
+        return await self.fee_oracle.get_fees(block_number)
+    
+    async def get_network_status(self) -> Dict[str, Any]:
+        """最新区块与连接状态"""
+        try:
+            await self.head_tracker.get_head()
+        except Exception as e:
+            logger.warning(f"获取链头失败 {self.network_config.name}: {e}")
+        return self.head_tracker.snapshot()
+    
+    async def _get_fee_params(self) -> Dict[str, int]:
+        """获取交易费用字段，支持EIP-1559时为type-2交易，费用预言机不可用时使用配置的gas价格"""
+        try:
+            fees = await self._get_fees()
+            return fees.to_transaction_params()
+        except Exception as e:
+            logger.warning(f"获取费用失败，使用默认gas价格: {e}")
+            return {'gasPrice': self.network_config.gas_price}
+    
+    async def _sign_and_broadcast(self, wallet: WalletSigner, transaction: Dict[str, Any]) -> HexBytes:
+        """在发送方队列中分配nonce、签名并广播交易
+
+        nonce被节点拒绝（冲突或空洞）时从链上pending计数重新同步并重试一次
+        """
+        chain_id = self.network_config.chain_id
+        async with nonce_manager.sender_queue(chain_id, wallet.address):
+            for attempt in range(2):
+                nonce = await nonce_manager.reserve(
+                    chain_id, wallet.address, lambda: self._fetch_pending_nonce(wallet.address)
+                )
+                transaction['nonce'] = nonce
+                signed_txn = wallet.sign_transaction(transaction)
+                try:
+                    return HexBytes(await self.rpc.request("eth_sendRawTransaction", [to_hex(signed_txn)]))
+                except Exception as e:
+                    if not is_nonce_error(e):
+                        nonce_manager.release(chain_id, wallet.address, nonce)
+                        raise
+                    nonce_manager.resync(chain_id, wallet.address)
+                    if attempt > 0:
+                        raise
+                    logger.warning(f"nonce {nonce} 被拒绝，重新同步后重试: {e}")
+    
+    async def _fetch_pending_nonce(self, address: str) -> int:
+        """从链上获取包含pending交易的nonce"""
+        return to_int(await self.rpc.request("eth_getTransactionCount", [address, "pending"]))
+    
     async def _wait_for_transaction_receipt(self, tx_hash: HexBytes, timeout: int = 120) -> TxReceipt:
         """等待交易确认"""
         try:
-            receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=timeout)
-            return receipt
-        except TimeExhausted:
-            raise TimeoutError(f"交易 {tx_hash.hex()} 确认超时")
+            return await self.receipt_tracker.wait_for_receipt(to_hex(tx_hash), timeout=timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"交易 {to_hex(tx_hash)} 确认超时")
     
     async def get_transaction_status(self, tx_hash: str) -> Dict[str, Any]:
-        """获取交易状态"""
+        """获取交易状态，已终结交易的状态从缓存读取"""
         try:
-            tx_hash_bytes = HexBytes(tx_hash)
+            tx_hash_hex = to_hex(HexBytes(tx_hash))
+            chain_id = self.network_config.chain_id
             
-            # 获取交易信息
-            try:
-                transaction = self.w3.eth.get_transaction(tx_hash_bytes)
-                receipt = self.w3.eth.get_transaction_receipt(tx_hash_bytes)
-                
-                status = "success" if receipt.status == 1 else "failed"
-                confirmations = self.w3.eth.block_number - receipt.blockNumber
-                
-            except TransactionNotFound:
+            cached_status = tx_status_cache.get(chain_id, tx_hash_hex)
+            if cached_status is not None:
+                # 交易详情不再变化，只需根据链头计算确认数
+                return self._format_transaction_status(
+                    tx_hash, cached_status, await self.head_tracker.get_block_number()
+                )
+            
+            # 交易、收据和finalized区块在一次批量请求中获取，链头高度来自跟踪器
+            latest_block, results = await asyncio.gather(
+                self.head_tracker.get_block_number(),
+                self.rpc.batch([
+                    ("eth_getTransactionByHash", [tx_hash_hex]),
+                    ("eth_getTransactionReceipt", [tx_hash_hex]),
+                    ("eth_getBlockByNumber", ["finalized", False]),
+                ])
+            )
+            transaction, receipt = [unwrap(result) for result in results[:2]]
+            
+            if not transaction or not receipt:
                 # 交易还在pending状态
                 return {
                     "transaction_hash": tx_hash,
@@ -379,29 +1409,154 @@ class EVMChainInterface(MultiChainInterface):
                     "message": "交易正在处理中..."
                 }
             
-            return {
-                "transaction_hash": tx_hash,
-                "status": status,
-                "block_number": receipt.blockNumber,
-                "confirmations": confirmations,
-                "gas_used": receipt.gasUsed,
-                "from_address": transaction['from'],
-                "to_address": transaction['to'],
-                "value_wei": str(transaction['value']),
-                "value_eth": str(self.w3.from_wei(transaction['value'], 'ether')),
-                "network": self.network_config.name
-            }
+            status = self._transaction_status(transaction, receipt)
+            block_number = status["block_number"]
+            
+            finalized_number = self._finalized_number(results[2])
+            if self._is_finalized(block_number, latest_block, finalized_number):
+                status["finalized"] = True
+                tx_status_cache.put(chain_id, tx_hash_hex, status)
+            else:
+                status["finalized"] = False
+            
+            return self._format_transaction_status(tx_hash, status, latest_block)
             
         except Exception as e:
             logger.error(f"获取交易状态失败: {e}")
             return {"error": str(e), "transaction_hash": tx_hash}
     
+    async def get_transaction_statuses(self, tx_hashes: List[str]) -> Dict[str, Any]:
+        """批量查询交易状态，返回紧凑的状态表
+
+        已终结交易从缓存读取；其余交易的收据和finalized区块在JSON-RPC批量请求中获取，
+        没有收据的交易再批量查询交易本身以区分pending和未找到，新终结的交易同批取回交易详情后
+        写入缓存（与单笔查询的缓存格式一致）。全部条目共用一次链头读取
+        """
+        start = time.perf_counter()
+        try:
+            chain_id = self.network_config.chain_id
+            statuses: Dict[str, Dict[str, Any]] = {}
+            lookups: Dict[str, str] = {}
+            for tx_hash in dict.fromkeys(tx_hashes):
+                try:
+                    tx_hash_hex = to_hex(HexBytes(tx_hash))
+                except (ValueError, TypeError):
+                    tx_hash_hex = ""
+                if len(tx_hash_hex) != 66:
+                    statuses[tx_hash] = {"status": "invalid", "error": "无效的交易哈希"}
+                    continue
+                cached_status = tx_status_cache.get(chain_id, tx_hash_hex)
+                if cached_status is not None:
+                    # 复制后再填确认数，不修改缓存中的条目
+                    statuses[tx_hash] = dict(cached_status)
+                else:
+                    lookups[tx_hash] = tx_hash_hex
+            
+            pending_hashes = list(lookups)
+            if pending_hashes:
+                latest_block, results = await asyncio.gather(
+                    self.head_tracker.get_block_number(),
+                    self.rpc.batch(
+                        [("eth_getTransactionReceipt", [lookups[tx_hash]]) for tx_hash in pending_hashes]
+                        + [("eth_getBlockByNumber", ["finalized", False])]
+                    )
+                )
+                finalized_number = self._finalized_number(results.pop())
+            else:
+                latest_block, results, finalized_number = await self.head_tracker.get_block_number(), [], None
+            
+            missing = []
+            finalized_receipts: Dict[str, Dict[str, Any]] = {}
+            for tx_hash, receipt in zip(pending_hashes, results):
+                if isinstance(receipt, RpcError):
+                    statuses[tx_hash] = {"status": "error", "error": str(receipt)}
+                elif not receipt:
+                    missing.append(tx_hash)
+                else:
+                    block_number = to_int(receipt["blockNumber"])
+                    finalized = self._is_finalized(block_number, latest_block, finalized_number)
+                    statuses[tx_hash] = {
+                        "status": "success" if to_int(receipt["status"]) == 1 else "failed",
+                        "block_number": block_number,
+                        "finalized": finalized
+                    }
+                    if finalized:
+                        finalized_receipts[tx_hash] = receipt
+            
+            follow_ups = missing + list(finalized_receipts)
+            if follow_ups:
+                # 没有收据时查询交易本身：仍在交易池中为pending，否则为未找到；
+                # 已终结的交易取回交易详情后写入缓存，之后的查询不再访问节点
+                transactions = await self.rpc.batch([
+                    ("eth_getTransactionByHash", [lookups[tx_hash]]) for tx_hash in follow_ups
+                ])
+                for tx_hash, transaction in zip(follow_ups, transactions):
+                    receipt = finalized_receipts.get(tx_hash)
+                    if receipt is not None:
+                        if transaction and not isinstance(transaction, RpcError):
+                            status = self._transaction_status(transaction, receipt)
+                            status["finalized"] = True
+                            tx_status_cache.put(chain_id, lookups[tx_hash], status)
+                            statuses[tx_hash] = dict(status)
+                    elif isinstance(transaction, RpcError):
+                        statuses[tx_hash] = {"status": "error", "error": str(transaction)}
+                    else:
+                        statuses[tx_hash] = {"status": "pending" if transaction else "not_found"}
+            
+            for status in statuses.values():
+                if status.get("block_number") is not None:
+                    status["confirmations"] = max(latest_block - status["block_number"], 0)
+            return self._status_table(tx_hashes, statuses, latest_block, start)
+        
+        except Exception as e:
+            logger.error(f"批量查询交易状态失败: {e}")
+            return {"error": str(e)}
+    
+    def _is_finalized(self, block_number: int, latest_block: int, finalized_number: Optional[int]) -> bool:
+        """交易所在区块是否已终结
+
+        节点支持finalized标签时只以finalized区块为准：固定的确认深度在以太坊（约64个区块才终结）、
+        Polygon等链上并不代表不会重组。不支持时才按网络的finality_depth判断
+        """
+        if finalized_number is not None:
+            return finalized_number >= block_number
+        return latest_block - block_number >= self.network_config.finality_depth
+    
+    @staticmethod
+    def _finalized_number(finalized_block: Any) -> Optional[int]:
+        """finalized区块高度，不支持finalized标签的节点返回None，此时按确认深度判断"""
+        if isinstance(finalized_block, dict) and finalized_block.get("number"):
+            return to_int(finalized_block["number"])
+        return None
+    
+    def _transaction_status(self, transaction: Dict[str, Any], receipt: Dict[str, Any]) -> Dict[str, Any]:
+        """由交易和收据生成与链头无关的交易状态，也是tx_status_cache中缓存的格式"""
+        value_wei = to_int(transaction["value"])
+        return {
+            "status": "success" if to_int(receipt["status"]) == 1 else "failed",
+            "block_number": to_int(receipt["blockNumber"]),
+            "gas_used": to_int(receipt["gasUsed"]),
+            "from_address": to_checksum_address(transaction["from"]),
+            "to_address": to_checksum_address(transaction["to"]) if transaction.get("to") else None,
+            "value_wei": str(value_wei),
+            "value_eth": str(self.w3.from_wei(value_wei, 'ether')),
+        }
+    
+    def _format_transaction_status(self, tx_hash: str, status: Dict[str, Any], latest_block: int) -> Dict[str, Any]:
+        """组合交易状态和按链头计算的确认数"""
+        return {
+            "transaction_hash": tx_hash,
+            **status,
+            "confirmations": max(latest_block - status["block_number"], 0),
+            "network": self.network_config.name
+        }
+    
     def _build_transaction_params(self, transaction: Dict[str, Any]) -> TxParams:
         """构建交易参数"""
         params = {}
         
         if 'to' in transaction:
-            params['to'] = self.w3.to_checksum_address(transaction['to'])
+            params['to'] = to_checksum_address(transaction['to'])
         if 'value' in transaction:
             params['value'] = self.w3.to_wei(transaction['value'], 'ether')
         if 'data' in transaction:
@@ -413,11 +1568,14 @@ class SolanaChainInterface(MultiChainInterface):
     """Solana链接口实现"""
     
     def __init__(self, network_config: NetworkConfig):
-        if not HAS_SOLANA:
+        if not _load_solana():
             raise ImportError("Solana支持需要安装solana库: pip install solana")
         
         self.network_config = network_config
-        self.client = SolanaClient(network_config.rpc_url)
+        # Solana同步客户端自带httpx连接池，这里只统一超时配置
+        self.client = SolanaClient(network_config.rpc_url, timeout=config.http_pool.request_timeout)
+        # 批量查询直接发送JSON-RPC批量请求，经由共享连接池和多节点路由
+        self.rpc = JsonRpcClient(network_config.rpc_urls, max_batch_size=network_config.rpc_batch_size)
         
         # 验证连接
         try:
@@ -441,13 +1599,12 @@ class SolanaChainInterface(MultiChainInterface):
                 "balances": {}
             }
             
-            # 获取SOL余额
-            balance_response = self.client.get_balance(PublicKey(address))
-            sol_balance_lamports = balance_response.value
-            sol_balance = sol_balance_lamports / 10**9  # 1 SOL = 10^9 lamports
+            # 获取SOL余额（经由异步JSON-RPC客户端，不阻塞事件循环中并发的其他查询）
+            balance_response = await self.rpc.request("getBalance", [address, {"commitment": "confirmed"}])
+            sol_balance_lamports = balance_response["value"]
             
             result["balances"]["SOL"] = {
-                "balance": str(sol_balance),
+                "balance": format_units(sol_balance_lamports, 9),  # 1 SOL = 10^9 lamports
                 "symbol": "SOL",
                 "decimals": 9,
                 "lamports": str(sol_balance_lamports)
@@ -603,12 +1760,60 @@ class SolanaChainInterface(MultiChainInterface):
         except Exception as e:
             logger.error(f"获取Solana交易状态失败: {e}")
             return {"error": str(e), "transaction_hash": tx_hash}
+    
+    async def get_transaction_statuses(self, tx_hashes: List[str]) -> Dict[str, Any]:
+        """批量查询交易状态，返回紧凑的状态表
+
+        getSignatureStatuses每次最多查询256个签名，全部分块与getSlot合并为一次JSON-RPC批量请求。
+        节点遇到一个格式错误的签名就会拒绝整个分块，因此先逐个校验，无效签名单独标记、不发送
+        """
+        start = time.perf_counter()
+        try:
+            statuses: Dict[str, Dict[str, Any]] = {}
+            signatures = []
+            for signature in dict.fromkeys(tx_hashes):
+                if is_solana_signature(signature):
+                    signatures.append(signature)
+                else:
+                    statuses[signature] = {"status": "invalid", "error": "无效的交易签名"}
+            chunks = [
+                signatures[index:index + SOLANA_SIGNATURE_STATUS_LIMIT]
+                for index in range(0, len(signatures), SOLANA_SIGNATURE_STATUS_LIMIT)
+            ]
+            results = await self.rpc.batch(
+                [("getSlot", [{"commitment": "confirmed"}])]
+                + [("getSignatureStatuses", [chunk, {"searchTransactionHistory": True}]) for chunk in chunks]
+            )
+            latest_slot = unwrap(results[0])
+            
+            for chunk, result in zip(chunks, results[1:]):
+                if isinstance(result, RpcError):
+                    for signature in chunk:
+                        statuses[signature] = {"status": "error", "error": str(result)}
+                    continue
+                for signature, value in zip(chunk, result.get("value") or []):
+                    if value is None:
+                        statuses[signature] = {"status": "not_found"}
+                        continue
+                    statuses[signature] = {
+                        "status": "failed" if value.get("err") else "success",
+                        "block_number": value["slot"],
+                        "confirmations": max(latest_slot - value["slot"], 0),
+                        "finalized": value.get("confirmationStatus") == "finalized"
+                    }
+                for signature in chunk:
+                    statuses.setdefault(signature, {"status": "error", "error": "节点未返回该签名的状态"})
+            return self._status_table(tx_hashes, statuses, latest_slot, start)
+        
+        except Exception as e:
+            logger.error(f"批量查询Solana交易状态失败: {e}")
+            return {"error": str(e)}
 
 class CosmosChainInterface(MultiChainInterface):
     """Cosmos链接口实现"""
     
     def __init__(self, network_config: NetworkConfig):
-        if not HAS_COSMOS:
+        if not _load_cosmos():
             raise ImportError("Cosmos支持需要安装cosmospy库: pip install cosmospy")
         
         self.network_config = network_config
@@ -671,20 +1876,23 @@ class MultiChainFactory:
     }
     
     @staticmethod
-    def create_chain_interface(network_config: NetworkConfig) -> MultiChainInterface:
-        """根据网络配置创建对应的链接口实例"""
+    def get_chain_type(network_config: NetworkConfig) -> Optional[str]:
+        """根据网络名称（其次是chain_id）判断链类型，无法判断时返回None"""
         # 根据网络名称判断链类型
-        chain_type = None
         for chain, chain_type_key in MultiChainFactory.CHAIN_TYPE_MAPPING.items():
             if chain.lower() in network_config.name.lower():
-                chain_type = chain_type_key
-                break
+                return chain_type_key
         
         # 如果没有匹配，根据chain_id判断
-        if not chain_type:
-            evm_chain_ids = [1, 56, 137, 43114, 250, 42161, 10, 8453]  # 常见EVM链ID
-            if network_config.chain_id in evm_chain_ids:
-                chain_type = "evm"
+        evm_chain_ids = [1, 56, 137, 43114, 250, 42161, 10, 8453]  # 常见EVM链ID
+        if network_config.chain_id in evm_chain_ids:
+            return "evm"
+        return None
+    
+    @staticmethod
+    def create_chain_interface(network_config: NetworkConfig) -> MultiChainInterface:
+        """根据网络配置创建对应的链接口实例"""
+        chain_type = MultiChainFactory.get_chain_type(network_config)
         
         # 创建对应的接口实例
         if chain_type == "evm":
@@ -704,6 +1912,8 @@ class MultiChainManager:
     
     def __init__(self):
         self.chain_interfaces: Dict[str, MultiChainInterface] = {}
+        # 正在异步初始化的网络，后到的请求等待同一个任务
+        self._initializing: Dict[str, asyncio.Future] = {}
     
     def get_chain_interface(self, network_id: str) -> MultiChainInterface:
         """获取指定网络的链接口实例"""
@@ -719,6 +1929,55 @@ class MultiChainManager:
         self.chain_interfaces[network_id] = chain_interface
         
         return chain_interface
+    
+    async def get_chain_interface_async(self, network_id: str) -> MultiChainInterface:
+        """异步获取链接口实例
+        
+        构造和健康检查不阻塞事件循环；同一网络正在初始化（如预热中）时
+        等待进行中的初始化完成，而不是重复创建
+        """
+        if network_id in self.chain_interfaces:
+            return self.chain_interfaces[network_id]
+        
+        future = self._initializing.get(network_id)
+        if future is None:
+            future = asyncio.ensure_future(self._create_chain_interface(network_id))
+            self._initializing[network_id] = future
+            future.add_done_callback(lambda _: self._initializing.pop(network_id, None))
+        
+        # shield避免单个调用方被取消时中断共享的初始化任务
+        return await asyncio.shield(future)
+    
+    async def _create_chain_interface(self, network_id: str) -> MultiChainInterface:
+        """在线程池中构造链接口（部分SDK构造时会同步访问网络）并完成健康检查"""
+        network_config = config.get_network(network_id)
+        loop = asyncio.get_running_loop()
+        chain_interface = await loop.run_in_executor(
+            None, MultiChainFactory.create_chain_interface, network_config
+        )
+        await chain_interface.check_connection()
+        # 同步路径可能已经抢先创建，保留先创建的实例
+        return self.chain_interfaces.setdefault(network_id, chain_interface)
+    
+    async def warm_up(self, network_ids: List[str]) -> Dict[str, bool]:
+        """并发构造并检查一组网络的链接口，返回每个网络是否成功"""
+        results = await asyncio.gather(
+            *(self.get_chain_interface_async(network_id) for network_id in network_ids),
+            return_exceptions=True
+        )
+        status = {}
+        for network_id, result in zip(network_ids, results):
+            if isinstance(result, BaseException):
+                logger.warning(f"网络预热失败 {network_id}: {result}")
+                status[network_id] = False
+            else:
+                status[network_id] = True
+        logger.info(f"网络预热完成: {status}")
+        return status
+    
+    def start_warm_up(self, network_ids: List[str]) -> asyncio.Task:
+        """在后台启动网络预热"""
+        return asyncio.ensure_future(self.warm_up(network_ids))
 
 # 全局多链管理器实例
-multi_chain_manager = MultiChainManager()
\ No newline at end of file
+multi_chain_manager = MultiChainManager()
@@ -0,0 +1,95 @@
+"""
+nonce管理模块
+
+按(chain_id, 发送地址)在本地分配nonce，避免每笔交易都查询链上nonce，
+也避免同一钱包的并发交易拿到相同的nonce
+"""
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+NonceKey = Tuple[int, str]
+
+# 表示nonce与链上状态不一致的节点错误信息
+NONCE_ERROR_MESSAGES = (
+    "nonce too low",
+    "nonce too high",
+    "invalid nonce",
+    "replacement transaction underpriced",
+    "transaction underpriced: nonce",
+)
+
+# 表示交易已在节点交易池中的错误信息（重复广播同一笔已签名交易）
+KNOWN_TRANSACTION_MESSAGES = (
+    "already known",
+    "known transaction",
+    "already imported",
+)
+
+def is_nonce_error(error: Exception) -> bool:
+    """判断广播失败是否由nonce冲突或空洞引起"""
+    message = str(error).lower()
+    return any(text in message for text in NONCE_ERROR_MESSAGES)
+
+def is_known_transaction(error: Exception) -> bool:
+    """判断广播失败是否因为交易已在交易池中，此时交易实际已被接受"""
+    message = str(error).lower()
+    return any(text in message for text in KNOWN_TRANSACTION_MESSAGES)
+
+class NonceManager:
+    """本地nonce管理器"""
+
+    def __init__(self):
+        self._next_nonce: Dict[NonceKey, int] = {}
+        self._locks: Dict[NonceKey, asyncio.Lock] = {}
+
+    @staticmethod
+    def _key(chain_id: int, address: str) -> NonceKey:
+        return (chain_id, address.lower())
+
+    @asynccontextmanager
+    async def sender_queue(self, chain_id: int, address: str) -> AsyncIterator[None]:
+        """同一发送方的先进先出发送队列
+
+        asyncio.Lock按等待顺序唤醒，持有期间完成nonce分配、签名和广播，
+        等待确认在队列之外进行，因此同一钱包可以有多笔交易同时在途，
+        不同钱包之间互不阻塞
+        """
+        key = self._key(chain_id, address)
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        async with lock:
+            yield
+
+    async def reserve(self, chain_id: int, address: str,
+                      fetch_pending_nonce: Callable[[], Awaitable[int]]) -> int:
+        """分配下一个nonce，本地没有记录时从链上pending计数同步"""
+        key = self._key(chain_id, address)
+        if key not in self._next_nonce:
+            self._next_nonce[key] = await fetch_pending_nonce()
+            logger.debug(f"nonce已同步 {address} (Chain ID: {chain_id}): {self._next_nonce[key]}")
+        nonce = self._next_nonce[key]
+        self._next_nonce[key] = nonce + 1
+        return nonce
+
+    def release(self, chain_id: int, address: str, nonce: int) -> None:
+        """归还未成功广播的nonce
+
+        如果它是最后分配的nonce则直接回退，否则会留下空洞，下次分配时重新同步
+        """
+        key = self._key(chain_id, address)
+        if self._next_nonce.get(key) == nonce + 1:
+            self._next_nonce[key] = nonce
+        else:
+            self.resync(chain_id, address)
+
+    def resync(self, chain_id: int, address: str) -> None:
+        """丢弃本地nonce，下次分配时从链上pending计数重新同步"""
+        self._next_nonce.pop(self._key(chain_id, address), None)
+
+# 全局nonce管理器实例
+nonce_manager = NonceManager()
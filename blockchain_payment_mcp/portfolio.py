@@ -0,0 +1,138 @@
+"""
+跨链资产组合查询
+
+同一地址同时向所有适用的网络查询余额，每条链有各自的截止时间：
+截止时间内返回的链使用最新结果；超时的链返回上一次成功查询的结果并标记为stale，
+查询在后台继续进行，完成后更新缓存供下次使用。总耗时约等于最慢一条链的截止时间，
+而不是各条链耗时之和
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from .config import config
+from .multi_chain import MultiChainFactory, multi_chain_manager
+from .wallet import WalletSigner
+
+logger = logging.getLogger(__name__)
+
+PortfolioKey = Tuple[str, str]
+
+class PortfolioService:
+    """跨链资产组合查询，缓存每个(网络, 地址)最近一次成功的余额"""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = max(1, maxsize)
+        # (网络ID, 地址) -> (余额结果, 获取时间戳)
+        self._last: "OrderedDict[PortfolioKey, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        # 进行中的查询，超过截止时间后仍在后台运行，同一(网络, 地址)的后续查询复用它
+        self._inflight: Dict[PortfolioKey, asyncio.Future] = {}
+
+    @staticmethod
+    def _key(network_id: str, address: str) -> PortfolioKey:
+        # EVM地址不区分大小写，Solana等base58地址区分大小写
+        return network_id, address.lower() if address.startswith("0x") else address
+
+    @staticmethod
+    def applicable_networks(address: str) -> List[str]:
+        """与地址格式匹配的网络：EVM地址对应全部EVM网络，其他地址对应非EVM网络"""
+        is_evm_address = WalletSigner.validate_address(address)
+        networks = []
+        for network_id, network_config in config.networks.items():
+            chain_type = MultiChainFactory.get_chain_type(network_config) or "evm"
+            if (chain_type == "evm") == is_evm_address:
+                networks.append(network_id)
+        return networks
+
+    def _store(self, key: PortfolioKey, result: Dict[str, Any]) -> None:
+        self._last[key] = (result, time.time())
+        self._last.move_to_end(key)
+        while len(self._last) > self.maxsize:
+            self._last.popitem(last=False)
+
+    async def _fetch(self, network_id: str, address: str) -> Dict[str, Any]:
+        chain_interface = await multi_chain_manager.get_chain_interface_async(network_id)
+        result = await chain_interface.get_balance(address)
+        if "error" not in result:
+            self._store(self._key(network_id, address), result)
+        return result
+
+    def _start_fetch(self, network_id: str, address: str) -> asyncio.Future:
+        """启动查询，同一(网络, 地址)已有进行中的查询时直接复用"""
+        key = self._key(network_id, address)
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._fetch(network_id, address))
+            self._inflight[key] = future
+
+            def done(finished: asyncio.Future) -> None:
+                self._inflight.pop(key, None)
+                if not finished.cancelled() and finished.exception() is not None:
+                    logger.debug(f"资产查询失败 {network_id}: {finished.exception()}")
+
+            future.add_done_callback(done)
+        return future
+
+    async def _query_network(self, network_id: str, address: str, timeout: float) -> Dict[str, Any]:
+        """在截止时间内查询一条链，超时时返回缓存结果"""
+        start = time.perf_counter()
+        future = self._start_fetch(network_id, address)
+        try:
+            # shield使超时只结束等待，查询在后台继续并更新缓存
+            result = await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            cached = self._last.get(self._key(network_id, address))
+            entry: Dict[str, Any] = {"status": "stale" if cached else "timeout"}
+            if cached:
+                entry["balances"] = cached[0].get("balances", {})
+                entry["age_seconds"] = round(time.time() - cached[1], 1)
+            entry["error"] = f"超过截止时间 {timeout} 秒未返回"
+        except Exception as e:
+            entry = {"status": "error", "error": str(e)}
+        else:
+            if "error" in result:
+                entry = {"status": "error", "error": result["error"]}
+            else:
+                entry = {"status": "ok", "balances": result.get("balances", {})}
+        entry["network"] = config.networks[network_id].name
+        entry["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        return entry
+
+    async def get_portfolio(self, address: str, network_ids: Optional[List[str]] = None,
+                            timeout: Optional[float] = None) -> Dict[str, Any]:
+        """同时查询一个地址在多个网络上的余额
+
+        每条链的截止时间依次取参数timeout、网络的portfolio_timeout和全局默认值
+        """
+        start = time.perf_counter()
+        if network_ids is None:
+            network_ids = self.applicable_networks(address)
+        unknown = [network_id for network_id in network_ids if network_id not in config.networks]
+        if unknown:
+            return {"error": f"不支持的网络: {', '.join(unknown)}"}
+        if not network_ids:
+            return {"error": "没有与该地址格式匹配的网络", "address": address}
+
+        def deadline(network_id: str) -> float:
+            if timeout is not None:
+                return timeout
+            return config.networks[network_id].portfolio_timeout or config.portfolio_timeout
+
+        entries = await asyncio.gather(*(
+            self._query_network(network_id, address, deadline(network_id)) for network_id in network_ids
+        ))
+        networks = dict(zip(network_ids, entries))
+        status_counts: Dict[str, int] = {}
+        for entry in entries:
+            status_counts[entry["status"]] = status_counts.get(entry["status"], 0) + 1
+        return {
+            "address": address,
+            "networks": networks,
+            "status_counts": status_counts,
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 1)
+        }
+
+# 全局跨链资产查询实例
+portfolio_service = PortfolioService()
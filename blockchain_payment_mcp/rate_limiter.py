@@ -0,0 +1,231 @@
+"""
+RPC节点自适应限流
+
+每个RPC节点URL一个限流器，位于路由层之下，所有链接口对同一节点的请求共享它：
+- 令牌桶：基于asyncio-throttle的滑动窗口，窗口内最多发出rate*burst个请求，允许短时突发
+- 公平排队：等待的请求由asyncio.Lock按到达顺序放行，不会被后来的请求插队
+- AIMD：默认首次被限流前不限速，收到429或限流错误时以最近1秒的实际发送速率减半作为起点，
+  之后每次被限流速率减半并暂停到Retry-After，每次成功缓慢加性恢复
+- 被限流的请求未被节点处理，重新排队后重发，超过重试次数才作为错误返回
+限流器统计排队深度、等待时间和限流次数，随路由统计一起返回
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from asyncio_throttle import Throttler
+
+from .config import RateLimitConfig, config
+
+logger = logging.getLogger(__name__)
+
+# 表示限流的JSON-RPC错误码（部分托管节点在HTTP 200响应体中返回）
+RATE_LIMIT_CODES = frozenset({429, -32029})
+
+# 表示限流的节点错误信息
+RATE_LIMIT_MESSAGES = (
+    "rate limit",
+    "ratelimit",
+    "too many requests",
+    "request limit",
+    "requests limited",
+    "compute units per second",
+)
+
+class RateLimitedError(Exception):
+    """请求多次重新排队后仍被节点限流"""
+
+    def __init__(self, url: str, message: str, retries: int):
+        self.url = url
+        self.retries = retries
+        super().__init__(f"RPC节点 {url} 限流，重试{retries}次后仍被拒绝: {message}")
+
+def http_status(error: Exception) -> Tuple[Optional[int], Any]:
+    """取出HTTP错误的状态码和响应头（兼容aiohttp和httpx）"""
+    status = getattr(error, "status", None)
+    if status is not None:
+        return status, getattr(error, "headers", None)
+    response = getattr(error, "response", None)
+    if response is not None:
+        return getattr(response, "status_code", None), getattr(response, "headers", None)
+    return None, None
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """判断HTTP请求失败是否由节点限流引起"""
+    status, _ = http_status(error)
+    if status == 429:
+        return True
+    message = str(error).lower()
+    return any(text in message for text in RATE_LIMIT_MESSAGES)
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """读取限流响应的Retry-After（秒），没有或为HTTP日期格式时返回None"""
+    _, headers = http_status(error)
+    if not headers:
+        return None
+    value = headers.get("Retry-After")
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except ValueError:
+        return None
+
+def _is_rate_limit_payload(error: Any) -> bool:
+    if not isinstance(error, dict):
+        return False
+    if error.get("code") in RATE_LIMIT_CODES:
+        return True
+    message = str(error.get("message", "")).lower()
+    return any(text in message for text in RATE_LIMIT_MESSAGES)
+
+def rate_limited_calls(response: Any) -> Tuple[int, int]:
+    """JSON-RPC响应中被限流的调用数和调用总数"""
+    if isinstance(response, list):
+        limited = sum(1 for item in response if isinstance(item, dict) and _is_rate_limit_payload(item.get("error")))
+        return limited, len(response)
+    if isinstance(response, dict):
+        return int(_is_rate_limit_payload(response.get("error"))), 1
+    return 0, 1
+
+class AdaptiveRateLimiter:
+    """单个RPC节点的自适应限流器"""
+
+    def __init__(self, url: str, settings: RateLimitConfig):
+        self.url = url
+        self.settings = settings
+        self.enabled = settings.rate != 0
+        # 为None时尚未开始限速（或已关闭限流）
+        self.rate = settings.rate if self.enabled else None
+        self.throttler = Throttler(rate_limit=1)
+        self._apply_rate()
+        # 开始限速前最近1秒内的发送时间，首次被限流时据此确定初始速率
+        self._recent: Deque[float] = deque()
+        # 排队锁绑定创建它的事件循环，换了事件循环需要新建
+        self._lock: Optional[Tuple[asyncio.AbstractEventLoop, asyncio.Lock]] = None
+        # 收到限流响应后整个队列暂停到该时刻
+        self._blocked_until = 0.0
+        self._last_decrease = 0.0
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.requests = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.rate_limited = 0
+        self.decreases = 0
+
+    def _apply_rate(self) -> None:
+        """速率换算为窗口内请求数（桶容量）和窗口长度，速率较低时延长窗口"""
+        if self.rate is None:
+            return
+        limit = max(1, int(self.rate * self.settings.burst))
+        self.throttler.rate_limit = limit
+        self.throttler.period = limit / self.rate
+
+    def _queue_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock[0] is not loop:
+            self._lock = (loop, asyncio.Lock())
+        return self._lock[1]
+
+    async def acquire(self) -> float:
+        """按到达顺序排队等待发送许可，返回等待时间（秒）"""
+        start = time.monotonic()
+        self.queue_depth += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        try:
+            async with self._queue_lock():
+                delay = self._blocked_until - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                if self.rate is not None:
+                    await self.throttler.acquire()
+                elif self.enabled:
+                    self._record_send()
+        finally:
+            self.queue_depth -= 1
+        waited = time.monotonic() - start
+        self.requests += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        return waited
+
+    def _record_send(self) -> None:
+        now = time.monotonic()
+        self._recent.append(now)
+        while now - self._recent[0] > 1.0:
+            self._recent.popleft()
+
+    def on_success(self) -> None:
+        """加性增加：每次成功增加increase_step/rate，满负荷时约每秒增加increase_step"""
+        if self.rate is None or self.rate >= self.settings.max_rate:
+            return
+        self.rate = min(self.settings.max_rate, self.rate + self.settings.increase_step / self.rate)
+        self._apply_rate()
+
+    def on_rate_limited(self, sent_at: float, retry_after: Optional[float] = None) -> None:
+        """乘性减少并暂停队列
+
+        只有在上次降速之后发出、且距上次降速超过decrease_interval的请求被限流才再次降速：
+        降速前以旧速率发出的请求陆续返回的429、以及节点计数窗口尚未过去时的429，
+        都不代表新速率仍然过高
+        """
+        self.rate_limited += 1
+        now = time.monotonic()
+        if retry_after is None and self.rate is not None:
+            # 未给出Retry-After时暂停一个请求间隔
+            retry_after = 1 / self.rate
+        if retry_after:
+            retry_after = min(retry_after, self.settings.max_retry_after)
+            self._blocked_until = max(self._blocked_until, now + retry_after)
+
+        if not self.enabled or sent_at < self._last_decrease:
+            return
+        if now - self._last_decrease < self.settings.decrease_interval:
+            return
+        if self.rate is None:
+            # 首次被限流：以最近1秒的实际发送速率为基准开始限速
+            previous = float(len(self._recent))
+            self._recent.clear()
+        else:
+            previous = self.rate
+        self.rate = max(self.settings.min_rate, min(self.settings.max_rate, previous * self.settings.decrease_factor))
+        self._last_decrease = now
+        self.decreases += 1
+        self._apply_rate()
+        logger.warning(f"RPC节点 {self.url} 限流，速率从 {previous:.1f} 降至 {self.rate:.1f} 次/秒")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "rate": round(self.rate, 2) if self.rate is not None else None,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "requests": self.requests,
+            "avg_wait_ms": round(self.total_wait / self.requests * 1000, 1) if self.requests else 0.0,
+            "max_wait_ms": round(self.max_wait * 1000, 1),
+            "rate_limited": self.rate_limited,
+            "rate_decreases": self.decreases
+        }
+
+class RateLimiterRegistry:
+    """按节点URL共享的限流器（同一主机的不同URL可能对应不同的API密钥和配额）"""
+
+    def __init__(self, settings: RateLimitConfig):
+        self.settings = settings
+        self._limiters: Dict[str, AdaptiveRateLimiter] = {}
+
+    def get(self, url: str) -> AdaptiveRateLimiter:
+        limiter = self._limiters.get(url)
+        if limiter is None:
+            limiter = self._limiters[url] = AdaptiveRateLimiter(url, self.settings)
+        return limiter
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {url: limiter.stats() for url, limiter in self._limiters.items()}
+
+    def clear(self) -> None:
+        self._limiters.clear()
+
+# 全局限流器注册表
+rate_limiters = RateLimiterRegistry(config.rate_limit)
@@ -0,0 +1,125 @@
+"""
+交易收据跟踪器
+
+每个网络共享一个轮询循环：检测到新区块后，用一次JSON-RPC批量请求
+获取所有待确认交易的收据，并唤醒对应的等待方
+"""
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Any, Dict, Optional, Set
+
+from web3.datastructures import AttributeDict
+
+from .rpc import JsonRpcClient, RpcError, to_int
+
+if TYPE_CHECKING:
+    from .head_tracker import HeadTracker
+
+logger = logging.getLogger(__name__)
+
+# 收据中需要从十六进制转换为整数的字段
+RECEIPT_QUANTITY_FIELDS = (
+    "blockNumber",
+    "cumulativeGasUsed",
+    "effectiveGasPrice",
+    "gasUsed",
+    "status",
+    "transactionIndex",
+    "type",
+)
+
+def format_receipt(raw_receipt: Dict[str, Any]) -> AttributeDict:
+    """将JSON-RPC原始收据转换为与web3一致的属性字典"""
+    receipt = dict(raw_receipt)
+    for field in RECEIPT_QUANTITY_FIELDS:
+        if receipt.get(field) is not None:
+            receipt[field] = to_int(receipt[field])
+    return AttributeDict(receipt)
+
+class ReceiptTracker:
+    """交易收据跟踪器 - 单个轮询循环监视一个网络上的全部待确认交易"""
+
+    def __init__(self, rpc: JsonRpcClient, poll_interval: float = 2.0,
+                 head_tracker: Optional["HeadTracker"] = None):
+        self.rpc = rpc
+        # 提供链头跟踪器时从中读取区块高度，不再单独轮询eth_blockNumber
+        self.head_tracker = head_tracker
+        self.poll_interval = poll_interval
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._waiters: Dict[str, int] = {}
+        # 新加入、尚未查询过收据的交易，不必等下一个区块
+        self._unchecked: Set[str] = set()
+        self._last_block: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def pending_count(self) -> int:
+        """待确认交易数量"""
+        return len(self._pending)
+
+    def track(self, tx_hash: str) -> asyncio.Future:
+        """开始跟踪交易，返回在收据到达时完成的Future"""
+        tx_hash = tx_hash.lower()
+        future = self._pending.get(tx_hash)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._pending[tx_hash] = future
+            self._unchecked.add(tx_hash)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return future
+
+    async def wait_for_receipt(self, tx_hash: str, timeout: float = 120) -> AttributeDict:
+        """等待交易收据，超时抛出asyncio.TimeoutError"""
+        tx_hash = tx_hash.lower()
+        future = self.track(tx_hash)
+        self._waiters[tx_hash] = self._waiters.get(tx_hash, 0) + 1
+        try:
+            # shield避免单个等待方超时取消其他等待方共享的Future
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        finally:
+            self._waiters[tx_hash] -= 1
+            if self._waiters[tx_hash] == 0:
+                del self._waiters[tx_hash]
+                if not future.done():
+                    # 已无等待方，停止跟踪
+                    self._discard(tx_hash)
+                    future.cancel()
+
+    def _discard(self, tx_hash: str) -> None:
+        self._pending.pop(tx_hash, None)
+        self._unchecked.discard(tx_hash)
+
+    async def _run(self) -> None:
+        """轮询循环，没有待确认交易时退出"""
+        while self._pending:
+            try:
+                if self.head_tracker is not None:
+                    block_number = await self.head_tracker.get_block_number()
+                else:
+                    block_number = to_int(await self.rpc.request("eth_blockNumber"))
+                if block_number != self._last_block:
+                    self._last_block = block_number
+                    await self._fetch_receipts(list(self._pending))
+                elif self._unchecked:
+                    await self._fetch_receipts(list(self._unchecked))
+            except Exception as e:
+                logger.warning(f"收据轮询失败: {e}")
+            if self._pending:
+                await asyncio.sleep(self.poll_interval)
+
+    async def _fetch_receipts(self, tx_hashes: list) -> None:
+        """批量获取收据并完成对应的Future"""
+        self._unchecked.difference_update(tx_hashes)
+        results = await self.rpc.batch([
+            ("eth_getTransactionReceipt", [tx_hash]) for tx_hash in tx_hashes
+        ])
+        for tx_hash, result in zip(tx_hashes, results):
+            if isinstance(result, RpcError):
+                logger.debug(f"获取收据失败 {tx_hash}: {result}")
+                continue
+            if not result:
+                continue
+            future = self._pending.pop(tx_hash, None)
+            if future is not None and not future.done():
+                future.set_result(format_receipt(result))
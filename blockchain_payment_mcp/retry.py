@@ -0,0 +1,70 @@
+"""
+RPC请求重试策略
+
+只重试幂等的只读方法，且只在传输层失败（超时、连接错误、HTTP 5xx）时重试：
+JSON-RPC错误响应（如执行回滚）是节点给出的确定结果，重试不会改变。
+限流（HTTP 429）只由路由层按节点的自适应限流器重新排队，这里不再叠加一轮重试，
+否则对已在限流的节点的请求次数成倍增加。
+广播交易等写请求以及读取nonce的eth_getTransactionCount不重试：前者避免重复提交，
+后者与广播固定发往同一节点，失败时直接报错，下次发送时重新读取。
+退避时间为指数增长上限内的均匀随机值（full jitter），避免大量请求在同一时刻重试
+"""
+import asyncio
+import random
+from typing import Tuple, Type
+
+import aiohttp
+
+from .config import RetryConfig
+from .rate_limiter import http_status
+
+# 可以安全重试的只读方法
+RETRYABLE_METHODS = frozenset({
+    "eth_call",
+    "eth_getBalance",
+    "eth_getTransactionReceipt",
+    "eth_getTransactionByHash",
+    "eth_getBlockByNumber",
+    "eth_blockNumber",
+    "eth_chainId",
+    "eth_gasPrice",
+    "eth_feeHistory",
+    "eth_estimateGas",
+    "eth_getCode",
+    "getBalance",
+    "getSlot",
+    "getSignatureStatuses",
+})
+
+# 可重试的HTTP状态码（429由限流器处理，不在此列）
+RETRYABLE_STATUS = frozenset({408, 500, 502, 503, 504})
+
+TRANSIENT_ERRORS: Tuple[Type[BaseException], ...] = (
+    asyncio.TimeoutError, aiohttp.ClientError, ConnectionError
+)
+try:
+    import httpx
+    TRANSIENT_ERRORS += (httpx.TransportError,)
+except ImportError:
+    pass
+
+def is_retryable_error(error: Exception) -> bool:
+    """判断请求失败是否为可重试的传输层错误"""
+    status, _ = http_status(error)
+    if status is not None:
+        return status in RETRYABLE_STATUS
+    return isinstance(error, TRANSIENT_ERRORS)
+
+class RetryPolicy:
+    """指数退避加随机抖动的重试策略"""
+
+    def __init__(self, settings: RetryConfig):
+        self.settings = settings
+
+    def backoff(self, attempt: int) -> float:
+        """第attempt次重试（从0开始）前的等待时间"""
+        cap = min(self.settings.max_delay, self.settings.base_delay * (2 ** attempt))
+        return random.uniform(0, cap)
+
+    def should_retry(self, attempt: int, error: Exception) -> bool:
+        return attempt < self.settings.max_retries and is_retryable_error(error)
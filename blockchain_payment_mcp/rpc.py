@@ -0,0 +1,200 @@
+"""
+JSON-RPC 客户端
+
+支持JSON-RPC 2.0批量请求：互不依赖的多个调用合并为一次HTTP请求发送，
+再按id将响应分发回各个调用，单个调用失败不影响同批次的其他调用。
+只读请求在传输失败时按指数退避加随机抖动重试
+"""
+import asyncio
+import itertools
+import logging
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from .circuit_breaker import CircuitOpenError
+from .config import config
+from .retry import RETRYABLE_METHODS, RetryPolicy
+from .rpc_router import RpcRouter
+
+if TYPE_CHECKING:
+    from .http_pool import HttpSessionPool
+
+logger = logging.getLogger(__name__)
+
+# 批量请求中的单个调用: (方法名, 参数列表)
+RpcCall = Tuple[str, Sequence[Any]]
+
+class RpcError(Exception):
+    """JSON-RPC 错误响应"""
+
+    def __init__(self, code: int, message: str, method: Optional[str] = None, data: Any = None):
+        self.code = code
+        self.message = message
+        self.method = method
+        self.data = data
+        prefix = f"{method}: " if method else ""
+        super().__init__(f"{prefix}{message} (code: {code})")
+
+def to_int(value: Any) -> Optional[int]:
+    """将JSON-RPC返回的十六进制数量转换为整数"""
+    if value is None:
+        return None
+    if isinstance(value, int):
+        return value
+    return int(value, 16)
+
+def to_hex(value: Union[bytes, str]) -> str:
+    """转换为0x前缀的十六进制字符串（兼容不同版本hexbytes的hex()输出）"""
+    hex_str = value.hex() if isinstance(value, (bytes, bytearray)) else value
+    return hex_str if hex_str.startswith("0x") else "0x" + hex_str
+
+def format_units(value: int, decimals: int) -> str:
+    """将最小单位的整数金额按精度转换为十进制字符串，按字符串处理不损失精度"""
+    sign = "-" if value < 0 else ""
+    digits = str(abs(value)).rjust(decimals + 1, "0")
+    split = len(digits) - decimals
+    integer, fraction = digits[:split], digits[split:].rstrip("0")
+    return f"{sign}{integer}.{fraction}" if fraction else f"{sign}{integer}"
+
+def unwrap(result: Union[Any, RpcError]) -> Any:
+    """取出批量调用的结果，错误时抛出"""
+    if isinstance(result, RpcError):
+        raise result
+    return result
+
+# 表示节点尚未同步到请求中指定区块的错误信息（多节点时落后的节点会返回）
+BLOCK_NOT_FOUND_MESSAGES = (
+    "header not found",
+    "block not found",
+    "unknown block",
+    "missing trie node",
+)
+
+def is_block_not_found(error: Exception) -> bool:
+    """判断调用失败是否因为节点还没有请求中指定的区块"""
+    message = str(error).lower()
+    return any(text in message for text in BLOCK_NOT_FOUND_MESSAGES)
+
+# 写请求及与交易池状态相关的读取，固定发往同一节点
+PINNED_METHODS = frozenset({"eth_sendRawTransaction", "eth_sendTransaction", "eth_getTransactionCount"})
+
+# 延迟敏感的轻量只读调用，单独发送时允许对冲；eth_call、eth_estimateGas和批量请求开销大，不对冲
+HEDGED_METHODS = frozenset({
+    "eth_blockNumber",
+    "eth_getBalance",
+    "eth_getTransactionReceipt",
+    "eth_getTransactionByHash",
+    "eth_chainId",
+    "getSlot",
+    "getBalance",
+})
+
+class JsonRpcClient:
+    """JSON-RPC 2.0 客户端，支持批量请求、批大小上限和多节点路由"""
+
+    def __init__(self, rpc_url: Union[str, Sequence[str]], max_batch_size: int = 50,
+                 timeout: Optional[float] = None, pool: Optional["HttpSessionPool"] = None,
+                 retry_policy: Optional[RetryPolicy] = None):
+        self.rpc_urls = [rpc_url] if isinstance(rpc_url, str) else list(rpc_url)
+        self.rpc_url = self.rpc_urls[0]
+        # 部分节点限制单次批量请求的调用数量，超过时拆分为多个批次
+        self.max_batch_size = max(1, max_batch_size)
+        # 为None时使用连接池配置的请求超时
+        self.timeout = timeout
+        self.router = RpcRouter(self.rpc_urls, pool=pool)
+        self.retry_policy = retry_policy or RetryPolicy(config.rpc_retry)
+        self.retries = 0
+        self._ids = itertools.count(1)
+
+    @property
+    def pool(self) -> "HttpSessionPool":
+        """所用的HTTP连接池"""
+        return self.router.pool
+
+    async def _post(self, payload: Union[Dict[str, Any], List[Dict[str, Any]]], pinned: bool = False,
+                    retryable: bool = False, hedge: bool = False) -> Any:
+        """发送HTTP请求并返回解析后的JSON，retryable为True时传输失败后退避重试
+
+        所有节点都已熔断时直接失败，不在熔断期间反复重试
+        """
+        attempt = 0
+        while True:
+            try:
+                return await self.router.post(payload, pinned=pinned, hedge=hedge, timeout=self.timeout)
+            except CircuitOpenError:
+                raise
+            except Exception as e:
+                if not retryable or not self.retry_policy.should_retry(attempt, e):
+                    raise
+                delay = self.retry_policy.backoff(attempt)
+                attempt += 1
+                self.retries += 1
+                logger.debug(f"RPC请求失败，{delay * 1000:.0f} ms 后第{attempt}次重试: {e}")
+                await asyncio.sleep(delay)
+
+    def _build_request(self, method: str, params: Sequence[Any]) -> Dict[str, Any]:
+        return {"jsonrpc": "2.0", "id": next(self._ids), "method": method, "params": list(params)}
+
+    @staticmethod
+    def _parse_response(method: str, response: Optional[Dict[str, Any]]) -> Union[Any, RpcError]:
+        """解析单个响应对象"""
+        if response is None:
+            return RpcError(-32603, "批量响应中缺少该请求的结果", method)
+        error = response.get("error")
+        if error:
+            return RpcError(error.get("code", -32603), error.get("message", str(error)), method, error.get("data"))
+        return response.get("result")
+
+    async def request(self, method: str, params: Optional[Sequence[Any]] = None) -> Any:
+        """发送单个JSON-RPC请求"""
+        payload = self._build_request(method, params or [])
+        response = await self._post(payload, pinned=method in PINNED_METHODS,
+                                    retryable=method in RETRYABLE_METHODS, hedge=method in HEDGED_METHODS)
+        return unwrap(self._parse_response(method, response))
+
+    async def batch(self, calls: Sequence[RpcCall]) -> List[Union[Any, RpcError]]:
+        """发送批量请求，按调用顺序返回结果，失败的调用以RpcError实例占位"""
+        if not calls:
+            return []
+        if len(calls) == 1:
+            method, params = calls[0]
+            try:
+                return [await self.request(method, params)]
+            except RpcError as e:
+                return [e]
+
+        chunks = [
+            calls[start:start + self.max_batch_size]
+            for start in range(0, len(calls), self.max_batch_size)
+        ]
+        chunk_results = await asyncio.gather(*(self._send_batch(chunk) for chunk in chunks))
+        return [result for chunk_result in chunk_results for result in chunk_result]
+
+    async def _send_batch(self, calls: Sequence[RpcCall]) -> List[Union[Any, RpcError]]:
+        """发送一个不超过批大小上限的批次并按id分发响应"""
+        requests = [self._build_request(method, params) for method, params in calls]
+        response = await self._post(
+            requests,
+            pinned=any(method in PINNED_METHODS for method, _ in calls),
+            retryable=all(method in RETRYABLE_METHODS for method, _ in calls)
+        )
+
+        if not isinstance(response, list):
+            # 节点拒绝了整个批次（如不支持批量请求或超过批大小上限）
+            error = response.get("error", {}) if isinstance(response, dict) else {}
+            logger.warning(f"批量请求被拒绝: {error or response}")
+            return [
+                RpcError(error.get("code", -32603), error.get("message", "批量请求被拒绝"), method)
+                for method, _ in calls
+            ]
+
+        responses_by_id = {item.get("id"): item for item in response if isinstance(item, dict)}
+        return [
+            self._parse_response(request["method"], responses_by_id.get(request["id"]))
+            for request in requests
+        ]
+
+    def routing_stats(self) -> Dict[str, Any]:
+        """各节点的路由、延迟、限流、熔断和连接复用统计，以及重试次数"""
+        stats = self.router.stats()
+        stats["retries"] = self.retries
+        return stats
@@ -0,0 +1,332 @@
+"""
+多RPC节点路由
+
+同一网络可以配置多个RPC节点：
+- 读请求发往最近延迟EWMA最低的节点
+- 调用方标记为可对冲的轻量读请求，主节点超过这类请求的延迟分位数仍未响应时，
+  向次优节点发送对冲请求，取先返回的结果；批量请求和重量级调用只在失败时切换节点
+- 写请求（广播交易、读取nonce）固定发往同一个节点，保证交易池视图一致
+- 每个节点的请求先经过该节点的自适应限流器排队，被限流的请求重新排队后重发
+- 连续失败的节点熔断，熔断期间不再向其发送请求，到期后由一个探测请求判断是否恢复
+每个节点的延迟、错误、对冲、限流和熔断统计可供调优
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Any, Deque, Dict, List, Optional, Sequence
+
+from .circuit_breaker import CircuitBreakerRegistry, CircuitOpenError, circuit_breakers
+from .config import RpcRoutingConfig, config
+from .rate_limiter import (
+    RateLimitedError, RateLimiterRegistry, is_rate_limit_error, rate_limited_calls, rate_limiters,
+    retry_after_seconds
+)
+
+if TYPE_CHECKING:
+    from .http_pool import HttpSessionPool
+
+logger = logging.getLogger(__name__)
+
+class EndpointStats:
+    """单个RPC节点的延迟与错误统计"""
+
+    def __init__(self, url: str, window: int):
+        self.url = url
+        self.ewma: Optional[float] = None
+        self.latencies: Deque[float] = deque(maxlen=window)
+        # 可对冲请求单独统计延迟，对冲延迟只按这类轻量请求计算，不被重量级调用拉高
+        self.hedge_ewma: Optional[float] = None
+        self.hedge_latencies: Deque[float] = deque(maxlen=window)
+        self.requests = 0
+        self.errors = 0
+        self.consecutive_errors = 0
+        self.last_error_at = 0.0
+        # 作为主节点被选中的次数
+        self.selected = 0
+        # 作为对冲节点收到的请求数和其中先于主节点返回的次数
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def record_latency(self, latency: float, alpha: float, hedgeable: bool = False) -> None:
+        self.latencies.append(latency)
+        self.ewma = latency if self.ewma is None else alpha * latency + (1 - alpha) * self.ewma
+        if hedgeable:
+            self.hedge_latencies.append(latency)
+            self.hedge_ewma = (
+                latency if self.hedge_ewma is None else alpha * latency + (1 - alpha) * self.hedge_ewma
+            )
+
+    def record_success(self, latency: float, alpha: float, hedgeable: bool = False) -> None:
+        self.record_latency(latency, alpha, hedgeable)
+        self.consecutive_errors = 0
+
+    def record_error(self) -> None:
+        self.errors += 1
+        self.consecutive_errors += 1
+        self.last_error_at = time.monotonic()
+
+    def is_degraded(self, cooldown: float) -> bool:
+        """最近出错且仍在降级期内"""
+        return self.consecutive_errors > 0 and time.monotonic() - self.last_error_at < cooldown
+
+    def percentile(self, percentile: float, hedgeable: bool = False) -> Optional[float]:
+        samples = self.hedge_latencies if hedgeable else self.latencies
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(len(ordered) * percentile / 100))
+        return ordered[index]
+
+    def to_dict(self) -> Dict[str, Any]:
+        def ms(value: Optional[float]) -> Optional[float]:
+            return round(value * 1000, 1) if value is not None else None
+
+        return {
+            "url": self.url,
+            "ewma_ms": ms(self.ewma),
+            "p50_ms": ms(self.percentile(50)),
+            "p95_ms": ms(self.percentile(95)),
+            "requests": self.requests,
+            "errors": self.errors,
+            "consecutive_errors": self.consecutive_errors,
+            "selected": self.selected,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins
+        }
+
+class RpcRouter:
+    """按延迟在多个RPC节点间路由请求"""
+
+    def __init__(self, urls: Sequence[str], settings: Optional[RpcRoutingConfig] = None,
+                 pool: Optional["HttpSessionPool"] = None, limiters: Optional[RateLimiterRegistry] = None,
+                 breakers: Optional[CircuitBreakerRegistry] = None):
+        if not urls:
+            raise ValueError("至少需要一个RPC节点")
+        self.settings = settings or config.rpc_routing
+        self.endpoints = [EndpointStats(url, self.settings.latency_window) for url in urls]
+        # 限流器按节点URL全局共享，指向同一节点的所有链接口共用一个速率
+        self.limiters = limiters or rate_limiters
+        # 熔断器同样按节点URL全局共享
+        self.breakers = breakers or circuit_breakers
+        # 写请求固定发往的节点，出错时才切换到下一个
+        self._pinned = 0
+        self._pool = pool
+        self.hedged_requests = 0
+        self.failovers = 0
+
+    @property
+    def pool(self) -> "HttpSessionPool":
+        """所用的HTTP连接池，默认使用按主机共享的全局连接池"""
+        if self._pool is None:
+            from .http_pool import http_pool
+            self._pool = http_pool
+        return self._pool
+
+    @property
+    def pinned_endpoint(self) -> EndpointStats:
+        return self.endpoints[self._pinned]
+
+    def ranked(self) -> List[EndpointStats]:
+        """按健康状态和延迟EWMA排序，没有样本的节点优先探测"""
+        cooldown = self.settings.error_cooldown
+        return sorted(
+            self.endpoints,
+            key=lambda endpoint: (endpoint.is_degraded(cooldown), endpoint.ewma or 0.0)
+        )
+
+    def available(self) -> List[EndpointStats]:
+        """未熔断的节点（按ranked排序），全部熔断时抛出最早恢复探测的节点的CircuitOpenError"""
+        ranked = self.ranked()
+        available = [endpoint for endpoint in ranked if self.breakers.get(endpoint.url).available()]
+        if not available:
+            breaker = min((self.breakers.get(endpoint.url) for endpoint in ranked), key=lambda b: b.retry_in())
+            breaker.rejected += 1
+            raise CircuitOpenError(breaker.url, breaker.retry_in())
+        return available
+
+    def hedge_delay(self, endpoint: EndpointStats) -> float:
+        """主节点的对冲等待时间：其最近可对冲请求延迟的分位数，限制在上下限之间
+
+        样本太少时分位数不可靠，改用这类请求延迟EWMA的3倍
+        """
+        settings = self.settings
+        if endpoint.hedge_ewma is None:
+            return settings.hedge_max_delay
+        if len(endpoint.hedge_latencies) < 10:
+            delay = endpoint.hedge_ewma * 3
+        else:
+            delay = endpoint.percentile(settings.hedge_percentile, hedgeable=True)
+        return min(max(delay, settings.hedge_min_delay), settings.hedge_max_delay)
+
+    async def _send(self, endpoint: EndpointStats, payload: Any, timeout: Optional[float],
+                    hedgeable: bool = False) -> Any:
+        """经节点的熔断器检查后发送，按结果更新熔断状态"""
+        breaker = self.breakers.get(endpoint.url)
+        breaker.before_request()
+        try:
+            result = await self._send_limited(endpoint, payload, timeout, hedgeable)
+        except (asyncio.CancelledError, RateLimitedError):
+            # 被取消或被限流不能说明节点是否可用
+            breaker.release()
+            raise
+        except Exception:
+            breaker.record_failure()
+            raise
+        breaker.record_success()
+        return result
+
+    async def _send_limited(self, endpoint: EndpointStats, payload: Any, timeout: Optional[float],
+                            hedgeable: bool = False) -> Any:
+        """经节点的限流器排队后发送，被限流时（HTTP 429或整个响应都是限流错误）重新排队重发
+
+        被限流的请求没有被节点处理，写请求重发同样安全
+        """
+        limiter = self.limiters.get(endpoint.url)
+        retries = 0
+        while True:
+            await limiter.acquire()
+            endpoint.requests += 1
+            start = time.monotonic()
+            try:
+                result = await self.pool.post_json(endpoint.url, payload, timeout=timeout)
+            except asyncio.CancelledError:
+                # 对冲中落败被取消：已等待的时间是该节点延迟的下界，同样计入EWMA
+                endpoint.record_latency(time.monotonic() - start, self.settings.ewma_alpha, hedgeable)
+                raise
+            except Exception as e:
+                if not is_rate_limit_error(e):
+                    endpoint.record_error()
+                    raise
+                limiter.on_rate_limited(start, retry_after_seconds(e))
+                error_message = str(e)
+            else:
+                limited, total = rate_limited_calls(result)
+                if limited < total:
+                    # 批量请求中部分调用被限流：降低速率，被限流的调用以错误返回给调用方
+                    if limited:
+                        limiter.on_rate_limited(start)
+                    else:
+                        limiter.on_success()
+                    endpoint.record_success(time.monotonic() - start, self.settings.ewma_alpha, hedgeable)
+                    return result
+                limiter.on_rate_limited(start)
+                error_message = "响应中的全部调用被限流"
+
+            if retries >= limiter.settings.max_retries:
+                endpoint.record_error()
+                raise RateLimitedError(endpoint.url, error_message, retries)
+            retries += 1
+            logger.debug(f"RPC节点 {endpoint.url} 限流，第{retries}次重新排队: {error_message}")
+
+    async def post(self, payload: Any, pinned: bool = False, hedge: bool = False,
+                   timeout: Optional[float] = None) -> Any:
+        """发送请求：写请求发往固定节点，读请求按延迟路由
+
+        hedge为True表示这是可以安全重复发送的轻量读请求，主节点响应慢时向次优节点发送对冲请求；
+        批量请求和重量级调用（如aggregate3、eth_estimateGas）不应对冲，重复发送会成倍增加备用节点的负载
+        """
+        if pinned:
+            return await self._post_pinned(payload, timeout)
+
+        ranked = self.available()
+        primary = ranked[0]
+        primary.selected += 1
+        if len(ranked) == 1:
+            return await self._send(primary, payload, timeout, hedge)
+
+        if hedge and self.settings.hedge_percentile > 0:
+            try:
+                return await self._post_hedged(primary, ranked[1], payload, timeout)
+            except Exception as e:
+                remaining = ranked[2:]
+                if not remaining:
+                    raise
+                last_error = e
+        else:
+            try:
+                return await self._send(primary, payload, timeout)
+            except Exception as e:
+                remaining = ranked[1:]
+                last_error = e
+
+        # 前面的节点都失败，依次尝试剩余节点
+        for endpoint in remaining:
+            if not self.breakers.get(endpoint.url).available():
+                continue
+            self.failovers += 1
+            logger.warning(f"RPC节点请求失败，切换到 {endpoint.url}: {last_error}")
+            try:
+                return await self._send(endpoint, payload, timeout)
+            except Exception as e:
+                last_error = e
+        raise last_error
+
+    async def _post_hedged(self, primary: EndpointStats, secondary: EndpointStats,
+                           payload: Any, timeout: Optional[float]) -> Any:
+        """先发往主节点，超过对冲延迟仍未成功时再发往次优节点，取先成功的结果"""
+        delay = self.hedge_delay(primary)
+        primary_task = asyncio.ensure_future(self._send(primary, payload, timeout, hedgeable=True))
+        tasks = {primary_task}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if primary_task in done and primary_task.exception() is None:
+                return primary_task.result()
+
+            if primary_task in done:
+                self.failovers += 1
+                tasks.discard(primary_task)
+                logger.warning(f"RPC节点 {primary.url} 请求失败，切换到 {secondary.url}")
+            else:
+                self.hedged_requests += 1
+                secondary.hedges += 1
+                logger.debug(f"RPC节点 {primary.url} 超过 {delay * 1000:.0f} ms 未响应，向 {secondary.url} 发送对冲请求")
+            hedge_task = asyncio.ensure_future(self._send(secondary, payload, timeout, hedgeable=True))
+            tasks.add(hedge_task)
+
+            errors = [primary_task.exception()] if primary_task.done() else []
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge_task and not primary_task.done():
+                            secondary.hedge_wins += 1
+                        return task.result()
+                    errors.append(task.exception())
+            raise errors[-1]
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _post_pinned(self, payload: Any, timeout: Optional[float]) -> Any:
+        """写请求发往固定节点，传输失败时不自动重发，后续写请求切换到下一个节点"""
+        if not self.breakers.get(self.pinned_endpoint.url).available():
+            # 固定节点已熔断，改用下一个未熔断的节点
+            available = self.available()
+            previous = self.pinned_endpoint.url
+            self._pinned = self.endpoints.index(available[0])
+            logger.warning(f"写请求节点 {previous} 已熔断，改用 {self.pinned_endpoint.url}")
+        endpoint = self.pinned_endpoint
+        try:
+            return await self._send(endpoint, payload, timeout)
+        except Exception:
+            if len(self.endpoints) > 1:
+                self._pinned = (self._pinned + 1) % len(self.endpoints)
+                logger.warning(f"写请求节点 {endpoint.url} 失败，后续写请求改用 {self.pinned_endpoint.url}")
+            raise
+
+    def stats(self) -> Dict[str, Any]:
+        """路由统计，包括每个节点的延迟、错误、对冲、限流、熔断和连接复用情况"""
+        endpoints = []
+        for endpoint in self.ranked():
+            item = endpoint.to_dict()
+            item["rate_limit"] = self.limiters.get(endpoint.url).stats()
+            item["circuit"] = self.breakers.get(endpoint.url).stats()
+            item["connections"] = self.pool.stats(endpoint.url)
+            endpoints.append(item)
+        return {
+            "endpoints": endpoints,
+            "pinned_endpoint": self.pinned_endpoint.url,
+            "hedged_requests": self.hedged_requests,
+            "failovers": self.failovers
+        }
@@ -0,0 +1,119 @@
+"""
+工具结果序列化
+
+将工具返回的dict序列化为紧凑JSON（安装了orjson时使用orjson，否则使用标准库json）：
+- Decimal按定点十进制字符串输出，不经过float，不出现科学计数法
+- 超出JavaScript安全整数范围（±(2^53-1)）的整数输出为字符串，避免下游解析时丢失精度
+- bytes（如HexBytes）输出为0x前缀的十六进制字符串，非有限浮点数输出为null
+可选的紧凑格式将结果中的记录列表（如批量转账的逐笔结果）转换为columns + rows的表格，
+省去每条记录重复的键名
+"""
+import json
+import math
+from collections.abc import Mapping
+from decimal import Decimal
+from typing import Any, Dict, List
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# JavaScript Number能精确表示的最大整数
+MAX_SAFE_INTEGER = 2 ** 53 - 1
+
+def _default(obj: Any) -> Any:
+    """JSON原生不支持的类型"""
+    if isinstance(obj, Decimal):
+        return format(obj, "f") if obj.is_finite() else None
+    if isinstance(obj, (bytes, bytearray)):
+        return "0x" + bytes(obj).hex()
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    if isinstance(obj, (tuple, set, frozenset)):
+        return list(obj)
+    return str(obj)
+
+# 无需转换的类型
+_PLAIN_TYPES = frozenset({str, bool, type(None)})
+
+def normalize(obj: Any) -> Any:
+    """递归转换为只包含JSON原生类型的结构，大整数转换为字符串"""
+    cls = type(obj)
+    if cls in _PLAIN_TYPES:
+        return obj
+    if cls is int:
+        return obj if -MAX_SAFE_INTEGER <= obj <= MAX_SAFE_INTEGER else str(obj)
+    if cls is list:
+        # 逐项内联处理最常见的字符串和整数，避免大列表上的函数调用开销
+        return [
+            value if type(value) in _PLAIN_TYPES
+            else (value if -MAX_SAFE_INTEGER <= value <= MAX_SAFE_INTEGER else str(value)) if type(value) is int
+            else normalize(value)
+            for value in obj
+        ]
+    if cls is dict:
+        return {key if type(key) is str else str(key): normalize(value) for key, value in obj.items()}
+    if isinstance(obj, int):
+        return obj if -MAX_SAFE_INTEGER <= obj <= MAX_SAFE_INTEGER else str(obj)
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, Mapping):
+        return normalize(dict(obj))
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return [normalize(value) for value in obj]
+    return normalize(_default(obj))
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_STRICT_INTEGER | orjson.OPT_NON_STR_KEYS
+
+def dumps(obj: Any) -> str:
+    """序列化为紧凑JSON字符串（UTF-8，不转义中文）"""
+    if orjson is not None:
+        try:
+            # 大多数结果不含大整数，直接序列化；OPT_STRICT_INTEGER遇到超出安全范围的整数时报错，
+            # 此时先转换为字符串再序列化
+            return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS).decode()
+        except TypeError:
+            return orjson.dumps(normalize(obj), option=_ORJSON_OPTIONS).decode()
+    return json.dumps(normalize(obj), ensure_ascii=False, separators=(",", ":"))
+
+def _columns(records: List[Mapping]) -> List[str]:
+    columns: Dict[str, None] = {}
+    for record in records:
+        for key in record:
+            columns.setdefault(key, None)
+    return list(columns)
+
+_SCALAR_TYPES = frozenset({str, int, float, bool, type(None)})
+
+def _is_record(value: Any) -> bool:
+    return type(value) is dict or isinstance(value, Mapping)
+
+def compact(obj: Any) -> Any:
+    """紧凑格式：记录列表（至少两条、全部为dict）转换为 {"columns": [...], "rows": [[...], ...]}"""
+    cls = type(obj)
+    if cls in _SCALAR_TYPES:
+        return obj
+    if cls is dict or (cls is not list and cls is not tuple and isinstance(obj, Mapping)):
+        return {key: compact(value) for key, value in obj.items()}
+    if cls is list or cls is tuple:
+        item_types = set(map(type, obj))
+        if item_types <= _SCALAR_TYPES:
+            return obj
+        if len(obj) >= 2 and not item_types & _SCALAR_TYPES and all(_is_record(item) for item in obj):
+            columns = _columns(obj)
+            return {
+                "columns": columns,
+                "rows": [
+                    [value if type(value) in _SCALAR_TYPES else compact(value)
+                     for value in map(item.get, columns)]
+                    for item in obj
+                ]
+            }
+        return [compact(value) for value in obj]
+    return obj
+
+def serialize_result(result: Any, compact_schema: bool = False) -> str:
+    """序列化工具结果，compact_schema为True时先转换为紧凑格式"""
+    return dumps(compact(result) if compact_schema else result)
@@ -10,17 +10,22 @@
 """
 
 import asyncio
+import importlib
 import logging
-from typing import Optional, Union, Dict, Any, List
+from typing import TYPE_CHECKING, Optional, Union, Dict, Any, List, Tuple
 from decimal import Decimal
 
 from mcp.server import Server
 from mcp.types import Tool, TextContent, Prompt
 import mcp.server.stdio
 
-from .blockchain import BlockchainInterface
-from .wallet import WalletSigner, MetaMaskConnector
 from .config import config
+from .serialization import serialize_result
+
+# web3/eth_account及各链SDK导入耗时较长，在首次使用时才加载，缩短服务启动时间
+if TYPE_CHECKING:
+    from .blockchain import BlockchainInterface
+    from .wallet import WalletSigner
 
 # 配置日志 - 使用stderr避免干扰stdio通信
 import sys
@@ -34,27 +39,34 @@ logger = logging.getLogger(__name__)
 # 创建MCP服务器
 server = Server("blockchain-payment")
 
-# 全局区块链接口实例
-blockchain: Optional[BlockchainInterface] = None
+# 按网络缓存的区块链接口实例池，每个网络一个实例
+blockchain_pool: Dict[str, "BlockchainInterface"] = {}
 
 # 用户钱包管理器
 class WalletManager:
     """钱包管理器 - 管理多个用户钱包"""
     
     def __init__(self):
-        self.wallets: Dict[str, WalletSigner] = {}  # 标签 -> 钱包实例
+        self.wallets: Dict[str, "WalletSigner"] = {}  # 标签 -> 钱包实例
         self.current_wallet_label: Optional[str] = None
     
     def add_wallet(self, label: str, private_key: str) -> bool:
         """添加钱包"""
-        if WalletSigner.validate_private_key(private_key):
-            self.wallets[label] = WalletSigner(private_key)
-            # 如果这是第一个钱包，设置为当前钱包
-            if self.current_wallet_label is None:
-                self.current_wallet_label = label
+        from .wallet import get_signer
+        
+        wallet = get_signer(private_key)
+        if wallet.has_private_key():
+            self.add_signer(label, wallet)
             return True
         return False
     
+    def add_signer(self, label: str, wallet: "WalletSigner") -> None:
+        """添加已派生好的签名器"""
+        self.wallets[label] = wallet
+        # 如果这是第一个钱包，设置为当前钱包
+        if self.current_wallet_label is None:
+            self.current_wallet_label = label
+    
     def set_current_wallet(self, label: str) -> bool:
         """设置当前使用的钱包"""
         if label in self.wallets:
@@ -62,13 +74,13 @@ class WalletManager:
             return True
         return False
     
-    def get_current_wallet(self) -> Optional[WalletSigner]:
+    def get_current_wallet(self) -> Optional["WalletSigner"]:
         """获取当前钱包"""
         if self.current_wallet_label and self.current_wallet_label in self.wallets:
             return self.wallets[self.current_wallet_label]
         return None
     
-    def get_wallet(self, label: str) -> Optional[WalletSigner]:
+    def get_wallet(self, label: str) -> Optional["WalletSigner"]:
         """根据标签获取钱包"""
         return self.wallets.get(label)
     
@@ -96,25 +108,32 @@ class WalletManager:
 # 全局钱包管理器实例
 wallet_manager = WalletManager()
 
-def get_blockchain(network_id: Optional[str] = None) -> BlockchainInterface:
-    """获取区块链接口实例"""
-    global blockchain
-    current_network = network_id or config.default_network
+def get_blockchain(network_id: Optional[str] = None) -> "BlockchainInterface":
+    """获取区块链接口实例
     
-    # 确保网络ID有效
-    if current_network not in config.get_supported_networks():
-        raise ValueError(f"不支持的网络: {current_network}")
+    每个网络的实例创建后一直复用，切换网络不会重建；
+    本函数中没有await，在事件循环中执行时不会被并发的工具调用打断
+    """
+    current_network = network_id or config.default_network
     
-    if blockchain is None or blockchain.network_config.name != config.get_network(current_network).name:
-        blockchain = BlockchainInterface(current_network)
+    bc = blockchain_pool.get(current_network)
+    if bc is None:
+        from .blockchain import BlockchainInterface
+        
+        # 确保网络ID有效
+        if current_network not in config.get_supported_networks():
+            raise ValueError(f"不支持的网络: {current_network}")
+        bc = blockchain_pool.setdefault(current_network, BlockchainInterface(current_network))
     
-    return blockchain
+    return bc
 
-def get_wallet(private_key: Optional[str] = None) -> WalletSigner:
+def get_wallet(private_key: Optional[str] = None) -> "WalletSigner":
     """获取钱包实例"""
+    from .wallet import WalletSigner, get_signer
+    
     # 如果提供了私钥，使用提供的私钥
     if private_key:
-        return WalletSigner(private_key)
+        return get_signer(private_key)
     
     # 如果有当前用户钱包，返回它
     current_wallet = wallet_manager.get_current_wallet()
@@ -123,7 +142,7 @@ def get_wallet(private_key: Optional[str] = None) -> WalletSigner:
     
     # 如果配置中有私钥，使用配置的私钥
     if config.private_key:
-        return WalletSigner(config.private_key)
+        return get_signer(config.private_key)
     
     # 如果都没有，返回一个没有私钥的钱包实例
     return WalletSigner()
@@ -134,6 +153,12 @@ async def list_tools() -> list[Tool]:
     # 获取支持的网络和代币列表
     supported_networks = config.get_supported_networks()
     supported_tokens = config.get_supported_tokens() + ["ETH"]
+    # 批量工具的紧凑输出选项
+    compact_property = {
+        "type": "boolean",
+        "description": "为true时结果中的记录列表以columns + rows表格返回，省去重复的键名",
+        "default": False
+    }
     
     return [
         Tool(
@@ -161,6 +186,60 @@ async def list_tools() -> list[Tool]:
                 "required": ["address"]
             }
         ),
+        Tool(
+            name="get_balances",
+            description="批量查询多个地址的余额（原生代币和代币），返回地址×代币的矩阵",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "addresses": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "要查询的钱包地址列表"
+                    },
+                    "token_symbols": {
+                        "type": "array",
+                        "items": {"type": "string", "enum": supported_tokens},
+                        "description": "要查询的代币符号列表(可选)，默认查询该网络上的全部代币"
+                    },
+                    "network": {
+                        "type": "string",
+                        "description": "网络名称(可选)",
+                        "enum": supported_networks,
+                        "default": config.default_network
+                    },
+                    "raw": {
+                        "type": "boolean",
+                        "description": "为true时返回最小单位（wei）的整数余额",
+                        "default": False
+                    }
+                },
+                "required": ["addresses"]
+            }
+        ),
+        Tool(
+            name="get_portfolio",
+            description="同时查询一个地址在所有网络上的余额，每条链有各自的截止时间，超时的链返回上次的结果并标记为stale",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "address": {
+                        "type": "string",
+                        "description": "要查询的地址"
+                    },
+                    "networks": {
+                        "type": "array",
+                        "items": {"type": "string", "enum": supported_networks},
+                        "description": "要查询的网络列表(可选)，默认为与地址格式匹配的全部网络"
+                    },
+                    "timeout": {
+                        "type": "number",
+                        "description": f"每条链的截止时间（秒，可选），默认{config.portfolio_timeout}"
+                    }
+                },
+                "required": ["address"]
+            }
+        ),
         Tool(
             name="send_transaction", 
             description="发送代币转账交易",
@@ -199,6 +278,70 @@ async def list_tools() -> list[Tool]:
                 "required": ["to_address", "amount"]
             }
         ),
+        Tool(
+            name="send_batch",
+            description="批量转账：预先校验全部金额，连续分配nonce并签名后流水线广播，统一等待确认",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "payments": {
+                        "type": "array",
+                        "description": "转账列表，任何一笔校验失败时不发送任何交易",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "to_address": {
+                                    "type": "string",
+                                    "description": "接收方地址"
+                                },
+                                "amount": {
+                                    "type": "string",
+                                    "description": "转账金额（以代币单位为准）"
+                                },
+                                "token_symbol": {
+                                    "type": "string",
+                                    "description": "代币符号，默认为网络原生代币",
+                                    "enum": supported_tokens
+                                }
+                            },
+                            "required": ["to_address", "amount"]
+                        }
+                    },
+                    "network": {
+                        "type": "string",
+                        "description": "网络名称(可选)",
+                        "enum": supported_networks,
+                        "default": config.default_network
+                    },
+                    "from_wallet_label": {
+                        "type": "string",
+                        "description": "发送方钱包标签(可选)，如未提供则使用当前钱包"
+                    },
+                    "private_key": {
+                        "type": "string",
+                        "description": "发送方私钥(可选，如未提供则使用当前钱包或环境变量中的私钥)"
+                    },
+                    "wait_for_receipts": {
+                        "type": "boolean",
+                        "description": "是否等待全部交易确认，为false时广播后立即返回",
+                        "default": True
+                    },
+                    "timeout": {
+                        "type": "number",
+                        "description": "等待确认的超时时间（秒）",
+                        "default": 120
+                    },
+                    "mode": {
+                        "type": "string",
+                        "description": "pipeline: 每笔一个交易，流水线广播；contract: 通过Disperse合约把同一代币的转账合并为一笔交易（EVM链）",
+                        "enum": ["pipeline", "contract"],
+                        "default": "pipeline"
+                    },
+                    "compact": compact_property
+                },
+                "required": ["payments"]
+            }
+        ),
         Tool(
             name="get_transaction_status",
             description="查询交易状态和详情",
@@ -219,6 +362,28 @@ async def list_tools() -> list[Tool]:
                 "required": ["tx_hash"]
             }
         ),
+        Tool(
+            name="get_transaction_statuses",
+            description="批量查询同一网络上多笔交易的状态，返回紧凑的状态表",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "tx_hashes": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "交易哈希列表（Solana为交易签名），可包含数百个"
+                    },
+                    "network": {
+                        "type": "string",
+                        "description": "网络名称(可选)",
+                        "enum": supported_networks,
+                        "default": config.default_network
+                    },
+                    "compact": compact_property
+                },
+                "required": ["tx_hashes"]
+            }
+        ),
         Tool(
             name="estimate_gas_fees",
             description="估算Gas费用",
@@ -287,6 +452,11 @@ async def list_tools() -> list[Tool]:
                     "random_string": {
                         "type": "string",
                         "description": "随机字符串，用于无参数工具调用"
+                    },
+                    "network": {
+                        "type": "string",
+                        "description": "网络名称(可选)，指定后只返回该网络上部署的代币",
+                        "enum": supported_networks
                     }
                 },
                 "required": ["random_string"]
@@ -374,10 +544,18 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
     try:
         if name == "get_balance":
             result = await handle_get_balance(arguments)
+        elif name == "get_balances":
+            result = await handle_get_balances(arguments)
+        elif name == "get_portfolio":
+            result = await handle_get_portfolio(arguments)
         elif name == "send_transaction":
             result = await handle_send_transaction(arguments)
+        elif name == "send_batch":
+            result = await handle_send_batch(arguments)
         elif name == "get_transaction_status":
             result = await handle_get_transaction_status(arguments)
+        elif name == "get_transaction_statuses":
+            result = await handle_get_transaction_statuses(arguments)
         elif name == "estimate_gas_fees":
             result = await handle_estimate_gas_fees(arguments)
         elif name == "create_wallet":
@@ -399,12 +577,13 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
         else:
             result = {"error": f"未知工具: {name}"}
         
-        return [TextContent(type="text", text=str(result))]
+        # 结果序列化为JSON，compact为true时记录列表转换为columns + rows表格
+        return [TextContent(type="text", text=serialize_result(result, bool(arguments.get("compact"))))]
         
     except Exception as e:
         logger.error(f"工具调用失败 {name}: {e}")
         error_result = {"error": f"工具执行失败: {str(e)}"}
-        return [TextContent(type="text", text=str(error_result))]
+        return [TextContent(type="text", text=serialize_result(error_result))]
 
 async def handle_get_balance(args: dict) -> dict:
     """处理余额查询"""
@@ -416,25 +595,50 @@ async def handle_get_balance(args: dict) -> dict:
     result = await bc.get_balance(address, token_symbol)
     return result
 
-async def handle_send_transaction(args: dict) -> dict:
-    """处理发送交易"""
-    to_address = args["to_address"]
-    amount = args["amount"]
-    token_symbol = args.get("token_symbol", "ETH")
+async def handle_get_balances(args: dict) -> dict:
+    """处理批量余额查询"""
+    addresses = args["addresses"]
+    token_symbols = args.get("token_symbols")
     network = args.get("network", config.default_network)
+    raw = bool(args.get("raw", False))
+    
+    if not isinstance(addresses, list) or not addresses:
+        return {"error": "addresses必须是非空的地址列表"}
+    
+    bc = get_blockchain(network)
+    return await bc.get_balances(addresses, token_symbols, raw)
+
+async def handle_get_portfolio(args: dict) -> dict:
+    """处理跨链资产查询"""
+    address = args["address"]
+    networks = args.get("networks")
+    timeout = args.get("timeout")
+    
+    if networks is not None and (not isinstance(networks, list) or not networks):
+        return {"error": "networks必须是非空的网络列表"}
+    
+    from .portfolio import portfolio_service
+    return await portfolio_service.get_portfolio(
+        address, networks, float(timeout) if timeout is not None else None
+    )
+
+def resolve_sender_wallet(args: dict) -> Tuple[Optional["WalletSigner"], Optional[dict]]:
+    """根据工具参数确定发送方钱包，返回(钱包, 错误信息)"""
     private_key = args.get("private_key")
     from_wallet_label = args.get("from_wallet_label")
     
+    from .wallet import get_signer
+    
     # 获取钱包实例
     wallet = None
     if private_key:
-        # 使用直接提供的私钥
-        wallet = WalletSigner(private_key)
+        # 使用直接提供的私钥（同一私钥的签名器会被缓存）
+        wallet = get_signer(private_key)
     elif from_wallet_label:
         # 使用指定标签的钱包
         wallet = wallet_manager.get_wallet(from_wallet_label)
         if not wallet:
-            return {
+            return None, {
                 "error": f"未找到标签为 '{from_wallet_label}' 的钱包",
                 "suggestion": "请检查钱包标签或使用list_wallets查看可用钱包"
             }
@@ -444,7 +648,7 @@ async def handle_send_transaction(args: dict) -> dict:
     
     # 检查钱包是否有私钥
     if not wallet.has_private_key():
-        return {
+        return None, {
             "error": "未设置私钥，无法发送交易。",
             "instructions": [
                 "1. 使用set_user_wallet工具设置私钥",
@@ -453,11 +657,41 @@ async def handle_send_transaction(args: dict) -> dict:
                 "4. 使用list_wallets查看已添加的钱包并用switch_wallet切换"
             ]
         }
+    return wallet, None
+
+async def handle_send_transaction(args: dict) -> dict:
+    """处理发送交易"""
+    to_address = args["to_address"]
+    amount = args["amount"]
+    token_symbol = args.get("token_symbol", "ETH")
+    network = args.get("network", config.default_network)
+    
+    wallet, error = resolve_sender_wallet(args)
+    if error:
+        return error
     
     bc = get_blockchain(network)
     result = await bc.send_transaction(to_address, amount, token_symbol, wallet)
     return result
 
+async def handle_send_batch(args: dict) -> dict:
+    """处理批量转账"""
+    payments = args["payments"]
+    network = args.get("network", config.default_network)
+    wait_for_receipts = bool(args.get("wait_for_receipts", True))
+    timeout = float(args.get("timeout", 120))
+    mode = args.get("mode", "pipeline")
+    
+    if not isinstance(payments, list) or not payments:
+        return {"error": "payments必须是非空的转账列表"}
+    
+    wallet, error = resolve_sender_wallet(args)
+    if error:
+        return error
+    
+    bc = get_blockchain(network)
+    return await bc.send_batch(payments, wallet, wait_for_receipts, timeout, mode)
+
 async def handle_get_transaction_status(args: dict) -> dict:
     """处理交易状态查询"""
     tx_hash = args["tx_hash"]
@@ -467,6 +701,17 @@ async def handle_get_transaction_status(args: dict) -> dict:
     result = await bc.get_transaction_status(tx_hash)
     return result
 
+async def handle_get_transaction_statuses(args: dict) -> dict:
+    """处理批量交易状态查询"""
+    tx_hashes = args["tx_hashes"]
+    network = args.get("network", config.default_network)
+    
+    if not isinstance(tx_hashes, list) or not tx_hashes:
+        return {"error": "tx_hashes必须是非空的交易哈希列表"}
+    
+    bc = get_blockchain(network)
+    return await bc.get_transaction_statuses([str(tx_hash) for tx_hash in tx_hashes])
+
 async def handle_estimate_gas_fees(args: dict) -> dict:
     """处理Gas费用估算"""
     network = args.get("network", config.default_network)
@@ -485,6 +730,8 @@ async def handle_estimate_gas_fees(args: dict) -> dict:
 
 async def handle_create_wallet(args: dict) -> dict:
     """处理创建钱包"""
+    from .wallet import WalletSigner
+    
     label = args.get("label")
     wallet = WalletSigner()
     result = wallet.create_account()
@@ -508,13 +755,15 @@ async def handle_get_network_info(args: dict) -> dict:
     bc = get_blockchain(network)
     network_config = bc.network_config
     
+    # 最新区块和连接状态来自该网络的链头跟踪器
+    network_status = await bc.get_network_status()
+    
+    # 各RPC节点的延迟、路由和连接复用统计
     try:
-        latest_block = bc.w3.eth.block_number
-        is_connected = bc.w3.is_connected()
-    except Exception as e:
-        latest_block = None
-        is_connected = False
-        logger.warning(f"获取网络状态失败: {e}")
+        rpc = getattr(await bc.get_chain_interface(), "rpc", None)
+    except Exception:
+        rpc = None
+    rpc_endpoints = rpc.routing_stats() if rpc is not None else network_config.rpc_urls
     
     return {
         "network": network_config.name,
@@ -522,30 +771,46 @@ async def handle_get_network_info(args: dict) -> dict:
         "rpc_url": network_config.rpc_url,
         "native_token": network_config.native_token,
         "explorer_url": network_config.explorer_url,
-        "latest_block": latest_block,
-        "is_connected": is_connected,
-        "supported_tokens": config.get_supported_tokens()
+        **network_status,
+        "supported_tokens": config.get_supported_tokens(network_config.chain_id),
+        "rpc_endpoints": rpc_endpoints
     }
 
 async def handle_get_supported_tokens(args: dict) -> dict:
     """处理获取支持代币列表"""
+    network = args.get("network")
+    
+    if network:
+        network_config = config.get_network(network)
+        native_token = network_config.native_token
+        tokens = config.get_tokens_for_chain(network_config.chain_id)
+    else:
+        native_token = "ETH"
+        tokens = config.tokens
+    
     tokens_info = {}
-    for symbol, token_config in config.tokens.items():
+    for symbol, token_config in tokens.items():
         tokens_info[symbol] = {
             "symbol": token_config.symbol,
             "name": token_config.name,
             "address": token_config.address,
-            "decimals": token_config.decimals
+            "decimals": token_config.decimals,
+            "chain_id": token_config.chain_id
         }
     
-    return {
-        "native_token": "ETH", 
+    result = {
+        "native_token": native_token,
         "supported_tokens": tokens_info,
         "total_count": len(tokens_info)
     }
+    if network:
+        result["network"] = network
+    return result
 
 async def handle_validate_address(args: dict) -> dict:
     """处理地址验证"""
+    from .wallet import WalletSigner
+    
     address = args["address"]
     is_valid = WalletSigner.validate_address(address)
     
@@ -560,28 +825,25 @@ async def handle_set_user_wallet(args: dict) -> dict:
     private_key = args["private_key"]
     label = args.get("label", "default")
     
-    # 验证私钥格式
-    if not WalletSigner.validate_private_key(private_key):
+    from .wallet import get_signer
+    
+    # 私钥只派生一次：无效私钥得到没有账户的签名器
+    wallet = get_signer(private_key)
+    if not wallet.has_private_key():
         return {
             "success": False,
             "error": "无效的私钥格式"
         }
     
-    # 添加到钱包管理器
-    if wallet_manager.add_wallet(label, private_key):
-        wallet_manager.set_current_wallet(label)
-        
-        return {
-            "success": True,
-            "message": f"用户钱包设置成功，标签: {label}，地址: {wallet_manager.get_wallet(label).address}",
-            "label": label,
-            "address": wallet_manager.get_wallet(label).address
-        }
-    else:
-        return {
-            "success": False,
-            "error": "钱包设置失败"
-        }
+    wallet_manager.add_signer(label, wallet)
+    wallet_manager.set_current_wallet(label)
+    
+    return {
+        "success": True,
+        "message": f"用户钱包设置成功，标签: {label}，地址: {wallet.address}",
+        "label": label,
+        "address": wallet.address
+    }
 
 async def handle_list_wallets(args: dict) -> dict:
     """处理列出钱包"""
@@ -627,6 +889,17 @@ async def handle_remove_wallet(args: dict) -> dict:
             "error": f"未找到标签为 '{label}' 的钱包"
         }
 
+async def warm_up_networks(network_ids: List[str]) -> None:
+    """后台预热网络：在线程池中导入多链模块（web3及各链SDK），不阻塞事件循环上的握手"""
+    try:
+        loop = asyncio.get_running_loop()
+        multi_chain = await loop.run_in_executor(
+            None, importlib.import_module, "blockchain_payment_mcp.multi_chain"
+        )
+        await multi_chain.multi_chain_manager.warm_up(network_ids)
+    except Exception as e:
+        logger.warning(f"网络预热失败: {e}")
+
 async def main():
     """主函数"""
     # 设置更简洁的日志格式，避免干扰stdio通信
@@ -649,11 +922,24 @@ async def main():
     
     # 启动服务器
     async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
-        await server.run(
-            read_stream,
-            write_stream,
-            server.create_initialization_options()
-        )
+        # 可选的后台预热：模块导入和链接口构造都在后台任务中进行，不阻塞初始化响应，
+        # 预热完成前到达的请求会等待对应网络的初始化而不是重复创建
+        warm_up_task = None
+        if config.warmup_networks:
+            warm_up_task = asyncio.ensure_future(warm_up_networks(config.warmup_networks))
+        
+        try:
+            await server.run(
+                read_stream,
+                write_stream,
+                server.create_initialization_options()
+            )
+        finally:
+            if warm_up_task is not None:
+                warm_up_task.cancel()
+            # 关闭按主机共享的RPC连接池
+            from .http_pool import http_pool
+            await http_pool.close()
 
 def cli_main():
     """命令行入口点函数"""
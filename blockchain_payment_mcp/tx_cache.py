@@ -0,0 +1,69 @@
+"""
+已终结交易状态缓存
+
+交易所在区块已终结（在finalized区块内，节点不支持该标签时为超过确认深度）后，交易详情不会再改变，
+用有界、线程安全的LRU缓存永久保存，重复查询只需根据链头计算确认数
+"""
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+class TransactionStatusCache:
+    """已终结交易状态的LRU缓存"""
+
+    def __init__(self, maxsize: int = 10000):
+        self.maxsize = max(1, maxsize)
+        # (chain_id, 交易哈希) -> 不含确认数的交易状态
+        self._cache: "OrderedDict[Tuple[int, str], Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(chain_id: int, tx_hash: str) -> Tuple[int, str]:
+        tx_hash = tx_hash.lower()
+        return chain_id, tx_hash if tx_hash.startswith("0x") else "0x" + tx_hash
+
+    def get(self, chain_id: int, tx_hash: str) -> Optional[Dict[str, Any]]:
+        """返回缓存的交易状态副本，未缓存时返回None"""
+        key = self._key(chain_id, tx_hash)
+        with self._lock:
+            status = self._cache.get(key)
+            if status is None:
+                self.misses += 1
+                return None
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return dict(status)
+
+    def put(self, chain_id: int, tx_hash: str, status: Dict[str, Any]) -> None:
+        """缓存已终结的交易状态"""
+        key = self._key(chain_id, tx_hash)
+        with self._lock:
+            self._cache[key] = dict(status)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        """缓存命中统计"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._cache),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0
+            }
+
+    def clear(self) -> None:
+        """清空缓存和统计"""
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+# 全局交易状态缓存实例
+tx_status_cache = TransactionStatusCache(int(os.getenv("TX_STATUS_CACHE_SIZE", "10000")))
@@ -1,14 +1,20 @@
 """
 钱包和签名器模块
 """
+import hashlib
+import hmac
 import os
-from typing import Optional, Dict, Any
-from web3 import Web3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple
 from web3.types import TxParams, HexBytes
 from eth_account import Account
 from eth_account.signers.local import LocalAccount
 import logging
 
+from .address_cache import is_valid_address
+
 logger = logging.getLogger(__name__)
 
 class WalletSigner:
@@ -60,11 +66,8 @@ class WalletSigner:
     
     @staticmethod
     def validate_address(address: str) -> bool:
-        """验证以太坊地址格式"""
-        try:
-            return Web3.is_address(address)
-        except Exception:
-            return False
+        """验证以太坊地址格式（结果缓存在共享的地址LRU缓存中）"""
+        return is_valid_address(address)
     
     @staticmethod
     def validate_private_key(private_key: str) -> bool:
@@ -75,6 +78,91 @@ class WalletSigner:
         except Exception:
             return False
 
+class SignerCache:
+    """按私钥缓存已派生的签名器，避免重复发送时每次重新推导公钥
+
+    缓存键为私钥的HMAC-SHA256摘要（盐为进程启动时随机生成），不以明文私钥作为键；
+    条目自创建起ttl秒后过期，私钥不会在内存中被无限期保留
+    """
+
+    def __init__(self, ttl: float = 300.0, maxsize: int = 64):
+        self.ttl = ttl
+        self.maxsize = max(1, maxsize)
+        self._salt = os.urandom(32)
+        # 私钥摘要 -> (签名器, 过期时间)，按创建顺序排列，最早创建的最先过期
+        self._cache: "OrderedDict[bytes, Tuple[WalletSigner, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, private_key: str) -> bytes:
+        normalized = private_key.strip().lower()
+        if normalized.startswith("0x"):
+            normalized = normalized[2:]
+        return hmac.new(self._salt, normalized.encode(), hashlib.sha256).digest()
+
+    def _evict_expired(self, now: float) -> None:
+        while self._cache:
+            _, (_, expires_at) = next(iter(self._cache.items()))
+            if expires_at > now:
+                break
+            self._cache.popitem(last=False)
+
+    def get(self, private_key: str) -> WalletSigner:
+        """返回私钥对应的签名器，未缓存或已过期时重新派生"""
+        if self.ttl <= 0:
+            return WalletSigner(private_key)
+        key = self._key(private_key)
+        with self._lock:
+            now = time.monotonic()
+            self._evict_expired(now)
+            entry = self._cache.get(key)
+            if entry is not None:
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+        signer = WalletSigner(private_key)
+        # 无效私钥不缓存
+        if signer.has_private_key():
+            with self._lock:
+                self._cache[key] = (signer, time.monotonic() + self.ttl)
+                while len(self._cache) > self.maxsize:
+                    self._cache.popitem(last=False)
+        return signer
+
+    def stats(self) -> Dict[str, Any]:
+        """缓存命中统计"""
+        with self._lock:
+            self._evict_expired(time.monotonic())
+            total = self.hits + self.misses
+            return {
+                "size": len(self._cache),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0
+            }
+
+    def clear(self) -> None:
+        """清空缓存和统计"""
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+# 全局签名器缓存实例
+signer_cache = SignerCache(
+    float(os.getenv("WALLET_CACHE_TTL", "300")),
+    int(os.getenv("WALLET_CACHE_SIZE", "64"))
+)
+
+def get_signer(private_key: Optional[str]) -> WalletSigner:
+    """获取私钥对应的签名器（带缓存），私钥为空时返回没有私钥的签名器"""
+    if not private_key:
+        return WalletSigner()
+    return signer_cache.get(private_key)
+
 class MetaMaskConnector:
     """MetaMask连接器 - 用于浏览器环境的钱包交互"""
     
@@ -0,0 +1,52 @@
+"""
+测试公共夹具
+"""
+import json
+import shutil
+import socket
+import subprocess
+import time
+import urllib.request
+
+import pytest
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def _wait_for_rpc(url: str, process: subprocess.Popen, timeout: float = 15.0) -> None:
+    """等待节点开始响应JSON-RPC请求"""
+    payload = json.dumps({"jsonrpc": "2.0", "id": 1, "method": "eth_chainId", "params": []}).encode()
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"anvil启动失败，退出码 {process.returncode}")
+        request = urllib.request.Request(url, data=payload, headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(request, timeout=1) as response:
+                if json.loads(response.read()).get("result"):
+                    return
+        except OSError:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError(f"anvil在 {timeout} 秒内未响应")
+
+@pytest.fixture(scope="module")
+def anvil_url():
+    """启动本地anvil节点（自动出块），未安装anvil时跳过"""
+    binary = shutil.which("anvil")
+    if binary is None:
+        pytest.skip("未找到anvil，跳过需要本地节点的测试")
+    url = f"http://127.0.0.1:{_free_port()}"
+    process = subprocess.Popen(
+        [binary, "--port", url.rsplit(":", 1)[1], "--silent"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    try:
+        _wait_for_rpc(url, process)
+        yield url
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
@@ -0,0 +1,27 @@
+# pragma version ~=0.4.3
+"""
+disperse.app 的 Disperse 合约的 Vyper 移植，ABI与调用语义与原合约一致，只用于本地测试：
+- disperseEther 逐个转出附带的原生代币，剩余部分退还给调用方
+- disperseToken 先transferFrom总额，再逐个转出；任何一笔失败时整个交易回滚
+"""
+from ethereum.ercs import IERC20
+
+MAX_RECIPIENTS: constant(uint256) = 1024
+
+@external
+@payable
+def disperseEther(recipients: DynArray[address, MAX_RECIPIENTS], values: DynArray[uint256, MAX_RECIPIENTS]):
+    for i: uint256 in range(len(recipients), bound=MAX_RECIPIENTS):
+        send(recipients[i], values[i])
+    if self.balance > 0:
+        send(msg.sender, self.balance)
+
+@external
+def disperseToken(token: IERC20, recipients: DynArray[address, MAX_RECIPIENTS],
+                  values: DynArray[uint256, MAX_RECIPIENTS]):
+    total: uint256 = 0
+    for i: uint256 in range(len(recipients), bound=MAX_RECIPIENTS):
+        total += values[i]
+    assert extcall token.transferFrom(msg.sender, self, total)
+    for i: uint256 in range(len(recipients), bound=MAX_RECIPIENTS):
+        assert extcall token.transfer(recipients[i], values[i])
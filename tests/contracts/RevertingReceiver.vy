@@ -0,0 +1,9 @@
+# pragma version ~=0.4.3
+"""
+拒绝接收原生代币的合约，用于模拟合约批量转账中某个接收方回滚
+"""
+
+@external
+@payable
+def __default__():
+    raise "rejected"
@@ -0,0 +1,61 @@
+# pragma version ~=0.4.3
+"""
+测试用ERC20代币：任何人都可以mint，被blocked的地址不能接收转账（用于模拟批次中某个接收方失败）
+"""
+event Transfer:
+    sender: indexed(address)
+    receiver: indexed(address)
+    value: uint256
+
+event Approval:
+    owner: indexed(address)
+    spender: indexed(address)
+    value: uint256
+
+name: public(String[32])
+symbol: public(String[8])
+decimals: public(uint8)
+totalSupply: public(uint256)
+balanceOf: public(HashMap[address, uint256])
+allowance: public(HashMap[address, HashMap[address, uint256]])
+blocked: public(HashMap[address, bool])
+
+@deploy
+def __init__():
+    self.name = "Test Token"
+    self.symbol = "TST"
+    self.decimals = 18
+
+@internal
+def _transfer(sender: address, receiver: address, amount: uint256):
+    assert not self.blocked[receiver], "receiver blocked"
+    self.balanceOf[sender] -= amount
+    self.balanceOf[receiver] += amount
+    log Transfer(sender=sender, receiver=receiver, value=amount)
+
+@external
+def mint(receiver: address, amount: uint256):
+    self.totalSupply += amount
+    self.balanceOf[receiver] += amount
+    log Transfer(sender=empty(address), receiver=receiver, value=amount)
+
+@external
+def block(account: address):
+    self.blocked[account] = True
+
+@external
+def transfer(receiver: address, amount: uint256) -> bool:
+    self._transfer(msg.sender, receiver, amount)
+    return True
+
+@external
+def transferFrom(sender: address, receiver: address, amount: uint256) -> bool:
+    self.allowance[sender][msg.sender] -= amount
+    self._transfer(sender, receiver, amount)
+    return True
+
+@external
+def approve(spender: address, amount: uint256) -> bool:
+    self.allowance[msg.sender][spender] = amount
+    log Approval(owner=msg.sender, spender=spender, value=amount)
+    return True
@@ -0,0 +1,62 @@
+"""
+内存中的HTTP连接池替身
+
+替代HttpSessionPool，按URL记录每次发送的JSON-RPC请求，响应由测试提供的协程生成，
+用于在不启动节点的情况下测试路由、重试、限流和熔断
+"""
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import aiohttp
+from multidict import CIMultiDict, CIMultiDictProxy
+from yarl import URL
+
+from blockchain_payment_mcp.circuit_breaker import CircuitBreakerRegistry
+from blockchain_payment_mcp.config import CircuitBreakerConfig, RateLimitConfig, RetryConfig
+from blockchain_payment_mcp.rate_limiter import RateLimiterRegistry
+from blockchain_payment_mcp.retry import RetryPolicy
+from blockchain_payment_mcp.rpc import JsonRpcClient
+
+Handler = Callable[[str, Any], Awaitable[Any]]
+
+def result_for(payload: Any, result: Any = "0x1") -> Any:
+    """为单个或批量请求构造成功响应"""
+    if isinstance(payload, list):
+        return [{"jsonrpc": "2.0", "id": item["id"], "result": result} for item in payload]
+    return {"jsonrpc": "2.0", "id": payload["id"], "result": result}
+
+def http_error(url: str, status: int, headers: Optional[Dict[str, str]] = None) -> aiohttp.ClientResponseError:
+    """构造与aiohttp的raise_for_status相同的HTTP错误"""
+    request_info = aiohttp.RequestInfo(URL(url), "POST", CIMultiDictProxy(CIMultiDict()), URL(url))
+    return aiohttp.ClientResponseError(
+        request_info, (), status=status, message="HTTP error", headers=CIMultiDictProxy(CIMultiDict(headers or {}))
+    )
+
+class FakePool:
+    """记录请求并由handler生成响应的连接池"""
+
+    def __init__(self, handler: Handler):
+        self.handler = handler
+        self.calls: List[Tuple[str, Any]] = []
+
+    async def post_json(self, url: str, payload: Any, timeout: Optional[float] = None) -> Any:
+        self.calls.append((url, payload))
+        return await self.handler(url, payload)
+
+    def calls_to(self, url: str) -> int:
+        return sum(1 for call_url, _ in self.calls if call_url == url)
+
+    def stats(self, url: Optional[str] = None) -> Dict[str, Any]:
+        return {}
+
+def make_client(urls: List[str], handler: Handler, max_retries: int = 3,
+                rate_limit: Optional[RateLimitConfig] = None,
+                circuit_breaker: Optional[CircuitBreakerConfig] = None) -> Tuple[JsonRpcClient, FakePool]:
+    """构造使用FakePool的客户端，限流器和熔断器独立于全局注册表，重试不等待"""
+    pool = FakePool(handler)
+    client = JsonRpcClient(
+        urls, pool=pool,
+        retry_policy=RetryPolicy(RetryConfig(max_retries=max_retries, base_delay=0, max_delay=0))
+    )
+    client.router.limiters = RateLimiterRegistry(rate_limit or RateLimitConfig(rate=0))
+    client.router.breakers = CircuitBreakerRegistry(circuit_breaker or CircuitBreakerConfig(failure_threshold=0))
+    return client, pool
@@ -0,0 +1,127 @@
+"""
+RPC节点熔断器的状态转换：closed → open → half_open → closed/open，探测失败时等待时长翻倍
+"""
+import pytest
+
+from blockchain_payment_mcp import circuit_breaker as circuit_breaker_module
+from blockchain_payment_mcp.circuit_breaker import (
+    CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+)
+from blockchain_payment_mcp.config import CircuitBreakerConfig
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(circuit_breaker_module.time, "monotonic", clock)
+    return clock
+
+def make_breaker(failure_threshold: int = 3, reset_timeout: float = 10.0,
+                 max_reset_timeout: float = 40.0) -> CircuitBreaker:
+    return CircuitBreaker("http://node-a.test", CircuitBreakerConfig(
+        failure_threshold=failure_threshold,
+        reset_timeout=reset_timeout,
+        max_reset_timeout=max_reset_timeout
+    ))
+
+def fail(breaker: CircuitBreaker, times: int) -> None:
+    for _ in range(times):
+        breaker.before_request()
+        breaker.record_failure()
+
+def test_opens_after_consecutive_failures(clock):
+    breaker = make_breaker()
+
+    fail(breaker, 2)
+    assert breaker.state == CLOSED
+    fail(breaker, 1)
+
+    assert breaker.state == OPEN
+    assert not breaker.available()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+    assert breaker.rejected == 1
+
+def test_success_resets_failure_count(clock):
+    breaker = make_breaker()
+
+    fail(breaker, 2)
+    breaker.before_request()
+    breaker.record_success()
+    fail(breaker, 2)
+
+    assert breaker.state == CLOSED
+
+def test_half_open_allows_single_probe(clock):
+    breaker = make_breaker()
+    fail(breaker, 3)
+
+    clock.advance(9.9)
+    assert breaker.state == OPEN
+    clock.advance(0.1)
+    assert breaker.state == HALF_OPEN
+
+    breaker.before_request()
+    assert not breaker.available()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+def test_successful_probe_closes_and_resets_timeout(clock):
+    breaker = make_breaker()
+    fail(breaker, 3)
+    clock.advance(10)
+    fail(breaker, 1)
+    assert breaker.reset_timeout == 20
+
+    clock.advance(20)
+    breaker.before_request()
+    breaker.record_success()
+
+    assert breaker.state == CLOSED
+    assert breaker.available()
+    assert breaker.reset_timeout == 10
+
+def test_failed_probe_reopens_with_doubled_timeout(clock):
+    breaker = make_breaker()
+    fail(breaker, 3)
+
+    timeouts = []
+    for _ in range(4):
+        clock.advance(breaker.reset_timeout)
+        assert breaker.state == HALF_OPEN
+        fail(breaker, 1)
+        assert breaker.state == OPEN
+        timeouts.append(breaker.reset_timeout)
+
+    # 每次探测失败等待时长翻倍，不超过上限
+    assert timeouts == [20, 40, 40, 40]
+    clock.advance(39.9)
+    assert breaker.state == OPEN
+    assert breaker.opened == 5
+
+def test_release_frees_probe_slot(clock):
+    breaker = make_breaker()
+    fail(breaker, 3)
+    clock.advance(10)
+
+    breaker.before_request()
+    breaker.release()
+
+    assert breaker.state == HALF_OPEN
+    assert breaker.available()
+
+def test_zero_threshold_never_opens(clock):
+    breaker = make_breaker(failure_threshold=0)
+
+    fail(breaker, 50)
+
+    assert breaker.state == CLOSED
@@ -0,0 +1,118 @@
+"""
+合约批量转账前的代币授权：剩余额度不足时先清零再approve（兼容USDT）
+"""
+import asyncio
+import os
+
+from hexbytes import HexBytes
+
+from blockchain_payment_mcp.config import NetworkConfig, TokenConfig
+from blockchain_payment_mcp.erc20 import APPROVE_SELECTOR, encode_uint256_word
+from blockchain_payment_mcp.multi_chain import EVMChainInterface
+from blockchain_payment_mcp.rpc import to_int
+from blockchain_payment_mcp.wallet import WalletSigner
+from fake_pool import make_client, result_for
+
+URL = "http://node-a.test"
+DISPERSE = "0x" + "d1" * 20
+TOKEN = TokenConfig(symbol="USDT", address="0x" + "7e" * 20, decimals=6, name="Tether USD", chain_id=31337)
+
+class UsdtNode:
+    """模拟USDT的approve规则：额度为非零时只能改为0，否则交易回滚"""
+
+    def __init__(self, allowance: int):
+        self.allowance = allowance
+        self.approvals = []
+        self.receipts = {}
+
+    def approve(self, tx_hash: str, data: str) -> None:
+        amount = to_int("0x" + data[-64:])
+        success = amount == 0 or self.allowance == 0
+        if success:
+            self.allowance = amount
+        self.approvals.append(amount)
+        self.receipts[tx_hash] = {
+            "blockNumber": "0x10", "status": "0x1" if success else "0x0",
+            "gasUsed": hex(46000), "effectiveGasPrice": "0x1"
+        }
+
+    def respond(self, item):
+        method, params = item["method"], item["params"]
+        if method == "eth_call":
+            return result_for(item, "0x" + encode_uint256_word(self.allowance).hex())
+        if method == "eth_getBlockByNumber":
+            return result_for(item, {"number": "0x10", "timestamp": "0x0"})
+        if method == "eth_getTransactionReceipt":
+            return result_for(item, self.receipts.get(params[0]))
+        raise AssertionError(f"unexpected method {method}")
+
+    async def handler(self, url, payload):
+        if isinstance(payload, list):
+            return [self.respond(item) for item in payload]
+        return self.respond(payload)
+
+def make_chain(node: UsdtNode) -> EVMChainInterface:
+    chain = EVMChainInterface(NetworkConfig(
+        name="Local", chain_id=31337, rpc_url=URL, native_token="ETH", explorer_url="", poll_interval=0.01
+    ))
+    chain.rpc, _ = make_client([URL], node.handler)
+    chain.head_tracker.rpc = chain.receipt_tracker.rpc = chain.rpc
+    nonces = iter(range(100))
+
+    async def sign_and_broadcast(wallet, transaction):
+        # 节点按nonce顺序执行：广播时即应用approve
+        transaction["nonce"] = next(nonces)
+        tx_hash = "0x" + f"{transaction['nonce']:064x}"
+        node.approve(tx_hash, transaction["data"])
+        return HexBytes(tx_hash)
+
+    chain._sign_and_broadcast = sign_and_broadcast
+    return chain
+
+def ensure_allowance(chain: EVMChainInterface, amount: int):
+    return asyncio.run(chain._ensure_disperse_allowance(
+        WalletSigner("0x" + os.urandom(32).hex()), TOKEN, DISPERSE, amount, {"gasPrice": 1}, timeout=5
+    ))
+
+def test_sufficient_allowance_sends_nothing():
+    node = UsdtNode(allowance=500)
+
+    assert ensure_allowance(make_chain(node), 500) == []
+    assert node.approvals == []
+
+def test_zero_allowance_approves_batch_total():
+    node = UsdtNode(allowance=0)
+
+    records = ensure_allowance(make_chain(node), 500)
+
+    assert node.approvals == [500]
+    assert [record["status"] for record in records] == ["success"]
+    assert node.allowance == 500
+
+def test_leftover_allowance_is_reset_before_approve():
+    # 之前部分失败的批次留下了剩余额度
+    node = UsdtNode(allowance=120)
+
+    records = ensure_allowance(make_chain(node), 500)
+
+    assert node.approvals == [0, 500]
+    assert [(record["amount_wei"], record["status"]) for record in records] == [("0", "success"), ("500", "success")]
+    assert [record["nonce"] for record in records] == [0, 1]
+    assert all(record["transaction_hash"] for record in records)
+    assert node.allowance == 500
+
+def test_approve_selector_is_used():
+    node = UsdtNode(allowance=0)
+    chain = make_chain(node)
+    sent = []
+    broadcast = chain._sign_and_broadcast
+
+    async def capture(wallet, transaction):
+        sent.append(transaction)
+        return await broadcast(wallet, transaction)
+
+    chain._sign_and_broadcast = capture
+    ensure_allowance(chain, 7)
+
+    assert HexBytes(sent[0]["data"])[:4] == APPROVE_SELECTOR
+    assert sent[0]["to"].lower() == TOKEN.address
@@ -0,0 +1,165 @@
+"""
+合约批量转账（contract模式）在本地anvil节点上的端到端测试
+
+部署 tests/contracts 中的Disperse、测试代币和拒收原生代币的合约
+（字节码由 vyper -f bytecode 生成，保存在 contracts/bytecode.json），覆盖：
+- 代币额度不足时先approve再disperseToken
+- 批次中某个接收方回滚时整批失败，任何资金都不转出
+"""
+import asyncio
+import json
+import os
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Dict
+
+from blockchain_payment_mcp.config import NetworkConfig, TokenConfig, config
+from blockchain_payment_mcp.erc20 import (
+    decode_uint256, encode_address_word, encode_allowance, encode_balance_of, encode_uint256_word
+)
+from blockchain_payment_mcp.http_pool import http_pool
+from blockchain_payment_mcp.multi_chain import EVMChainInterface
+from blockchain_payment_mcp.rpc import JsonRpcClient, to_hex, to_int
+from blockchain_payment_mcp.wallet import WalletSigner
+
+BYTECODE: Dict[str, str] = json.loads((Path(__file__).parent / "contracts" / "bytecode.json").read_text())
+MINT_SELECTOR = bytes.fromhex("40c10f19")  # mint(address,uint256)
+BLOCK_SELECTOR = bytes.fromhex("06907e17")  # block(address)
+TOKEN = 10 ** 18
+
+def random_address() -> str:
+    return "0x" + os.urandom(20).hex()
+
+class AnvilChain:
+    """在anvil上部署测试合约并准备一个有余额的发送钱包"""
+
+    def __init__(self, url: str):
+        self.rpc = JsonRpcClient(url)
+        self.wallet = WalletSigner("0x" + os.urandom(32).hex())
+        self.chain_id = 0
+        self.deployer = ""
+        self.disperse = ""
+        self.chain: EVMChainInterface
+
+    async def setup(self) -> "AnvilChain":
+        self.chain_id = to_int(await self.rpc.request("eth_chainId"))
+        self.deployer = (await self.rpc.request("eth_accounts"))[0]
+        await self.transact(self.wallet.address, b"", value=100 * TOKEN)
+        self.disperse = await self.deploy("Disperse")
+        self.chain = EVMChainInterface(NetworkConfig(
+            name="Anvil",
+            chain_id=self.chain_id,
+            rpc_url=self.rpc.rpc_url,
+            native_token="ETH",
+            explorer_url="",
+            poll_interval=0.05,
+            multicall_address=None,
+            disperse_address=self.disperse
+        ))
+        return self
+
+    async def transact(self, to: str, data: bytes, value: int = 0) -> Dict[str, Any]:
+        """从anvil的解锁账户发送交易（自动出块），返回收据"""
+        tx_hash = await self.rpc.request("eth_sendTransaction", [{
+            "from": self.deployer, "to": to, "data": to_hex(data), "value": hex(value), "gas": hex(1_000_000)
+        }])
+        receipt = await self.rpc.request("eth_getTransactionReceipt", [tx_hash])
+        assert to_int(receipt["status"]) == 1
+        return receipt
+
+    async def deploy(self, name: str) -> str:
+        tx_hash = await self.rpc.request("eth_sendTransaction", [{
+            "from": self.deployer, "data": BYTECODE[name], "gas": hex(3_000_000)
+        }])
+        receipt = await self.rpc.request("eth_getTransactionReceipt", [tx_hash])
+        assert to_int(receipt["status"]) == 1
+        return receipt["contractAddress"]
+
+    async def deploy_token(self, mint_amount: int) -> TokenConfig:
+        """部署测试代币、注册到配置中，并向发送钱包mint"""
+        address = await self.deploy("TestToken")
+        token_config = TokenConfig(
+            symbol="TST", address=address, decimals=18, name="Test Token", chain_id=self.chain_id
+        )
+        config.add_token(token_config)
+        await self.transact(address, MINT_SELECTOR + encode_address_word(self.wallet.address)
+                            + encode_uint256_word(mint_amount))
+        return token_config
+
+    async def balance(self, address: str) -> int:
+        return to_int(await self.rpc.request("eth_getBalance", [address, "latest"]))
+
+    async def token_call(self, token: str, data: bytes) -> int:
+        return decode_uint256(await self.rpc.request("eth_call", [{"to": token, "data": to_hex(data)}, "latest"]))
+
+def run(url: str, scenario) -> None:
+    async def main() -> None:
+        try:
+            await scenario(await AnvilChain(url).setup())
+        finally:
+            await http_pool.close()
+    asyncio.run(main())
+
+def test_disperse_token_approves_missing_allowance(anvil_url):
+    async def scenario(anvil: AnvilChain) -> None:
+        token = await anvil.deploy_token(10 * TOKEN)
+        amounts = [Decimal("1"), Decimal("2"), Decimal("3.5")]
+        recipients = [random_address() for _ in amounts]
+        assert await anvil.token_call(token.address, encode_allowance(anvil.wallet.address, anvil.disperse)) == 0
+
+        result = await anvil.chain.send_batch([
+            {"to_address": recipient, "amount": str(amount), "token_symbol": "TST"}
+            for recipient, amount in zip(recipients, amounts)
+        ], wallet=anvil.wallet, mode="contract", timeout=30)
+
+        assert "error" not in result, result
+        assert [record["type"] for record in result["transactions"]] == ["approve", "disperse"]
+        assert all(record["status"] == "success" for record in result["transactions"])
+        assert result["status_counts"] == {"success": 3}
+        for recipient, amount in zip(recipients, amounts):
+            assert await anvil.token_call(token.address, encode_balance_of(recipient)) == int(amount * TOKEN)
+        sender_balance = await anvil.token_call(token.address, encode_balance_of(anvil.wallet.address))
+        assert sender_balance == int(Decimal("3.5") * TOKEN)
+        # 只授权了本批次需要的额度，转账后全部用完
+        assert await anvil.token_call(token.address, encode_allowance(anvil.wallet.address, anvil.disperse)) == 0
+
+    run(anvil_url, scenario)
+
+def test_disperse_ether_reverting_recipient_fails_whole_batch(anvil_url):
+    async def scenario(anvil: AnvilChain) -> None:
+        receiver = await anvil.deploy("RevertingReceiver")
+        recipients = [random_address(), receiver, random_address()]
+        sender_before = await anvil.balance(anvil.wallet.address)
+
+        result = await anvil.chain.send_batch([
+            {"to_address": recipient, "amount": "1"} for recipient in recipients
+        ], wallet=anvil.wallet, mode="contract", timeout=30)
+
+        assert result["transactions"] == []
+        assert result["status_counts"] == {"not_sent": 3}
+        assert all("error" in item for item in result["results"])
+        for recipient in recipients:
+            assert await anvil.balance(recipient) == 0
+        assert await anvil.balance(anvil.wallet.address) == sender_before
+
+    run(anvil_url, scenario)
+
+def test_disperse_token_reverting_recipient_fails_whole_batch(anvil_url):
+    async def scenario(anvil: AnvilChain) -> None:
+        token = await anvil.deploy_token(10 * TOKEN)
+        recipients = [random_address() for _ in range(3)]
+        await anvil.transact(token.address, BLOCK_SELECTOR + encode_address_word(recipients[1]))
+
+        result = await anvil.chain.send_batch([
+            {"to_address": recipient, "amount": "1", "token_symbol": "TST"} for recipient in recipients
+        ], wallet=anvil.wallet, mode="contract", timeout=30)
+
+        # 额度不足时先approve，disperseToken在估算gas时回滚，不发送
+        assert [record["type"] for record in result["transactions"]] == ["approve"]
+        assert result["transactions"][0]["status"] == "success"
+        assert result["status_counts"] == {"not_sent": 3}
+        for recipient in recipients:
+            assert await anvil.token_call(token.address, encode_balance_of(recipient)) == 0
+        assert await anvil.token_call(token.address, encode_balance_of(anvil.wallet.address)) == 10 * TOKEN
+
+    run(anvil_url, scenario)
@@ -0,0 +1,34 @@
+"""
+交易终结判断：优先使用finalized区块标签，节点不支持时按网络的确认深度判断
+"""
+import pytest
+
+from blockchain_payment_mcp.config import config
+from blockchain_payment_mcp.multi_chain import EVMChainInterface
+
+@pytest.fixture
+def ethereum():
+    return EVMChainInterface(config.get_network("ethereum_mainnet"))
+
+def test_finalized_tag_takes_precedence_over_depth(ethereum):
+    # 确认数远超固定深度，但尚未进入finalized区块，不视为终结
+    assert not ethereum._is_finalized(1000, latest_block=1100, finalized_number=999)
+    assert ethereum._is_finalized(1000, latest_block=1001, finalized_number=1000)
+
+def test_depth_is_fallback_without_finalized_tag(ethereum):
+    depth = ethereum.network_config.finality_depth
+    assert not ethereum._is_finalized(1000, latest_block=1000 + depth - 1, finalized_number=None)
+    assert ethereum._is_finalized(1000, latest_block=1000 + depth, finalized_number=None)
+
+@pytest.mark.parametrize("network_id, minimum_depth", [
+    ("ethereum_mainnet", 64),
+    ("bsc_mainnet", 64),
+    ("polygon_mainnet", 128),
+    ("polygon_amoy", 128),
+])
+def test_fallback_depths_are_conservative(network_id, minimum_depth):
+    assert config.get_network(network_id).finality_depth >= minimum_depth
+
+def test_finalized_number_parsing():
+    assert EVMChainInterface._finalized_number({"number": "0x10"}) == 16
+    assert EVMChainInterface._finalized_number(None) is None
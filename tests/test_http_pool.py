@@ -0,0 +1,80 @@
+"""
+按主机共享的RPC HTTP连接池
+"""
+import asyncio
+
+from aiohttp import web
+
+from blockchain_payment_mcp.config import HttpPoolConfig
+from blockchain_payment_mcp.http_pool import HttpSessionPool, host_key
+
+async def start_echo_server() -> web.AppRunner:
+    async def handle(request: web.Request) -> web.Response:
+        payload = await request.json()
+        return web.json_response({"jsonrpc": "2.0", "id": payload["id"], "result": request.path})
+
+    app = web.Application()
+    app.router.add_post("/{tail:.*}", handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    return runner
+
+def server_url(runner: web.AppRunner) -> str:
+    host, port = runner.addresses[0][:2]
+    return f"http://{host}:{port}"
+
+def test_host_key_ignores_path_and_case():
+    assert host_key("HTTPS://Node.Example:8545/v1/key-a") == "https://node.example:8545"
+    assert host_key("https://node.example:8545/v1/key-b") == host_key("https://NODE.example:8545")
+    assert host_key("https://node.example/") != host_key("http://node.example/")
+
+def test_session_shared_per_host():
+    pool = HttpSessionPool(HttpPoolConfig())
+
+    async def main() -> None:
+        try:
+            first = pool.get_session("https://node-a.test/v1/key-a")
+            assert pool.get_session("https://node-a.test/v1/key-b") is first
+            assert pool.get_session("https://node-b.test/") is not first
+        finally:
+            await pool.close()
+
+    asyncio.run(main())
+
+def test_new_session_after_close_and_per_event_loop():
+    pool = HttpSessionPool(HttpPoolConfig())
+    sessions = []
+
+    async def main() -> None:
+        session = pool.get_session("https://node-a.test/")
+        sessions.append(session)
+        await pool.close()
+        assert session.closed
+        assert pool.get_session("https://node-a.test/") is not session
+        await pool.close()
+
+    asyncio.run(main())
+    asyncio.run(main())
+
+    assert sessions[0] is not sessions[1]
+
+def test_connections_are_reused_across_requests():
+    pool = HttpSessionPool(HttpPoolConfig(pool_size=4))
+
+    async def main() -> None:
+        runner = await start_echo_server()
+        url = server_url(runner)
+        try:
+            for index in range(5):
+                response = await pool.post_json(f"{url}/key-{index % 2}", {"jsonrpc": "2.0", "id": index})
+                assert response["result"] == f"/key-{index % 2}"
+        finally:
+            await pool.close()
+            await runner.cleanup()
+        stats = pool.stats(url)
+        assert stats["requests"] == 5
+        assert stats["new_connections"] == 1
+        assert stats["reused_connections"] == 4
+
+    asyncio.run(main())
@@ -0,0 +1,71 @@
+"""
+Multicall3余额查询出错后的回退：RPC错误进入冷却期，期间直接逐个查询
+"""
+import asyncio
+import time
+
+import aiohttp
+
+from blockchain_payment_mcp.config import NetworkConfig
+from blockchain_payment_mcp.multi_chain import MULTICALL_ERROR_COOLDOWN, EVMChainInterface
+from fake_pool import make_client, result_for
+
+URL = "http://node-a.test"
+ADDRESS = "0x" + "11" * 20
+
+def make_chain(eth_call_error):
+    async def handler(url, payload):
+        if payload["method"] == "eth_call":
+            if isinstance(eth_call_error, Exception):
+                raise eth_call_error
+            return {"jsonrpc": "2.0", "id": payload["id"], "error": eth_call_error}
+        if payload["method"] == "eth_getBlockByNumber":
+            return result_for(payload, {"number": "0x100", "timestamp": "0x0"})
+        return result_for(payload, hex(10 ** 18))
+
+    # 本地链ID上没有配置代币，余额查询只包含原生代币
+    chain = EVMChainInterface(NetworkConfig(
+        name="Local", chain_id=31337, rpc_url=URL, native_token="ETH", explorer_url=""
+    ))
+    chain.rpc, pool = make_client([URL], handler, max_retries=0)
+    chain.head_tracker.rpc = chain.rpc
+    return chain, pool
+
+def methods(pool):
+    return [payload["method"] for _, payload in pool.calls]
+
+def test_rpc_error_starts_cooldown():
+    chain, pool = make_chain({"code": 3, "message": "execution reverted"})
+
+    async def main() -> None:
+        first = await chain.get_balance(ADDRESS)
+        second = await chain.get_balance(ADDRESS)
+        assert first["balances"]["ETH"]["wei"] == second["balances"]["ETH"]["wei"] == str(10 ** 18)
+
+    asyncio.run(main())
+
+    assert methods(pool) == ["eth_call", "eth_getBalance", "eth_getBalance"]
+    assert chain._multicall_retry_at > time.monotonic() + MULTICALL_ERROR_COOLDOWN - 5
+    # Multicall3并未被判定为未部署，冷却结束后重新尝试
+    assert chain._multicall_available
+
+    chain._multicall_retry_at = time.monotonic() - 1
+    asyncio.run(chain.get_balance(ADDRESS))
+    assert methods(pool)[3:] == ["eth_call", "eth_getBalance"]
+
+def test_transport_error_does_not_start_cooldown():
+    chain, pool = make_chain(aiohttp.ClientConnectionError("connection reset"))
+
+    asyncio.run(chain.get_balance(ADDRESS))
+    asyncio.run(chain.get_balance(ADDRESS))
+
+    assert methods(pool) == ["eth_call", "eth_getBalance", "eth_call", "eth_getBalance"]
+
+def test_block_not_found_does_not_start_cooldown():
+    chain, pool = make_chain({"code": -32000, "message": "header not found"})
+
+    result = asyncio.run(chain.get_balances([ADDRESS]))
+
+    assert result["balances"] == [["1"]]
+    assert chain._multicall_retry_at == 0.0
+    assert chain._multicall_usable()
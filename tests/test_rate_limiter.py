@@ -0,0 +1,134 @@
+"""
+RPC节点自适应限流：限流识别、AIMD速率调整和被限流请求的重新排队
+"""
+import asyncio
+
+import pytest
+
+from blockchain_payment_mcp import rate_limiter as rate_limiter_module
+from blockchain_payment_mcp.config import RateLimitConfig
+from blockchain_payment_mcp.rate_limiter import (
+    AdaptiveRateLimiter, RateLimitedError, is_rate_limit_error, rate_limited_calls, retry_after_seconds
+)
+from fake_pool import http_error, make_client, result_for
+
+URL = "http://node-a.test"
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(rate_limiter_module.time, "monotonic", clock)
+    return clock
+
+def test_detects_rate_limit_errors():
+    assert is_rate_limit_error(http_error(URL, 429))
+    assert not is_rate_limit_error(http_error(URL, 503))
+    assert is_rate_limit_error(Exception("Your app has exceeded its compute units per second capacity"))
+    assert retry_after_seconds(http_error(URL, 429, {"Retry-After": "2.5"})) == 2.5
+    assert retry_after_seconds(http_error(URL, 429, {"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})) is None
+
+def test_counts_rate_limited_calls_in_batch():
+    response = [
+        {"id": 1, "result": "0x1"},
+        {"id": 2, "error": {"code": -32029, "message": "slow down"}},
+        {"id": 3, "error": {"code": -32000, "message": "Too Many Requests"}},
+        {"id": 4, "error": {"code": 3, "message": "execution reverted"}},
+    ]
+    assert rate_limited_calls(response) == (2, 4)
+    assert rate_limited_calls({"id": 1, "error": {"code": 429, "message": "limited"}}) == (1, 1)
+
+def test_first_rate_limit_starts_from_observed_rate(clock):
+    limiter = AdaptiveRateLimiter(URL, RateLimitConfig())
+    assert limiter.rate is None
+
+    async def send(count: int) -> None:
+        for _ in range(count):
+            await limiter.acquire()
+
+    asyncio.run(send(40))
+    limiter.on_rate_limited(clock())
+
+    assert limiter.rate == 20
+    assert limiter.decreases == 1
+
+def test_multiplicative_decrease_once_per_interval(clock):
+    settings = RateLimitConfig(rate=40, min_rate=4, decrease_interval=1.0)
+    limiter = AdaptiveRateLimiter(URL, settings)
+
+    first_sent_at = clock()
+    clock.advance(0.1)
+    limiter.on_rate_limited(first_sent_at)
+    assert limiter.rate == 20
+    # 降速后发出、但距上次降速不到decrease_interval的请求被限流，不再降速
+    sent_at = clock() + 0.2
+    clock.advance(0.5)
+    limiter.on_rate_limited(sent_at)
+    assert limiter.rate == 20
+    # 降速前发出的请求陆续返回的429不再降速
+    clock.advance(2)
+    limiter.on_rate_limited(first_sent_at)
+    assert limiter.rate == 20
+
+    for _ in range(5):
+        clock.advance(1.5)
+        limiter.on_rate_limited(clock())
+    assert limiter.rate == settings.min_rate
+
+def test_additive_increase_up_to_max(clock):
+    limiter = AdaptiveRateLimiter(URL, RateLimitConfig(rate=10, max_rate=12, increase_step=1.0))
+
+    for _ in range(10):
+        limiter.on_success()
+    assert limiter.rate == pytest.approx(11, abs=0.05)
+
+    for _ in range(100):
+        limiter.on_success()
+    assert limiter.rate == 12
+
+def test_disabled_limiter_never_slows_down(clock):
+    limiter = AdaptiveRateLimiter(URL, RateLimitConfig(rate=0))
+
+    limiter.on_rate_limited(clock())
+
+    assert not limiter.enabled
+    assert limiter.rate is None
+
+def test_rate_limited_requests_are_requeued():
+    responses = [http_error(URL, 429), http_error(URL, 429)]
+
+    async def handler(url, payload):
+        if responses:
+            raise responses.pop(0)
+        return result_for(payload, "0x7")
+
+    client, pool = make_client([URL], handler, max_retries=0,
+                               rate_limit=RateLimitConfig(min_rate=100, max_retries=3))
+
+    # 写请求被限流时同样安全地重新排队：节点没有处理它
+    assert asyncio.run(client.request("eth_sendRawTransaction", ["0x02f8"])) == "0x7"
+    assert len(pool.calls) == 3
+    limiter = client.router.limiters.get(URL)
+    assert limiter.rate_limited == 2
+    assert client.router.breakers.get(URL).consecutive_failures == 0
+
+def test_rate_limit_retries_are_bounded():
+    async def handler(url, payload):
+        return {"jsonrpc": "2.0", "id": payload["id"], "error": {"code": -32029, "message": "rate limit exceeded"}}
+
+    client, pool = make_client([URL], handler, max_retries=0,
+                               rate_limit=RateLimitConfig(min_rate=100, max_retries=2))
+
+    with pytest.raises(RateLimitedError):
+        asyncio.run(client.request("eth_blockNumber"))
+    assert len(pool.calls) == 3
+    assert client.router.breakers.get(URL).consecutive_failures == 0
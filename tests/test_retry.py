@@ -0,0 +1,100 @@
+"""
+只读请求的重试策略：写请求和nonce读取在任何传输错误下都不重试，限流只由限流器重新排队
+"""
+import asyncio
+
+import aiohttp
+import pytest
+
+from blockchain_payment_mcp.config import RateLimitConfig
+from blockchain_payment_mcp.rate_limiter import RateLimitedError
+from blockchain_payment_mcp.rpc import RpcError
+from fake_pool import http_error, make_client, result_for
+
+URL = "http://node-a.test"
+BACKUP_URL = "http://node-b.test"
+
+TRANSPORT_ERRORS = [
+    aiohttp.ClientConnectionError("connection reset"),
+    asyncio.TimeoutError(),
+    http_error(URL, 503),
+]
+
+def failing(error: Exception):
+    async def handler(url, payload):
+        raise error
+    return handler
+
+@pytest.mark.parametrize("error", TRANSPORT_ERRORS, ids=lambda error: type(error).__name__)
+@pytest.mark.parametrize("method, params", [
+    ("eth_sendRawTransaction", ["0x02f8"]),
+    ("eth_getTransactionCount", ["0x" + "11" * 20, "pending"]),
+])
+def test_pinned_methods_are_never_retried(method, params, error):
+    client, pool = make_client([URL, BACKUP_URL], failing(error))
+
+    with pytest.raises(type(error)):
+        asyncio.run(client.request(method, params))
+
+    # 只发送一次，既不重试也不切换到备用节点
+    assert len(pool.calls) == 1
+    assert client.retries == 0
+
+@pytest.mark.parametrize("error", TRANSPORT_ERRORS, ids=lambda error: type(error).__name__)
+def test_batch_with_broadcast_is_never_retried(error):
+    client, pool = make_client([URL], failing(error))
+
+    with pytest.raises(type(error)):
+        asyncio.run(client.batch([
+            ("eth_getBalance", ["0x" + "11" * 20, "latest"]),
+            ("eth_sendRawTransaction", ["0x02f8"]),
+        ]))
+
+    assert len(pool.calls) == 1
+    assert client.retries == 0
+
+def test_read_is_retried_after_transport_error():
+    attempts = []
+
+    async def handler(url, payload):
+        attempts.append(url)
+        if len(attempts) < 3:
+            raise aiohttp.ClientConnectionError("connection reset")
+        return result_for(payload, "0x10")
+
+    client, pool = make_client([URL], handler, max_retries=3)
+
+    assert asyncio.run(client.request("eth_getBalance", ["0x" + "11" * 20, "latest"])) == "0x10"
+    assert len(pool.calls) == 3
+    assert client.retries == 2
+
+def test_read_retries_are_bounded():
+    client, pool = make_client([URL], failing(aiohttp.ClientConnectionError("down")), max_retries=2)
+
+    with pytest.raises(aiohttp.ClientConnectionError):
+        asyncio.run(client.request("eth_blockNumber"))
+
+    assert len(pool.calls) == 3
+    assert client.retries == 2
+
+def test_rpc_error_response_is_not_retried():
+    async def handler(url, payload):
+        return {"jsonrpc": "2.0", "id": payload["id"], "error": {"code": 3, "message": "execution reverted"}}
+
+    client, pool = make_client([URL], handler)
+
+    with pytest.raises(RpcError):
+        asyncio.run(client.request("eth_call", [{"to": "0x" + "22" * 20, "data": "0x"}, "latest"]))
+
+    assert len(pool.calls) == 1
+
+def test_rate_limited_read_is_not_retried_on_top_of_limiter():
+    client, pool = make_client([URL], failing(http_error(URL, 429)), max_retries=3,
+                               rate_limit=RateLimitConfig(min_rate=100, max_retries=2))
+
+    with pytest.raises(RateLimitedError):
+        asyncio.run(client.request("eth_getBalance", ["0x" + "11" * 20, "latest"]))
+
+    # 限流器重新排队max_retries次后放弃，重试策略不再发起新一轮
+    assert len(pool.calls) == 2 + 1
+    assert client.retries == 0
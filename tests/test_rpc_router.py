@@ -0,0 +1,122 @@
+"""
+多RPC节点路由：只对轻量读请求对冲，写请求固定节点，读请求失败时切换节点
+"""
+import asyncio
+
+import aiohttp
+import pytest
+
+from blockchain_payment_mcp.config import RpcRoutingConfig
+from blockchain_payment_mcp.rpc_router import RpcRouter
+from fake_pool import make_client, result_for
+
+PRIMARY = "http://node-a.test"
+SECONDARY = "http://node-b.test"
+ADDRESS = "0x" + "11" * 20
+
+HEDGE_SETTINGS = RpcRoutingConfig(hedge_min_delay=0.01, hedge_max_delay=0.02)
+
+def slow_primary(delay: float = 0.2):
+    async def handler(url, payload):
+        if url == PRIMARY:
+            await asyncio.sleep(delay)
+        return result_for(payload)
+    return handler
+
+def routed_client(handler, settings: RpcRoutingConfig = HEDGE_SETTINGS):
+    client, pool = make_client([PRIMARY, SECONDARY], handler, max_retries=0)
+    client.router.settings = settings
+    return client, pool
+
+@pytest.mark.parametrize("method, params", [
+    ("eth_blockNumber", []),
+    ("eth_getBalance", [ADDRESS, "latest"]),
+    ("eth_getTransactionReceipt", ["0x" + "ab" * 32]),
+])
+def test_lightweight_reads_are_hedged(method, params):
+    client, pool = routed_client(slow_primary())
+
+    asyncio.run(client.request(method, params))
+
+    assert pool.calls_to(SECONDARY) == 1
+    assert client.router.hedged_requests == 1
+    assert client.router.endpoints[1].hedge_wins == 1
+
+@pytest.mark.parametrize("method, params", [
+    ("eth_call", [{"to": ADDRESS, "data": "0x"}, "latest"]),
+    ("eth_estimateGas", [{"to": ADDRESS, "data": "0x"}]),
+])
+def test_heavy_reads_are_not_hedged(method, params):
+    client, pool = routed_client(slow_primary())
+
+    asyncio.run(client.request(method, params))
+
+    assert pool.calls_to(PRIMARY) == 1
+    assert pool.calls_to(SECONDARY) == 0
+    assert client.router.hedged_requests == 0
+
+def test_batches_are_not_hedged():
+    client, pool = routed_client(slow_primary())
+
+    asyncio.run(client.batch([("eth_blockNumber", []), ("eth_getBalance", [ADDRESS, "latest"])]))
+
+    assert pool.calls_to(SECONDARY) == 0
+    assert client.router.hedged_requests == 0
+
+def test_router_does_not_hedge_by_default():
+    client, pool = routed_client(slow_primary())
+
+    asyncio.run(client.router.post({"jsonrpc": "2.0", "id": 1, "method": "eth_blockNumber", "params": []}))
+
+    assert pool.calls_to(SECONDARY) == 0
+
+def test_hedge_delay_uses_only_hedgeable_latencies():
+    settings = RpcRoutingConfig(hedge_min_delay=0.01, hedge_max_delay=1.0)
+    router = RpcRouter([PRIMARY, SECONDARY], settings=settings)
+    endpoint = router.endpoints[0]
+
+    for _ in range(20):
+        endpoint.record_success(0.8, settings.ewma_alpha)
+    # 还没有可对冲请求的样本时使用上限
+    assert router.hedge_delay(endpoint) == settings.hedge_max_delay
+
+    for _ in range(20):
+        endpoint.record_success(0.03, settings.ewma_alpha, hedgeable=True)
+    assert router.hedge_delay(endpoint) == pytest.approx(0.03)
+    assert endpoint.percentile(95) == pytest.approx(0.8)
+
+def test_writes_stay_pinned_and_move_after_failure():
+    failures = {PRIMARY}
+
+    async def handler(url, payload):
+        if url in failures and payload["method"] == "eth_sendRawTransaction":
+            raise aiohttp.ClientConnectionError("connection reset")
+        return result_for(payload)
+
+    client, pool = routed_client(handler)
+
+    async def main() -> None:
+        await client.request("eth_getTransactionCount", [ADDRESS, "pending"])
+        with pytest.raises(aiohttp.ClientConnectionError):
+            await client.request("eth_sendRawTransaction", ["0x02f8"])
+        await client.request("eth_sendRawTransaction", ["0x02f8"])
+
+    asyncio.run(main())
+
+    assert [url for url, _ in pool.calls] == [PRIMARY, PRIMARY, SECONDARY]
+    assert client.router.pinned_endpoint.url == SECONDARY
+
+def test_reads_fail_over_to_next_endpoint():
+    async def handler(url, payload):
+        if url == PRIMARY:
+            raise aiohttp.ClientConnectionError("connection refused")
+        return result_for(payload, "0x5")
+
+    client, pool = routed_client(handler)
+
+    result = asyncio.run(client.request("eth_call", [{"to": ADDRESS, "data": "0x"}, "latest"]))
+
+    assert result == "0x5"
+    assert [url for url, _ in pool.calls] == [PRIMARY, SECONDARY]
+    assert client.router.failovers == 1
+    assert client.router.endpoints[0].errors == 1
@@ -0,0 +1,100 @@
+"""
+工具结果序列化：orjson与标准库json输出一致，大整数、Decimal和bytes不丢失精度
+"""
+import json
+from decimal import Decimal
+
+import pytest
+
+from blockchain_payment_mcp import serialization
+from blockchain_payment_mcp.serialization import MAX_SAFE_INTEGER, compact, serialize_result
+
+@pytest.fixture(params=["orjson", "json"])
+def backend(request, monkeypatch):
+    if request.param == "orjson":
+        if serialization.orjson is None:
+            pytest.skip("未安装orjson")
+    else:
+        monkeypatch.setattr(serialization, "orjson", None)
+    return request.param
+
+def test_output_is_compact_utf8(backend):
+    text = serialize_result({"network": "Base 主网", "ok": True, "items": [1, None]})
+
+    assert text == '{"network":"Base 主网","ok":true,"items":[1,null]}'
+
+def test_large_integers_become_strings(backend):
+    wei = 123456789012345678901234567890
+    result = json.loads(serialize_result({
+        "wei": wei,
+        "safe": MAX_SAFE_INTEGER,
+        "unsafe": MAX_SAFE_INTEGER + 1,
+        "negative": -(MAX_SAFE_INTEGER + 1),
+        "nested": [{"gas_used": 21000, "fee_wei": wei}],
+    }))
+
+    assert result == {
+        "wei": str(wei),
+        "safe": MAX_SAFE_INTEGER,
+        "unsafe": str(MAX_SAFE_INTEGER + 1),
+        "negative": str(-(MAX_SAFE_INTEGER + 1)),
+        "nested": [{"gas_used": 21000, "fee_wei": str(wei)}],
+    }
+
+def test_special_types(backend):
+    result = json.loads(serialize_result({
+        "amount": Decimal("1E-18"),
+        "balance": Decimal("12345678901234567890.123456789"),
+        "hash": b"\xab\xcd",
+        "nan": float("nan"),
+        "tuple": (1, 2),
+        1: "int key",
+    }))
+
+    assert result == {
+        "amount": "0.000000000000000001",
+        "balance": "12345678901234567890.123456789",
+        "hash": "0xabcd",
+        "nan": None,
+        "tuple": [1, 2],
+        "1": "int key",
+    }
+
+def test_backends_agree(monkeypatch):
+    if serialization.orjson is None:
+        pytest.skip("未安装orjson")
+    payload = {"a": [Decimal("0.1"), 2 ** 64, b"\x00", {"b": float("inf")}], "c": "中文"}
+
+    fast = serialize_result(payload)
+    monkeypatch.setattr(serialization, "orjson", None)
+
+    assert json.loads(fast) == json.loads(serialize_result(payload))
+
+def test_compact_converts_record_lists_to_tables():
+    result = compact({
+        "total": 2,
+        "results": [
+            {"index": 0, "status": "success", "transaction_hash": "0xaa"},
+            {"index": 1, "status": "rejected", "error": "nonce too low"},
+        ],
+        "tags": ["a", "b"],
+        "single": [{"index": 0}],
+    })
+
+    assert result == {
+        "total": 2,
+        "results": {
+            "columns": ["index", "status", "transaction_hash", "error"],
+            "rows": [[0, "success", "0xaa", None], [1, "rejected", None, "nonce too low"]],
+        },
+        "tags": ["a", "b"],
+        "single": [{"index": 0}],
+    }
+
+def test_compact_schema_flag(backend):
+    records = [{"a": 1}, {"a": 2}]
+
+    assert json.loads(serialize_result({"r": records})) == {"r": records}
+    assert json.loads(serialize_result({"r": records}, compact_schema=True)) == {
+        "r": {"columns": ["a"], "rows": [[1], [2]]}
+    }
@@ -0,0 +1,40 @@
+"""
+代币注册表：按符号、地址和基础符号别名查询，重新注册时所有索引指向新配置
+"""
+from blockchain_payment_mcp.config import TokenConfig, TokenRegistry
+
+CHAIN_ID = 8453
+OLD_ADDRESS = "0x" + "aa" * 20
+NEW_ADDRESS = "0x" + "bb" * 20
+
+def usdc_base(address: str) -> TokenConfig:
+    return TokenConfig(symbol="USDC_BASE", address=address, decimals=6, name="USD Coin", chain_id=CHAIN_ID)
+
+def test_base_symbol_alias():
+    registry = TokenRegistry()
+    token = usdc_base(OLD_ADDRESS)
+    registry.register(token)
+
+    assert registry.get(CHAIN_ID, "usdc") is token
+    assert registry.get(CHAIN_ID, "USDC_BASE") is token
+    assert registry.get(1, "USDC") is None
+
+def test_reregistered_token_updates_alias():
+    registry = TokenRegistry()
+    registry.register(usdc_base(OLD_ADDRESS))
+    replacement = usdc_base(NEW_ADDRESS)
+    registry.register(replacement)
+
+    assert registry.get(CHAIN_ID, "USDC_BASE") is replacement
+    assert registry.get(CHAIN_ID, "USDC") is replacement
+    assert registry.get_by_address(CHAIN_ID, NEW_ADDRESS) is replacement
+    assert registry.get_by_address(CHAIN_ID, OLD_ADDRESS) is None
+
+def test_alias_keeps_first_registered_token():
+    registry = TokenRegistry()
+    first = usdc_base(OLD_ADDRESS)
+    registry.register(first)
+    registry.register(TokenConfig(symbol="USDC_BRIDGED", address=NEW_ADDRESS, decimals=6,
+                                  name="Bridged USDC", chain_id=CHAIN_ID))
+
+    assert registry.get(CHAIN_ID, "USDC") is first
@@ -0,0 +1,134 @@
+"""
+批量交易状态查询：已终结交易写入缓存，Solana无效签名逐个标记而不影响同一分块
+"""
+import asyncio
+import os
+
+from blockchain_payment_mcp.config import NetworkConfig
+from blockchain_payment_mcp.multi_chain import (
+    BASE58_ALPHABET, EVMChainInterface, SolanaChainInterface, is_solana_signature
+)
+from blockchain_payment_mcp.tx_cache import tx_status_cache
+from fake_pool import make_client, result_for
+
+URL = "http://node-a.test"
+FINALIZED_HASH = "0x" + "aa" * 32
+RECENT_HASH = "0x" + "bb" * 32
+SENDER = "0x" + "11" * 20
+RECIPIENT = "0x" + "22" * 20
+
+def requested_methods(pool):
+    methods = []
+    for _, payload in pool.calls:
+        items = payload if isinstance(payload, list) else [payload]
+        methods.extend(item["method"] for item in items)
+    return methods
+
+def make_evm_chain():
+    receipts = {
+        FINALIZED_HASH: {"blockNumber": "0x10", "status": "0x1", "gasUsed": "0x5208"},
+        RECENT_HASH: {"blockNumber": "0x1f", "status": "0x1", "gasUsed": "0x5208"},
+    }
+
+    def respond(item):
+        method, params = item["method"], item["params"]
+        if method == "eth_blockNumber":
+            return result_for(item, "0x20")
+        if method == "eth_getBlockByNumber":
+            number = "0x18" if params[0] == "finalized" else "0x20"
+            return result_for(item, {"number": number, "timestamp": "0x0"})
+        if method == "eth_getTransactionReceipt":
+            return result_for(item, receipts[params[0]])
+        if method == "eth_getTransactionByHash":
+            return result_for(item, {"from": SENDER, "to": RECIPIENT, "value": hex(10 ** 18)})
+        raise AssertionError(f"unexpected method {method}")
+
+    async def handler(url, payload):
+        if isinstance(payload, list):
+            return [respond(item) for item in payload]
+        return respond(payload)
+
+    chain = EVMChainInterface(NetworkConfig(
+        name="Local", chain_id=31337, rpc_url=URL, native_token="ETH", explorer_url=""
+    ))
+    chain.rpc, pool = make_client([URL], handler)
+    chain.head_tracker.rpc = chain.rpc
+    return chain, pool
+
+def test_evm_batch_caches_finalized_statuses():
+    tx_status_cache.clear()
+    chain, pool = make_evm_chain()
+
+    first = asyncio.run(chain.get_transaction_statuses([FINALIZED_HASH, RECENT_HASH]))
+    assert [row[:3] + row[4:] for row in first["rows"]] == [
+        [FINALIZED_HASH, "success", 16, True],
+        [RECENT_HASH, "success", 31, False],
+    ]
+    # 只有已终结的交易需要取回交易详情
+    assert requested_methods(pool).count("eth_getTransactionByHash") == 1
+
+    cached = tx_status_cache.get(31337, FINALIZED_HASH)
+    assert cached["finalized"] and cached["value_wei"] == str(10 ** 18)
+    assert "confirmations" not in cached
+
+    pool.calls.clear()
+    second = asyncio.run(chain.get_transaction_statuses([FINALIZED_HASH, RECENT_HASH]))
+    assert second["rows"] == first["rows"]
+    receipt_lookups = [
+        item["params"][0] for _, payload in pool.calls if isinstance(payload, list)
+        for item in payload if item["method"] == "eth_getTransactionReceipt"
+    ]
+    assert receipt_lookups == [RECENT_HASH]
+
+    # 单笔查询读取批量查询写入的缓存，格式一致
+    pool.calls.clear()
+    single = asyncio.run(chain.get_transaction_status(FINALIZED_HASH))
+    assert single["from_address"].lower() == SENDER and single["confirmations"] == 16
+    assert "eth_getTransactionReceipt" not in requested_methods(pool)
+    tx_status_cache.clear()
+
+def base58(data: bytes) -> str:
+    number, encoded = int.from_bytes(data, "big"), ""
+    while number:
+        number, digit = divmod(number, 58)
+        encoded = BASE58_ALPHABET[digit] + encoded
+    return "1" * (len(data) - len(data.lstrip(b"\0"))) + encoded
+
+def test_is_solana_signature():
+    assert is_solana_signature(base58(os.urandom(64)))
+    assert is_solana_signature(base58(b"\0\0" + os.urandom(62)))
+    assert not is_solana_signature(base58(os.urandom(32)))
+    assert not is_solana_signature("0x" + "ab" * 43)
+    assert not is_solana_signature(None)
+
+def test_solana_invalid_signature_does_not_fail_chunk():
+    valid = base58(os.urandom(64))
+    sent = []
+
+    async def handler(url, payload):
+        responses = []
+        for item in payload:
+            if item["method"] == "getSlot":
+                responses.append(result_for(item, 1000))
+            else:
+                sent.extend(item["params"][0])
+                responses.append(result_for(item, {"value": [
+                    {"slot": 990, "err": None, "confirmationStatus": "finalized"} for _ in item["params"][0]
+                ]}))
+        return responses
+
+    # 只测试批量状态查询，不需要Solana SDK的客户端
+    chain = SolanaChainInterface.__new__(SolanaChainInterface)
+    chain.network_config = NetworkConfig(
+        name="Solana Local", chain_id=0, rpc_url=URL, native_token="SOL", explorer_url=""
+    )
+    chain.rpc, _ = make_client([URL], handler)
+
+    result = asyncio.run(chain.get_transaction_statuses(["not-a-signature", valid]))
+
+    assert sent == [valid]
+    assert result["rows"] == [
+        ["not-a-signature", "invalid", None, None, None],
+        [valid, "success", 990, 10, True],
+    ]
+    assert result["status_counts"] == {"invalid": 1, "success": 1}